@@ -2,17 +2,18 @@ import os
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.database import engine, Base
+from app.rate_limit import create_limiter
+from app.services.request_log import request_log_middleware
 from app import models
-from app.routers import search, upload, explore
+from app.routers import health, search, upload, explore, faculty
 
 Base.metadata.create_all(bind=engine)
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+limiter = create_limiter(default_limits=["100/minute"])
 
 app = FastAPI(
     title="Research Advisor Finder API",
@@ -23,6 +24,8 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+app.middleware("http")(request_log_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -34,15 +37,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Search-Degraded", "Server-Timing"],
 )
 
 app.include_router(search.router, prefix="/api/search", tags=["search"])
 app.include_router(upload.router, prefix="/api/upload", tags=["upload"])
 app.include_router(explore.router, prefix="/api/explore", tags=["explore"])
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+app.include_router(faculty.router, prefix="/api/faculty", tags=["faculty"])
+app.include_router(health.router, tags=["health"])
 
 @app.get("/")
 def root():
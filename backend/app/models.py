@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from pgvector.sqlalchemy import Vector
 
 from app.database import Base
@@ -49,3 +49,54 @@ class Paper(Base):
     embedding = Column(Vector(1536), nullable=True)
 
     faculty = relationship("Faculty", back_populates="papers")
+
+    __table_args__ = (
+        Index("idx_papers_faculty_citations", faculty_id, citation_count.desc().nulls_last()),
+    )
+
+
+class FacultyNeighbor(Base):
+
+    __tablename__ = "faculty_neighbors"
+
+    faculty_id = Column(Integer, ForeignKey("faculty.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+
+    neighbor_id = Column(Integer, ForeignKey("faculty.id", ondelete="CASCADE"), nullable=False)
+    similarity = Column(Float, nullable=False)
+
+
+class PrecomputedSearch(Base):
+
+    __tablename__ = "precomputed_search"
+
+    cache_key = Column(String(64), primary_key=True)
+
+    query = Column(Text, nullable=False)
+    results = Column(JSONB, nullable=False)
+
+    computed_at = Column(DateTime, server_default=func.now(), index=True)
+
+
+class ExploreSessionRecord(Base):
+
+    __tablename__ = "explore_sessions"
+
+    session_id = Column(String(36), primary_key=True)
+
+    state = Column(JSONB, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class PaperCluster(Base):
+
+    __tablename__ = "paper_clusters"
+
+    id = Column(Integer, primary_key=True)
+
+    centroid = Column(Vector(1536), nullable=False)
+    size = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
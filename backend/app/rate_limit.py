@@ -0,0 +1,11 @@
+import os
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+# Disable with RATE_LIMIT_ENABLED=false, e.g. when replaying a query log from one host.
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() != "false"
+
+
+def create_limiter(**kwargs) -> Limiter:
+    return Limiter(key_func=get_remote_address, enabled=RATE_LIMIT_ENABLED, **kwargs)
@@ -1,25 +1,41 @@
+import json
+from typing import Iterator
+
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
+from app.rate_limit import create_limiter
 from app.models import Paper, Faculty
 from app.schemas import (
     ExploreStartRequest, ExploreStartResponse,
     ExploreRespondRequest, ExploreRespondResponse,
     ExploreFinishRequest, ExploreFinishResponse,
+    ExploreExplainRequest, ExploreExplainResponse,
     ExplorePaper, FacultyMatch
 )
+from app.services.request_log import log_fields, session_token, stage
 from app.services.explorer import (
-    create_session, get_session, delete_session,
-    get_diverse_papers, get_similar_papers,
-    extract_preferences_and_refine, synthesize_direction,
-    match_faculty_to_direction, generate_exploration_prompt
+    SessionConflictError,
+    create_session, get_session, save_session, get_session_stats,
+    EXPLORE_REFINEMENT,
+    embed_for_session, get_diverse_papers, get_papers_near_vector, refine_preference_vector,
+    start_preference_extraction, resolve_speculative_papers,
+    STREAMED_EXPLANATIONS,
+    finish_exploration_results, start_speculative_finish,
+    discard_speculative_finish, take_speculative_finish,
+    synthesize_direction, direction_text, find_faculty_matches, format_faculty_match,
+    stream_faculty_explanations, mark_session_finished, reopen_session, match_explanation_data,
+    explain_session_match, cache_explanations,
+    generate_exploration_prompt
 )
+from app.services.llm import get_llm_client
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter()
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 
 def _get_faculty_names(papers: list[Paper], db: Session) -> dict[int, str]:
@@ -35,6 +51,14 @@ def _get_faculty_names(papers: list[Paper], db: Session) -> dict[int, str]:
     return {f.id: f.name for f in faculty_list}
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _sse_error(status_code: int, detail: str) -> str:
+    return _sse("error", {"status": status_code, "detail": detail})
+
+
 def _paper_to_response(paper: Paper, faculty_names: dict[int, str]) -> ExplorePaper:
     faculty_name = faculty_names.get(paper.faculty_id) if paper.faculty_id else None
 
@@ -53,13 +77,16 @@ def _paper_to_response(paper: Paper, faculty_names: dict[int, str]) -> ExplorePa
 def start_exploration(request: Request, body: ExploreStartRequest, db: Session = Depends(get_db)):
     try:
         session = create_session(body.initial_interest)
-
-        papers = get_diverse_papers(
-            db,
-            interest=body.initial_interest,
-            exclude_ids=[],
-            limit=4
-        )
+        log_fields(initial_interest=body.initial_interest, session=session_token(session.session_id))
+
+        with stage("retrieval"):
+            papers = get_diverse_papers(
+                db,
+                interest=body.initial_interest,
+                exclude_ids=[],
+                limit=4,
+                session=session
+            )
 
         if not papers:
             raise HTTPException(
@@ -67,11 +94,9 @@ def start_exploration(request: Request, body: ExploreStartRequest, db: Session =
                 detail="No papers found matching your interest. Try a broader topic."
             )
 
-        session.shown_paper_ids = [p.id for p in papers]
-        session.conversation.append({
-            "role": "system",
-            "content": f"User interested in: {body.initial_interest}"
-        })
+        session.shown_paper_ids.extend(p.id for p in papers)
+        session.add_message("system", f"User interested in: {body.initial_interest}")
+        save_session(session)
 
         prompt = generate_exploration_prompt(papers, round_num=0)
 
@@ -90,56 +115,120 @@ def start_exploration(request: Request, body: ExploreStartRequest, db: Session =
         )
 
 
-@router.post("/respond", response_model=ExploreRespondResponse)
-@limiter.limit("40/minute")
-def respond_to_exploration(request: Request, body: ExploreRespondRequest, db: Session = Depends(get_db)):
-    try:
-        session = get_session(body.session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found or expired")
-
-        session.conversation.append({
-            "role": "user",
-            "content": body.response
-        })
-        session.rounds += 1
+def _respond_steps(body: ExploreRespondRequest, db: Session) -> Iterator[tuple[str, object]]:
+    """
+    Run one explore round. With LLM refinement, yields ("speculative_papers",
+    list[Paper]) as soon as papers for the raw response are retrieved, while
+    Claude is still refining; always ends with ("result", ExploreRespondResponse).
+    Speculative papers are left unconverted so callers that discard them pay nothing.
+    """
+    session = get_session(body.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    discard_speculative_finish(session.session_id)
+    reopen_session(session)
+
+    session.add_message("user", body.response)
+    session.rounds += 1
+
+    if EXPLORE_REFINEMENT == "rocchio":
+        with stage("retrieval"):
+            preference_vector, is_converged = refine_preference_vector(
+                db,
+                session,
+                user_response=body.response,
+                liked_paper_ids=body.liked_paper_ids,
+                disliked_paper_ids=body.disliked_paper_ids
+            )
+            papers = get_papers_near_vector(
+                db,
+                embedding=preference_vector,
+                exclude_ids=session.shown_paper_ids,
+                limit=4,
+                session=session
+            )
+    else:
+        extraction = start_preference_extraction(session, body.response)
+
+        with stage("speculative_retrieval"):
+            speculative_embedding = embed_for_session(body.response, session)
+            speculative_papers = get_papers_near_vector(
+                db,
+                embedding=speculative_embedding,
+                exclude_ids=session.shown_paper_ids,
+                limit=4,
+                session=session
+            )
+        yield "speculative_papers", speculative_papers
 
-        result = extract_preferences_and_refine(session, body.response)
+        result = extraction.result()
 
         session.preferences["liked"].extend(result.get("liked", []))
         session.preferences["disliked"].extend(result.get("disliked", []))
         session.preferences["curious"].extend(result.get("curious", []))
+        is_converged = result.get("is_converged", False)
 
         refined_query = result.get("refined_query", body.response)
-        papers = get_similar_papers(
-            db,
-            query=refined_query,
-            exclude_ids=session.shown_paper_ids,
-            limit=4
+        with stage("retrieval"):
+            papers = resolve_speculative_papers(
+                db,
+                session,
+                refined_query=refined_query,
+                speculative_embedding=speculative_embedding,
+                speculative_papers=speculative_papers,
+                exclude_ids=session.shown_paper_ids,
+                limit=4
+            )
+
+    if not papers:
+        raise HTTPException(
+            status_code=404,
+            detail="No more papers found matching your refined interests. Try finishing the exploration to see faculty matches."
         )
 
-        if not papers:
-            raise HTTPException(
-                status_code=404,
-                detail="No more papers found matching your refined interests. Try finishing the exploration to see faculty matches."
-            )
+    session.shown_paper_ids.extend(p.id for p in papers)
+    save_session(session)
 
-        session.shown_paper_ids.extend([p.id for p in papers])
+    is_ready = is_converged or session.rounds >= 4
 
-        is_ready = result.get("is_converged", False) or session.rounds >= 4
+    prompt = generate_exploration_prompt(papers, round_num=session.rounds)
+    if is_ready:
+        prompt = "It looks like you're developing a clear research direction! Would you like to see faculty who work in this area, or continue exploring?"
+        start_speculative_finish(session)
 
-        prompt = generate_exploration_prompt(papers, round_num=session.rounds)
-        if is_ready:
-            prompt = "It looks like you're developing a clear research direction! Would you like to see faculty who work in this area, or continue exploring?"
+    faculty_names = _get_faculty_names(papers, db)
+    yield "result", ExploreRespondResponse(
+        papers=[_paper_to_response(p, faculty_names) for p in papers],
+        prompt=prompt,
+        is_ready=is_ready
+    )
 
-        faculty_names = _get_faculty_names(papers, db)
-        return ExploreRespondResponse(
-            papers=[_paper_to_response(p, faculty_names) for p in papers],
-            prompt=prompt,
-            is_ready=is_ready
+
+def _process_response(body: ExploreRespondRequest, db: Session) -> ExploreRespondResponse:
+    for kind, value in _respond_steps(body, db):
+        if kind == "result":
+            return value
+
+
+@router.post("/respond", response_model=ExploreRespondResponse)
+@limiter.limit("40/minute")
+def respond_to_exploration(request: Request, body: ExploreRespondRequest, db: Session = Depends(get_db)):
+    try:
+        log_fields(
+            response=body.response,
+            session=session_token(body.session_id),
+            liked_paper_ids=body.liked_paper_ids,
+            disliked_paper_ids=body.disliked_paper_ids,
         )
+        return _process_response(body, db)
     except HTTPException:
         raise
+    except SessionConflictError:
+        raise HTTPException(
+            status_code=409,
+            detail="Session was updated by another request. Please retry."
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -147,41 +236,212 @@ def respond_to_exploration(request: Request, body: ExploreRespondRequest, db: Se
         )
 
 
+def _finish_response(session) -> ExploreFinishResponse:
+    return ExploreFinishResponse(
+        direction_summary=session.direction["title"],
+        direction_description=session.direction["description"],
+        faculty_matches=[
+            FacultyMatch(
+                faculty=m["faculty"],
+                similarity=m["similarity"],
+                explanation=session.explanations.get(m["faculty"]["id"]),
+                key_paper=m["key_paper"]
+            )
+            for m in session.matches
+        ]
+    )
+
+
 @router.post("/finish", response_model=ExploreFinishResponse)
 @limiter.limit("20/minute")
 def finish_exploration(request: Request, body: ExploreFinishRequest, db: Session = Depends(get_db)):
+    """
+    Synthesize the direction and return the ranked faculty matches without
+    explanations; those are fetched per match from /explain. Repeated calls
+    return the same results while the session lives.
+    """
     try:
+        log_fields(session=session_token(body.session_id))
+
         session = get_session(body.session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found or expired")
 
-        direction = synthesize_direction(session)
+        if session.direction is None:
+            with stage("speculative_finish_wait"):
+                speculative = take_speculative_finish(session)
+            if speculative is not None:
+                direction, faculty_matches = speculative
+            else:
+                direction, faculty_matches = finish_exploration_results(db, session)
+            mark_session_finished(session, direction, faculty_matches)
 
-        faculty_matches = match_faculty_to_direction(
-            db,
-            direction_description=f"{direction['title']}: {direction['description']}",
-            limit=3
-        )
-
-        delete_session(body.session_id)
-
-        return ExploreFinishResponse(
-            direction_summary=direction["title"],
-            direction_description=direction["description"],
-            faculty_matches=[
-                FacultyMatch(
-                    faculty=m["faculty"],
-                    similarity=m["similarity"],
-                    explanation=m["explanation"],
-                    key_paper=m["key_paper"]
-                )
-                for m in faculty_matches
-            ]
-        )
+        return _finish_response(session)
     except HTTPException:
         raise
+    except SessionConflictError:
+        raise HTTPException(
+            status_code=409,
+            detail="Session was updated by another request. Please retry."
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to finish exploration: {str(e)}"
         )
+
+
+@router.post("/explain", response_model=ExploreExplainResponse)
+@limiter.limit("60/minute")
+def explain_match(request: Request, body: ExploreExplainRequest):
+    """Generate, or return the cached, explanation for one match of a finished session."""
+    log_fields(session=session_token(body.session_id), faculty_id=body.faculty_id)
+
+    session = get_session(body.session_id)
+    if not session or session.direction is None:
+        raise HTTPException(status_code=404, detail="Finished session not found or expired")
+
+    try:
+        with stage("explanation"):
+            explanation = explain_session_match(session, body.faculty_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate explanation: {str(e)}"
+        )
+
+    if explanation is None:
+        raise HTTPException(status_code=404, detail="Faculty is not a match for this session")
+
+    return ExploreExplainResponse(faculty_id=body.faculty_id, explanation=explanation)
+
+
+@router.post("/respond/stream")
+@limiter.limit("40/minute")
+def respond_to_exploration_stream(request: Request, body: ExploreRespondRequest):
+    """
+    Server-sent events variant of /respond. Emits "status" right away, then
+    "speculative_papers" as soon as papers for the raw response are retrieved
+    (LLM refinement only, while Claude is still refining), then the final
+    "papers" and "prompt" once the round is ready, and finally "done".
+    Failures after the stream has started are sent as an "error" event.
+    """
+    log_fields(
+        response=body.response,
+        session=session_token(body.session_id),
+        liked_paper_ids=body.liked_paper_ids,
+        disliked_paper_ids=body.disliked_paper_ids,
+    )
+    if not get_session(body.session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    def events() -> Iterator[str]:
+        yield _sse("status", {"stage": "refining"})
+        try:
+            with SessionLocal() as db:
+                for kind, value in _respond_steps(body, db):
+                    if kind == "speculative_papers":
+                        faculty_names = _get_faculty_names(value, db)
+                        yield _sse(
+                            "speculative_papers",
+                            [_paper_to_response(paper, faculty_names).model_dump() for paper in value]
+                        )
+                    else:
+                        result = value
+        except HTTPException as e:
+            yield _sse_error(e.status_code, e.detail)
+            return
+        except SessionConflictError:
+            yield _sse_error(409, "Session was updated by another request. Please retry.")
+            return
+        except Exception as e:
+            yield _sse_error(500, f"Failed to process exploration response: {str(e)}")
+            return
+
+        yield _sse("papers", [paper.model_dump() for paper in result.papers])
+        yield _sse("prompt", {"prompt": result.prompt, "is_ready": result.is_ready})
+        yield _sse("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/finish/stream")
+@limiter.limit("20/minute")
+def finish_exploration_stream(request: Request, body: ExploreFinishRequest):
+    """
+    Server-sent events variant of /finish. Emits "direction", then one "match"
+    per faculty, then "explanation_delta" token chunks and a final "explanation"
+    for the top matches as Claude streams them, and finally "done". Remaining
+    matches are explained on demand through /explain.
+    """
+    log_fields(session=session_token(body.session_id))
+    session = get_session(body.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    def events() -> Iterator[str]:
+        try:
+            direction_sent = False
+            if session.direction is None:
+                speculative = take_speculative_finish(session)
+                if speculative is not None:
+                    direction, faculty_matches = speculative
+                else:
+                    direction = synthesize_direction(session)
+                    yield _sse("direction", {"title": direction["title"], "description": direction["description"]})
+                    direction_sent = True
+
+                    with SessionLocal() as db:
+                        faculty_data = find_faculty_matches(db, direction_text(direction), session=session)
+                    faculty_matches = [
+                        format_faculty_match(faculty_id, data, None) for faculty_id, data in faculty_data.items()
+                    ]
+                mark_session_finished(session, direction, faculty_matches)
+
+            if not direction_sent:
+                yield _sse("direction", {
+                    "title": session.direction["title"],
+                    "description": session.direction["description"]
+                })
+            for match in session.matches:
+                yield _sse("match", {**match, "explanation": session.explanations.get(match["faculty"]["id"])})
+
+            pending = {
+                match["faculty"]["id"]: match_explanation_data(match)
+                for match in session.matches[:STREAMED_EXPLANATIONS]
+                if match["faculty"]["id"] not in session.explanations
+            }
+            explanations = {}
+            for faculty_id, kind, content in stream_faculty_explanations(
+                get_llm_client(), direction_text(session.direction), pending
+            ):
+                if kind == "delta":
+                    yield _sse("explanation_delta", {"faculty_id": faculty_id, "text": content})
+                    continue
+                if kind == "done":
+                    explanations[faculty_id] = content
+                yield _sse("explanation", {"faculty_id": faculty_id, "explanation": content})
+            if explanations:
+                cache_explanations(session.session_id, explanations)
+
+            yield _sse("done", {})
+        except Exception as e:
+            yield _sse_error(500, f"Failed to finish exploration: {str(e)}")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/stats")
+@limiter.limit("10/minute")
+def session_stats(request: Request):
+    """
+    Explore session count and approximate stored bytes. This queries the
+    session store, so it is kept off the /health liveness probe.
+    """
+    try:
+        return get_session_stats()
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Explore session store unavailable: {str(e)}"
+        )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.rate_limit import create_limiter
+from app.models import Faculty
+from app.schemas import SearchResult
+from app.services.neighbors import FACULTY_NEIGHBOR_COUNT, get_similar_faculty
+from app.services.request_log import log_fields, stage
+
+router = APIRouter()
+limiter = create_limiter()
+
+
+@router.get("/{faculty_id}/similar", response_model=list[SearchResult])
+@limiter.limit("60/minute")
+def similar_faculty(
+    request: Request,
+    faculty_id: int,
+    limit: int = Query(default=10, ge=1, le=FACULTY_NEIGHBOR_COUNT),
+    db: Session = Depends(get_db),
+):
+    log_fields(faculty_id=faculty_id, limit=limit)
+
+    with stage("neighbors"):
+        results = get_similar_faculty(db, faculty_id=faculty_id, limit=limit)
+
+    if not results and not db.query(Faculty.id).filter(Faculty.id == faculty_id).first():
+        raise HTTPException(status_code=404, detail="Faculty not found")
+
+    return results
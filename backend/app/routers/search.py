@@ -1,36 +1,128 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.database import get_db
-from app.schemas import ExplanationRequest, ExplanationResponse, SearchRequest, SearchResult
-from app.services.embeddings import get_embedding
+from app.rate_limit import create_limiter
+from app.schemas import (
+    BatchSearchRequest, BatchSearchResult,
+    ExplanationRequest, ExplanationResponse,
+    SearchRequest, SearchResult, Suggestion
+)
+from app.services.embeddings import EmbeddingUnavailableError, get_embedding_with_deadline, get_embeddings
 from app.services.explanations import generate_explanation
+from app.services.precompute import get_precomputed_results, get_recent_results, remember_results
+from app.services.request_log import log_fields, stage
 from app.services.query_expansion import expand_query
-from app.services.search import search_faculty_hybrid
+from app.services.search import (
+    search_faculty_by_papers, search_faculty_fulltext_only,
+    search_faculty_hybrid, search_faculty_hybrid_batch
+)
+from app.services.suggest import DEFAULT_SUGGESTION_LIMIT, suggest
 from app.models import Faculty, Paper
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter()
+
+DEGRADED_HEADER = "X-Search-Degraded"
+
 
 @router.post("/", response_model=list[SearchResult])
 @limiter.limit("30/minute")
-def search_faculty(request: Request, body: SearchRequest, db: Session = Depends(get_db)):
+def search_faculty(request: Request, response: Response, body: SearchRequest, db: Session = Depends(get_db)):
+    log_fields(**body.model_dump())
+
+    with stage("precomputed_lookup"):
+        precomputed = get_precomputed_results(db, body)
+    if precomputed is not None:
+        return precomputed
+
     expanded_query = expand_query(body.query)
-    query_embedding = get_embedding(expanded_query)
-    return search_faculty_hybrid(
-        db=db,
-        query=expanded_query,
-        embedding=query_embedding,
-        limit=body.limit,
-        min_h_index=body.min_h_index,
-        universities=body.universities,
-    )
+    try:
+        query_embedding = get_embedding_with_deadline(expanded_query)
+    except EmbeddingUnavailableError:
+        response.headers[DEGRADED_HEADER] = "true"
+        log_fields(degraded=True)
+        cached = get_recent_results(body)
+        if cached is not None:
+            return cached
+        with stage("search"):
+            return search_faculty_fulltext_only(
+                db=db,
+                query=expanded_query,
+                limit=body.limit,
+                min_h_index=body.min_h_index,
+                universities=body.universities,
+            )
+
+    with stage("search"):
+        if body.mode == "papers":
+            results = search_faculty_by_papers(
+                db=db,
+                embedding=query_embedding,
+                limit=body.limit,
+                min_h_index=body.min_h_index,
+                universities=body.universities,
+                aggregation=body.paper_aggregation,
+            )
+        else:
+            results = search_faculty_hybrid(
+                db=db,
+                query=expanded_query,
+                embedding=query_embedding,
+                limit=body.limit,
+                min_h_index=body.min_h_index,
+                universities=body.universities,
+                diversify=body.diversify,
+                mmr_lambda=body.diversity_lambda,
+                lexical=body.lexical_retriever,
+            )
+
+    remember_results(body, results)
+    return results
+
+@router.post("/batch", response_model=list[BatchSearchResult])
+@limiter.limit("5/minute")
+def search_faculty_batch(request: Request, body: BatchSearchRequest, db: Session = Depends(get_db)):
+    log_fields(**body.model_dump())
+
+    expanded_queries = [expand_query(q) for q in body.queries]
+    query_embeddings = get_embeddings(expanded_queries)
+    with stage("search"):
+        results = search_faculty_hybrid_batch(
+            db=db,
+            queries=expanded_queries,
+            embeddings=query_embeddings,
+            limit=body.limit,
+            min_h_index=body.min_h_index,
+            universities=body.universities,
+        )
+    return [
+        BatchSearchResult(query=query, results=query_results)
+        for query, query_results in zip(body.queries, results)
+    ]
+
+@router.get("/suggest", response_model=list[Suggestion])
+@limiter.limit("120/minute")
+def suggest_queries(
+    request: Request,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=DEFAULT_SUGGESTION_LIMIT, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    log_fields(q=q, limit=limit)
+
+    with stage("suggest"):
+        entries = suggest(db, q, limit=limit)
+    return [
+        Suggestion(text=entry.text, kind=entry.kind, faculty_id=entry.faculty_id)
+        for entry in entries
+    ]
 
 @router.post("/explain", response_model=ExplanationResponse)
 @limiter.limit("20/minute")
 def explain_match(request: Request, body: ExplanationRequest, db: Session = Depends(get_db)):
+    log_fields(**body.model_dump())
+
     faculty = db.query(Faculty).filter(Faculty.id == body.faculty_id).first()
     if not faculty:
         from fastapi import HTTPException
@@ -1,17 +1,19 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Depends, Request
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.database import get_db
+from app.rate_limit import create_limiter
 from app.schemas import CVUploadResponse
-from app.services.cv_parser import extract_text, summarize_research_interests
-from app.services.embeddings import get_embedding
-from app.services.search import search_faculty_by_embedding
+from app.services.cv_parser import extract_text_async, summarize_research_interests
+from app.routers.search import DEGRADED_HEADER
+from app.services.embeddings import EmbeddingUnavailableError, get_embedding_async
+from app.services.search import search_faculty_by_embedding, search_faculty_fulltext_only
+from app.services.request_log import log_fields, stage
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter()
 
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
@@ -20,12 +22,20 @@ MAX_FILE_SIZE = 10 * 1024 * 1024
 @limiter.limit("10/minute")
 async def upload_cv(
     request: Request,
+    response: Response,
     file: UploadFile = File(...),
     limit: int = Query(default=10, ge=1, le=20),
     min_h_index: Optional[int] = Query(default=0, ge=0),
     universities: Optional[list[str]] = Query(default=None),
     db: Session = Depends(get_db),
 ):
+    """
+    Match faculty to an uploaded CV. Parsing runs in a worker process, the LLM
+    and embedding calls use async clients and the synchronous search runs in
+    the threadpool, so uploads never stall other requests on the event loop.
+    When the embedding provider is unavailable the upload falls back to
+    full-text search and sets the degraded header, as /api/search does.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
 
@@ -41,6 +51,14 @@ async def upload_cv(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
 
+    log_fields(
+        file_type=filename_lower.rsplit(".", 1)[-1],
+        size_bytes=len(file_bytes),
+        limit=limit,
+        min_h_index=min_h_index,
+        universities=universities,
+    )
+
     if len(file_bytes) > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=413,
@@ -50,7 +68,8 @@ async def upload_cv(
         )
 
     try:
-        cv_text = extract_text(file_bytes, file.filename)
+        with stage("text_extraction"):
+            cv_text = await extract_text_async(file_bytes, file.filename)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
 
@@ -58,7 +77,7 @@ async def upload_cv(
         raise HTTPException(status_code=400, detail="Could not extract text from file")
 
     try:
-        interests_summary = summarize_research_interests(cv_text)
+        interests_summary = await summarize_research_interests(cv_text)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -66,20 +85,33 @@ async def upload_cv(
         )
 
     try:
-        query_embedding = get_embedding(interests_summary)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error generating embedding: {str(e)}"
+        query_embedding = await get_embedding_async(interests_summary)
+    except EmbeddingUnavailableError:
+        response.headers[DEGRADED_HEADER] = "true"
+        log_fields(degraded=True)
+        with stage("search"):
+            search_results = await run_in_threadpool(
+                search_faculty_fulltext_only,
+                db=db,
+                query=interests_summary,
+                limit=limit,
+                min_h_index=min_h_index,
+                universities=universities,
+            )
+        return CVUploadResponse(
+            extracted_interests=interests_summary,
+            results=search_results
         )
 
-    search_results = search_faculty_by_embedding(
-        db=db,
-        embedding=query_embedding,
-        limit=limit,
-        min_h_index=min_h_index,
-        universities=universities,
-    )
+    with stage("search"):
+        search_results = await run_in_threadpool(
+            search_faculty_by_embedding,
+            db=db,
+            embedding=query_embedding,
+            limit=limit,
+            min_h_index=min_h_index,
+            universities=universities,
+        )
 
     return CVUploadResponse(
         extracted_interests=interests_summary,
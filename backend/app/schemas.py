@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 import uuid
 
 
@@ -38,6 +38,29 @@ class SearchRequest(BaseModel):
     limit: int = 10
     min_h_index: int = 0
     universities: Optional[List[str]] = None
+    mode: Literal["hybrid", "papers"] = "hybrid"
+    paper_aggregation: Literal["max", "top3_mean", "citation_weighted"] = "max"
+    lexical_retriever: Literal["fulltext", "bm25"] = "fulltext"
+    diversify: bool = False
+    diversity_lambda: float = Field(default=0.7, ge=0.0, le=1.0)
+
+class BatchSearchRequest(BaseModel):
+    queries: list[str] = Field(min_length=1, max_length=50)
+    limit: int = 10
+    min_h_index: int = 0
+    universities: Optional[List[str]] = None
+
+
+class BatchSearchResult(BaseModel):
+    query: str
+    results: list[SearchResult]
+
+
+class Suggestion(BaseModel):
+    text: str
+    kind: Literal["tag", "faculty"]
+    faculty_id: Optional[int] = None
+
 
 class ExplanationRequest(BaseModel):
     interests: str
@@ -90,6 +113,8 @@ class ExploreStartResponse(BaseModel):
 class ExploreRespondRequest(BaseModel):
     session_id: str = Field(pattern=r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
     response: str = Field(min_length=1, max_length=2000)
+    liked_paper_ids: list[int] = Field(default_factory=list, max_length=20)
+    disliked_paper_ids: list[int] = Field(default_factory=list, max_length=20)
 
 
 class ExploreRespondResponse(BaseModel):
@@ -105,7 +130,7 @@ class ExploreFinishRequest(BaseModel):
 class FacultyMatch(BaseModel):
     faculty: FacultyResponse
     similarity: float
-    explanation: str
+    explanation: Optional[str] = None
     key_paper: Optional[str] = None
 
 
@@ -113,3 +138,13 @@ class ExploreFinishResponse(BaseModel):
     direction_summary: str
     direction_description: str
     faculty_matches: list[FacultyMatch]
+
+
+class ExploreExplainRequest(BaseModel):
+    session_id: str
+    faculty_id: int
+
+
+class ExploreExplainResponse(BaseModel):
+    faculty_id: int
+    explanation: str
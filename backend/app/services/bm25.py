@@ -0,0 +1,317 @@
+"""In-process BM25 index over faculty research tags and paper text."""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_INDEX_TTL = timedelta(minutes=30)
+DELTA_COMPACTION_THRESHOLD = 50_000
+ABSTRACT_MAX_CHARS = 1000
+# Filter masks are keyed by user-supplied university lists, so only the most recent are kept.
+FILTER_MASK_CACHE_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into",
+    "is", "it", "its", "of", "on", "or", "that", "the", "their", "this", "to",
+    "we", "with", "our", "using", "via", "based",
+})
+
+
+def tokenize(value: str) -> list[str]:
+    return [t for t in _TOKEN_PATTERN.findall(value.lower()) if t not in STOPWORDS]
+
+
+def _ensure_capacity(array: np.ndarray, size: int) -> np.ndarray:
+    """Grow an array geometrically so repeated appends stay amortized O(1)."""
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array), 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class BM25Index:
+    """
+    BM25 inverted index stored as compact NumPy arrays.
+
+    Postings are kept term-major (CSC layout): for term t, rows
+    post_rows[term_ptr[t]:term_ptr[t + 1]] with term frequencies post_tfs.
+    Added or updated documents go to a small delta segment and replaced
+    documents are tombstoned; compact() folds both back into the arrays once the
+    delta outgrows the main segment, keeping bulk loads amortized linear.
+    Scores are computed at query time from document lengths and live document
+    frequencies, so incremental updates never require re-weighting postings.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+
+        self._vocab: dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int32)
+
+        self._term_ptr = np.zeros(1, dtype=np.int64)
+        self._post_rows = np.zeros(0, dtype=np.int32)
+        self._post_tfs = np.zeros(0, dtype=np.float32)
+
+        self._delta: dict[int, tuple[list[int], list[float]]] = {}
+        self._delta_size = 0
+
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._row_terms: list[np.ndarray] = []
+        self._row_of: dict[int, int] = {}
+        self._total_len = 0.0
+
+        self._h_index = np.zeros(0, dtype=np.int32)
+        self._affiliations: list[str] = []
+        self._mask_cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+
+        self._n_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._vocab.get(term)
+        if term_id is None:
+            term_id = len(self._vocab)
+            self._vocab[term] = term_id
+            self._df = _ensure_capacity(self._df, term_id + 1)
+        return term_id
+
+    def add_document(self, doc_id: int, content: str, h_index: int = 0, affiliation: str = "") -> None:
+        """Add a document, replacing any previous version with the same id."""
+        with self._lock:
+            self._remove(doc_id)
+
+            counts = Counter(tokenize(content))
+            row = self._n_rows
+            term_ids = np.array([self._term_id(term) for term in counts], dtype=np.int32)
+
+            for term_id, tf in zip(term_ids, counts.values()):
+                rows, tfs = self._delta.setdefault(int(term_id), ([], []))
+                rows.append(row)
+                tfs.append(float(tf))
+            self._delta_size += len(term_ids)
+            self._df[term_ids] += 1
+
+            doc_len = float(sum(counts.values()))
+            self._n_rows += 1
+            self._doc_ids = _ensure_capacity(self._doc_ids, self._n_rows)
+            self._doc_len = _ensure_capacity(self._doc_len, self._n_rows)
+            self._live = _ensure_capacity(self._live, self._n_rows)
+            self._h_index = _ensure_capacity(self._h_index, self._n_rows)
+            self._doc_ids[row] = doc_id
+            self._doc_len[row] = doc_len
+            self._live[row] = True
+            self._h_index[row] = h_index or 0
+            self._affiliations.append((affiliation or "").lower())
+            self._row_terms.append(term_ids)
+            self._row_of[doc_id] = row
+            self._total_len += doc_len
+            self._mask_cache.clear()
+
+            if self._delta_size > max(DELTA_COMPACTION_THRESHOLD, len(self._post_rows)):
+                self.compact()
+
+    def remove_document(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+            self._mask_cache.clear()
+
+    def _remove(self, doc_id: int) -> None:
+        row = self._row_of.pop(doc_id, None)
+        if row is None:
+            return
+        self._live[row] = False
+        self._df[self._row_terms[row]] -= 1
+        self._total_len -= float(self._doc_len[row])
+
+    def compact(self) -> None:
+        """Merge the delta segment into the main arrays and drop tombstoned rows."""
+        with self._lock:
+            main_terms = np.repeat(
+                np.arange(len(self._term_ptr) - 1, dtype=np.int32), np.diff(self._term_ptr)
+            )
+            delta_terms = [t for t, (rows, _) in self._delta.items() for _ in rows]
+            delta_rows = [r for rows, _ in self._delta.values() for r in rows]
+            delta_tfs = [tf for _, tfs in self._delta.values() for tf in tfs]
+
+            terms = np.concatenate([main_terms, np.array(delta_terms, dtype=np.int32)])
+            rows = np.concatenate([self._post_rows, np.array(delta_rows, dtype=np.int32)])
+            tfs = np.concatenate([self._post_tfs, np.array(delta_tfs, dtype=np.float32)])
+
+            live = self._live[:self._n_rows]
+            keep = live[rows]
+            terms, rows, tfs = terms[keep], rows[keep], tfs[keep]
+
+            live_rows = np.flatnonzero(live)
+            new_row = np.full(self._n_rows, -1, dtype=np.int32)
+            new_row[live_rows] = np.arange(len(live_rows), dtype=np.int32)
+            rows = new_row[rows]
+
+            order = np.lexsort((rows, terms))
+            self._post_rows = rows[order]
+            self._post_tfs = tfs[order]
+            counts = np.bincount(terms, minlength=len(self._vocab))
+            self._term_ptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+            self._delta = {}
+            self._delta_size = 0
+
+            self._doc_ids = self._doc_ids[live_rows]
+            self._doc_len = self._doc_len[live_rows]
+            self._h_index = self._h_index[live_rows]
+            self._affiliations = [self._affiliations[r] for r in live_rows]
+            self._row_terms = [self._row_terms[r] for r in live_rows]
+            self._live = np.ones(len(live_rows), dtype=bool)
+            self._df = self._df[:len(self._vocab)].copy()
+            self._n_rows = len(live_rows)
+            self._row_of = {int(doc_id): row for row, doc_id in enumerate(self._doc_ids)}
+            self._mask_cache.clear()
+
+    def _filter_mask(self, min_h_index: int, universities: Optional[list[str]]) -> np.ndarray:
+        key = (min_h_index, tuple(sorted(universities or [])))
+        mask = self._mask_cache.get(key)
+        if mask is not None:
+            self._mask_cache.move_to_end(key)
+            return mask
+
+        mask = self._live[:self._n_rows] & (self._h_index[:self._n_rows] >= min_h_index)
+        if universities:
+            prefixes = tuple(u.lower() for u in universities)
+            mask &= np.array([a.startswith(prefixes) for a in self._affiliations], dtype=bool)
+        self._mask_cache[key] = mask
+        while len(self._mask_cache) > FILTER_MASK_CACHE_SIZE:
+            self._mask_cache.popitem(last=False)
+        return mask
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        min_h_index: int = 0,
+        universities: Optional[list[str]] = None,
+    ) -> list[tuple[int, float]]:
+        """Return up to `limit` (doc_id, bm25_score) pairs, best first."""
+        with self._lock:
+            n_docs = len(self._row_of)
+            if n_docs == 0:
+                return []
+
+            avg_len = self._total_len / n_docs
+            scores = np.zeros(self._n_rows, dtype=np.float32)
+
+            for term in set(tokenize(query)):
+                term_id = self._vocab.get(term)
+                if term_id is None or self._df[term_id] == 0:
+                    continue
+
+                if term_id + 1 < len(self._term_ptr):
+                    start, stop = self._term_ptr[term_id], self._term_ptr[term_id + 1]
+                else:
+                    start = stop = 0
+                rows = self._post_rows[start:stop]
+                tfs = self._post_tfs[start:stop]
+                if term_id in self._delta:
+                    delta_rows, delta_tfs = self._delta[term_id]
+                    rows = np.concatenate([rows, np.array(delta_rows, dtype=np.int32)])
+                    tfs = np.concatenate([tfs, np.array(delta_tfs, dtype=np.float32)])
+
+                df = float(self._df[term_id])
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_len[rows] / avg_len)
+                scores[rows] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+            scores[~self._filter_mask(min_h_index, universities)] = 0.0
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+                candidates = candidates[top]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+            return [(int(self._doc_ids[row]), float(scores[row])) for row in candidates]
+
+
+def build_faculty_bm25_index(db: Session) -> BM25Index:
+    """Index each faculty member's name, research tags and paper titles/abstracts."""
+    faculty_rows = db.execute(
+        text("SELECT id, name, affiliation, h_index, research_tags FROM faculty")
+    ).fetchall()
+
+    paper_rows = db.execute(
+        text("SELECT faculty_id, title, abstract FROM papers WHERE faculty_id IS NOT NULL")
+    ).fetchall()
+
+    paper_text_by_faculty = {}
+    for row in paper_rows:
+        if row.faculty_id not in paper_text_by_faculty:
+            paper_text_by_faculty[row.faculty_id] = []
+        paper_text_by_faculty[row.faculty_id].append(row.title or "")
+        if row.abstract:
+            paper_text_by_faculty[row.faculty_id].append(row.abstract[:ABSTRACT_MAX_CHARS])
+
+    index = BM25Index()
+    for row in faculty_rows:
+        parts = [row.name or "", " ".join(row.research_tags or [])]
+        parts.extend(paper_text_by_faculty.get(row.id, []))
+        index.add_document(row.id, "\n".join(parts), h_index=row.h_index, affiliation=row.affiliation)
+    index.compact()
+    return index
+
+
+_index: Optional[BM25Index] = None
+_index_built_at: Optional[datetime] = None
+_index_lock = threading.Lock()
+_rebuild_thread: Optional[threading.Thread] = None
+
+
+def _rebuild_index() -> None:
+    global _index, _index_built_at
+    try:
+        with SessionLocal() as db:
+            index = build_faculty_bm25_index(db)
+    except Exception:
+        logger.exception("Failed to rebuild the BM25 index")
+        return
+    with _index_lock:
+        _index = index
+        _index_built_at = datetime.now()
+
+
+def get_faculty_bm25_index(db: Session) -> BM25Index:
+    """
+    Return the shared index. Only the very first call builds it on the request
+    path; once it is older than BM25_INDEX_TTL a background thread rebuilds it
+    and swaps it in, while searches keep using the previous index.
+    """
+    global _index, _index_built_at, _rebuild_thread
+    with _index_lock:
+        if _index is None:
+            _index = build_faculty_bm25_index(db)
+            _index_built_at = datetime.now()
+        elif datetime.now() - _index_built_at > BM25_INDEX_TTL and (
+            _rebuild_thread is None or not _rebuild_thread.is_alive()
+        ):
+            _rebuild_thread = threading.Thread(target=_rebuild_index, name="bm25-index-rebuild", daemon=True)
+            _rebuild_thread.start()
+        return _index
@@ -0,0 +1,93 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+CANDIDATE_POOL_SIZE = 200
+POOL_MIN_REMAINING = 12
+# text-embedding-3-small places a follow-up on the same topic roughly 0.5-0.75 from
+# the anchor query and unrelated topics below ~0.3, so only a real topic change refills.
+POOL_DRIFT_SIMILARITY = 0.5
+# Each pool is ~CANDIDATE_POOL_SIZE * 1536 * 4 bytes (about 1.2 MB).
+CANDIDATE_POOL_CACHE_SIZE = int(os.environ.get("EXPLORE_CANDIDATE_POOL_CACHE_SIZE", "100"))
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+class CandidatePool:
+    """
+    Papers fetched once around an anchor vector, kept as an id array, a
+    unit-normalized float32 embedding matrix, topic cluster ids (-1 when not
+    clustered yet) and the display fields, so explore rounds can be ranked and
+    filtered without touching the database.
+    """
+
+    __slots__ = ("ids", "embeddings", "clusters", "rows", "anchor")
+
+    def __init__(self, ids: np.ndarray, embeddings: np.ndarray, rows: list[tuple], anchor, clusters: Optional[np.ndarray] = None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        self.embeddings = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        self.clusters = np.full(len(self.ids), -1, dtype=np.int64) if clusters is None else np.asarray(clusters, dtype=np.int64)
+        self.rows = rows
+        self.anchor = _unit(anchor)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _available(self, exclude_ids) -> np.ndarray:
+        if not len(exclude_ids):
+            return np.ones(len(self.ids), dtype=bool)
+        return ~np.isin(self.ids, np.fromiter(exclude_ids, dtype=np.int64))
+
+    def remaining(self, exclude_ids) -> int:
+        return int(self._available(exclude_ids).sum())
+
+    def needs_refill(self, query, exclude_ids) -> bool:
+        """True when few unseen papers are left or the query has drifted away from the anchor."""
+        if self.remaining(exclude_ids) < POOL_MIN_REMAINING:
+            return True
+        return float(_unit(query) @ self.anchor) < POOL_DRIFT_SIMILARITY
+
+    def rank(self, query, exclude_ids, limit: int) -> tuple[list[int], np.ndarray]:
+        """Indices of the `limit` most similar unseen papers and their similarities."""
+        similarities = self.embeddings @ _unit(query)
+        similarities[~self._available(exclude_ids)] = -np.inf
+
+        limit = min(limit, int(np.isfinite(similarities).sum()))
+        if limit <= 0:
+            return [], np.empty(0, dtype=np.float32)
+
+        top = np.argpartition(-similarities, limit - 1)[:limit]
+        top = top[np.argsort(-similarities[top])]
+        return top.tolist(), similarities[top]
+
+
+_pools: OrderedDict[str, CandidatePool] = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def get_candidate_pool(session_id: str) -> Optional[CandidatePool]:
+    with _pools_lock:
+        pool = _pools.get(session_id)
+        if pool is not None:
+            _pools.move_to_end(session_id)
+        return pool
+
+
+def store_candidate_pool(session_id: str, pool: CandidatePool) -> None:
+    with _pools_lock:
+        _pools[session_id] = pool
+        _pools.move_to_end(session_id)
+        while len(_pools) > CANDIDATE_POOL_CACHE_SIZE:
+            _pools.popitem(last=False)
+
+
+def drop_candidate_pool(session_id: str) -> None:
+    with _pools_lock:
+        _pools.pop(session_id, None)
@@ -0,0 +1,93 @@
+import numpy as np
+
+PAPER_CLUSTER_COUNT = 256
+KMEANS_BATCH_SIZE = 4096
+KMEANS_ITERATIONS = 100
+ASSIGN_BATCH_SIZE = 8192
+INIT_SAMPLE_PER_CLUSTER = 50
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def assign_clusters(embeddings: np.ndarray, centroids: np.ndarray, batch_size: int = ASSIGN_BATCH_SIZE) -> np.ndarray:
+    """Index of the most cosine-similar centroid for every row."""
+    matrix = _normalize_rows(embeddings)
+    unit_centroids = _normalize_rows(centroids)
+    labels = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), batch_size):
+        labels[start:start + batch_size] = np.argmax(matrix[start:start + batch_size] @ unit_centroids.T, axis=1)
+    return labels
+
+
+def update_centroids(centroids: np.ndarray, counts: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+    """
+    Fold a batch into the centroids in place (Sculley's mini-batch k-means step):
+    every centroid moves toward its assigned points with a per-center learning
+    rate of 1 / count, so centroids are running means of everything assigned.
+    `counts` is updated in place as well. Returns the batch's labels.
+    """
+    matrix = _normalize_rows(embeddings)
+    labels = assign_clusters(matrix, centroids)
+
+    for cluster in np.unique(labels):
+        members = matrix[labels == cluster]
+        counts[cluster] += len(members)
+        rate = len(members) / counts[cluster]
+        centroids[cluster] += rate * (members.mean(axis=0) - centroids[cluster])
+
+    return labels
+
+
+def _kmeans_plus_plus(matrix: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Greedy k-means++ seeding on cosine distance over a subsample of unit rows:
+    each step draws a few candidates by D^2 weighting and keeps the one that
+    lowers the total distance most.
+    """
+    sample = matrix[rng.choice(len(matrix), size=min(len(matrix), k * INIT_SAMPLE_PER_CLUSTER), replace=False)]
+    local_trials = 2 + int(np.log(k))
+
+    chosen = [int(rng.integers(len(sample)))]
+    distances = np.maximum(1.0 - sample @ sample[chosen[0]], 0.0)
+
+    for _ in range(1, k):
+        total = distances.sum()
+        if total <= 0:
+            chosen.append(int(rng.integers(len(sample))))
+            continue
+        candidates = rng.choice(len(sample), size=local_trials, p=distances / total)
+        candidate_distances = np.minimum(distances, np.maximum(1.0 - sample[candidates] @ sample.T, 0.0))
+        best = int(np.argmin(candidate_distances.sum(axis=1)))
+        chosen.append(int(candidates[best]))
+        distances = candidate_distances[best]
+
+    return sample[chosen].copy()
+
+
+def minibatch_kmeans(
+    embeddings: np.ndarray,
+    k: int = PAPER_CLUSTER_COUNT,
+    batch_size: int = KMEANS_BATCH_SIZE,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Spherical mini-batch k-means over unit-normalized rows.
+    Returns (centroids, counts): centroids shaped (k, dim), counts of points folded in per centroid.
+    """
+    matrix = _normalize_rows(embeddings)
+    k = min(k, len(matrix))
+    rng = np.random.default_rng(seed)
+
+    centroids = _kmeans_plus_plus(matrix, k, rng)
+    counts = np.zeros(k, dtype=np.int64)
+
+    for _ in range(iterations):
+        batch = matrix[rng.choice(len(matrix), size=min(batch_size, len(matrix)), replace=False)]
+        update_centroids(centroids, counts, batch)
+
+    return centroids, counts
@@ -1,13 +1,24 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+
 import fitz
 from docx import Document
 from io import BytesIO
-from anthropic import Anthropic
-import os
+
+from app.services.llm import get_async_llm_client
 
 CV_MAX_CHARS = 15000
 CV_SUMMARY_MAX_TOKENS = 500
+# Worker processes for PDF/DOCX parsing, which is CPU-bound and holds the GIL.
+CV_EXTRACTION_WORKERS = int(os.environ.get("CV_EXTRACTION_WORKERS", "2"))
+
+client = get_async_llm_client()
 
-client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+_extraction_executor = None
+_extraction_executor_lock = threading.Lock()
 
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
@@ -34,11 +45,28 @@ def extract_text(file_bytes: bytes, filename: str) -> str:
         raise ValueError(f"Unsupported file type: {filename}")
 
 
-def summarize_research_interests(cv_text: str) -> str:
+def _get_extraction_executor() -> Executor:
+    global _extraction_executor
+    with _extraction_executor_lock:
+        if _extraction_executor is None:
+            _extraction_executor = ProcessPoolExecutor(
+                max_workers=CV_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _extraction_executor
+
+
+async def extract_text_async(file_bytes: bytes, filename: str) -> str:
+    """Run extract_text in the worker process pool so parsing never blocks the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_extraction_executor(), extract_text, file_bytes, filename)
+
+
+async def summarize_research_interests(cv_text: str) -> str:
     if len(cv_text) > CV_MAX_CHARS:
         cv_text = cv_text[:CV_MAX_CHARS]
 
-    response = client.messages.create(
+    response = await client.messages.create(
         model="claude-sonnet-4-20250514",
         max_tokens=CV_SUMMARY_MAX_TOKENS,
         messages=[
@@ -0,0 +1,50 @@
+import numpy as np
+
+DEFAULT_MMR_LAMBDA = 0.7
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    embeddings: np.ndarray,
+    k: int,
+    lambda_: float = DEFAULT_MMR_LAMBDA,
+) -> list[int]:
+    """
+    Maximal Marginal Relevance selection over a candidate pool.
+
+    Picks k candidate indices, each maximizing
+    lambda * relevance - (1 - lambda) * max cosine similarity to the already selected.
+    lambda=1 keeps the relevance order, lambda=0 maximizes diversity.
+    """
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    relevance = np.asarray(relevance, dtype=np.float32)
+    matrix = _normalize_rows(embeddings)
+    pairwise = matrix @ matrix.T
+
+    max_sim_to_selected = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected = []
+
+    for _ in range(k):
+        if selected:
+            scores = lambda_ * relevance - (1.0 - lambda_) * max_sim_to_selected
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+
+        chosen = int(np.argmax(scores))
+        selected.append(chosen)
+        available[chosen] = False
+        max_sim_to_selected = np.maximum(max_sim_to_selected, pairwise[chosen])
+
+    return selected
@@ -1,10 +1,215 @@
+import asyncio
+import hashlib
 import os
-from openai import OpenAI
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-def get_embedding(text: str) -> list[float]:
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
+
+from app.services.request_log import stage
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+
+# EMBEDDING_PROVIDER=local swaps OpenAI for deterministic offline vectors (load tests, replay).
+EMBEDDING_PROVIDER = os.environ.get("EMBEDDING_PROVIDER", "openai")
+LOCAL_EMBEDDING_LATENCY_MS = float(os.environ.get("LOCAL_EMBEDDING_LATENCY_MS", "0"))
+
+EMBEDDING_REQUEST_TIMEOUT_SECONDS = 10.0
+EMBEDDING_DEADLINE_SECONDS = float(os.environ.get("EMBEDDING_DEADLINE_SECONDS", "2.0"))
+EMBEDDING_HEDGING_ENABLED = os.environ.get("EMBEDDING_HEDGING_ENABLED", "false").lower() == "true"
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+
+class EmbeddingUnavailableError(Exception):
+    """Raised when the embedding provider is failing, too slow, or the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_seconds`. After that a single trial call is let through (half-open);
+    its success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+
+class LatencyTracker:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> float | None:
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            return float(np.percentile(self._samples, 95))
+
+
+_breaker = CircuitBreaker()
+_latency = LatencyTracker()
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="embedding")
+
+
+def _local_embedding(text: str) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIMENSIONS)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def _local_embeddings(texts: list[str]) -> list[list[float]]:
+    if LOCAL_EMBEDDING_LATENCY_MS:
+        time.sleep(LOCAL_EMBEDDING_LATENCY_MS / 1000)
+    return [_local_embedding(text) for text in texts]
+
+
+def _create_embedding(text: str) -> list[float]:
+    if EMBEDDING_PROVIDER == "local":
+        return _local_embeddings([text])[0]
+
+    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), timeout=EMBEDDING_REQUEST_TIMEOUT_SECONDS)
     response = client.embeddings.create(
         input=text,
-        model="text-embedding-3-small"
+        model=EMBEDDING_MODEL
     )
-    return response.data[0].embedding
\ No newline at end of file
+    return response.data[0].embedding
+
+
+def get_embedding(text: str) -> list[float]:
+    with stage("embedding"):
+        return _create_embedding(text)
+
+
+async def _create_embedding_async(text: str) -> list[float]:
+    if EMBEDDING_PROVIDER == "local":
+        if LOCAL_EMBEDDING_LATENCY_MS:
+            await asyncio.sleep(LOCAL_EMBEDDING_LATENCY_MS / 1000)
+        return _local_embedding(text)
+
+    async with AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), timeout=EMBEDDING_REQUEST_TIMEOUT_SECONDS) as client:
+        response = await client.embeddings.create(
+            input=text,
+            model=EMBEDDING_MODEL
+        )
+    return response.data[0].embedding
+
+
+async def get_embedding_async(text: str, deadline: float = EMBEDDING_DEADLINE_SECONDS) -> list[float]:
+    """
+    Awaitable get_embedding_with_deadline for async endpoints; never blocks the event loop.
+
+    Shares the circuit breaker and latency window with the synchronous path and
+    raises EmbeddingUnavailableError under the same conditions (without hedging).
+    """
+    if not _breaker.allow_request():
+        raise EmbeddingUnavailableError("Embedding circuit breaker is open")
+
+    with stage("embedding"):
+        start = time.monotonic()
+        try:
+            embedding = await asyncio.wait_for(_create_embedding_async(text), timeout=deadline)
+        except Exception:
+            _breaker.record_failure()
+            raise EmbeddingUnavailableError("Embedding provider failed or exceeded the deadline")
+
+    _latency.record(time.monotonic() - start)
+    _breaker.record_success()
+    return embedding
+
+
+def get_embedding_with_deadline(text: str, deadline: float = EMBEDDING_DEADLINE_SECONDS) -> list[float]:
+    """
+    Embed `text` within `deadline` seconds behind a circuit breaker.
+
+    With EMBEDDING_HEDGING_ENABLED, a second identical request is sent once the
+    first has been outstanding longer than the recent p95 latency, and whichever
+    succeeds first wins. Raises EmbeddingUnavailableError when the breaker is open,
+    the deadline passes, or every attempt fails.
+    """
+    if not _breaker.allow_request():
+        raise EmbeddingUnavailableError("Embedding circuit breaker is open")
+
+    with stage("embedding"):
+        start = time.monotonic()
+        pending = {_executor.submit(_create_embedding, text)}
+
+        hedge_after = _latency.p95() if EMBEDDING_HEDGING_ENABLED else None
+        hedged = hedge_after is None or hedge_after >= deadline
+
+        while pending:
+            elapsed = time.monotonic() - start
+            wait_for = deadline - elapsed if hedged else min(hedge_after, deadline) - elapsed
+            done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    _latency.record(time.monotonic() - start)
+                    _breaker.record_success()
+                    return future.result()
+
+            if not done:
+                if hedged:
+                    break
+                pending.add(_executor.submit(_create_embedding, text))
+                hedged = True
+
+    _breaker.record_failure()
+    raise EmbeddingUnavailableError("Embedding provider failed or exceeded the deadline")
+
+
+def get_embeddings(texts: list[str]) -> list[list[float]]:
+    """Embed several texts with a single API call, preserving input order."""
+    with stage("embedding"):
+        if EMBEDDING_PROVIDER == "local":
+            return _local_embeddings(texts)
+
+        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), timeout=EMBEDDING_REQUEST_TIMEOUT_SECONDS)
+        response = client.embeddings.create(
+            input=texts,
+            model=EMBEDDING_MODEL
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
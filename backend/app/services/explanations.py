@@ -1,12 +1,12 @@
-import os
 import re
-from anthropic import Anthropic
+
+from app.services.llm import get_llm_client
 
 EXPLANATION_MAX_TOKENS = 400
 
 
 def generate_explanation(interests: str, faculty_name: str, papers: list[str]) -> dict:
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    client = get_llm_client()
     paper_list = "\n".join(f"- {p}" for p in papers[:5])
 
     prompt = f"""A prospective PhD student is interested in: {interests}
@@ -1,85 +1,283 @@
+import base64
+import contextvars
 import os
 import uuid
 import json
+import logging
+import queue
 import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
-from anthropic import Anthropic, APIError, APIConnectionError, RateLimitError, APITimeoutError
+import numpy as np
+from anthropic import APIError, APIConnectionError, RateLimitError, APITimeoutError
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-
-from app.services.embeddings import get_embedding
+from pgvector.sqlalchemy import Vector
+
+from app.database import SessionLocal
+from app.services.candidate_pool import (
+    CANDIDATE_POOL_SIZE, CandidatePool,
+    drop_candidate_pool, get_candidate_pool, store_candidate_pool
+)
+from app.services.diversity import mmr_select
+from app.services.embeddings import EMBEDDING_DIMENSIONS, get_embedding
+from app.services.llm import get_llm_client
+from app.services.request_log import stage
+from app.services.session_store import SessionConflictError, create_session_store
 from app.models import Paper, Faculty
 
 DEFAULT_PAPERS_PER_ROUND = 4
 PAPER_DIVERSITY_MULTIPLIER = 3
-DEFAULT_FACULTY_MATCHES = 3
+EXPLORE_DIVERSITY_LAMBDA = 0.5
+DEFAULT_FACULTY_MATCHES = 20
+STREAMED_EXPLANATIONS = 3
 PREFERENCE_EXTRACTION_MAX_TOKENS = 500
 DIRECTION_SYNTHESIS_MAX_TOKENS = 300
 FACULTY_EXPLANATION_MAX_TOKENS = 100
-
-_sessions: dict[str, "ExploreSession"] = {}
-_sessions_lock = threading.Lock()
+FACULTY_EXPLANATION_CONCURRENCY = 8
+FACULTY_EXPLANATION_TIMEOUT_SECONDS = 8.0
+MAX_SPECULATIVE_FINISHES = 256
+SPECULATIVE_FINISH_WAIT_SECONDS = 30.0
 
 SESSION_TTL = timedelta(hours=1)
+SESSION_SWEEP_INTERVAL_SECONDS = 60
+MAX_CONVERSATION_MESSAGES = 12
+MAX_CACHED_QUERY_VECTORS = 4
+QUERY_VECTOR_CACHE_SESSIONS = 256
+
+# EXPLORE_REFINEMENT=rocchio refines rounds with a local preference vector instead of a Claude call.
+EXPLORE_REFINEMENT = os.environ.get("EXPLORE_REFINEMENT", "llm")
+ROCCHIO_ALPHA = 1.0
+ROCCHIO_BETA = 0.75
+ROCCHIO_GAMMA = 0.25
+ROCCHIO_CONVERGENCE_SIMILARITY = 0.97
+
+# Papers retrieved for the raw response are kept when the refined query embeds this close to it.
+SPECULATION_SIMILARITY = 0.9
+
+# papers.cluster_id only exists once scripts/cluster_papers.py has run; until then
+# explore stays in MMR-only mode and re-checks for the column at this interval.
+CLUSTER_COLUMN_RECHECK_SECONDS = 300.0
+
+logger = logging.getLogger(__name__)
+
+_store = create_session_store()
+_sweeper: Optional[threading.Thread] = None
+_sweeper_lock = threading.Lock()
+_llm_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="explore-llm")
+_explanation_executor = ThreadPoolExecutor(max_workers=FACULTY_EXPLANATION_CONCURRENCY, thread_name_prefix="explore-explain")
+_finish_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="explore-finish")
+
+_cluster_column_exists = False
+_cluster_column_checked_at: Optional[float] = None
+
+# session_id -> (session version the result was computed for, future of finish results)
+_speculative_finishes: OrderedDict[str, tuple[int, Future]] = OrderedDict()
+_speculative_finishes_lock = threading.Lock()
+
+# Query embeddings stay in process instead of the serialized session (~33 KB per session as JSON).
+_query_vectors: OrderedDict[str, OrderedDict[str, list[float]]] = OrderedDict()
+_query_vectors_lock = threading.Lock()
+
+
+def _encode_vector(vector: list[float]) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
 
+def _decode_vector(encoded: str) -> list[float]:
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.float32).tolist()
 
-@dataclass
+
+def _unit_vector(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+@dataclass(slots=True)
 class ExploreSession:
     session_id: str
     initial_interest: str
-    shown_paper_ids: list[int] = field(default_factory=list)
+    shown_paper_ids: array = field(default_factory=lambda: array("q"))
     conversation: list[dict] = field(default_factory=list)
     preferences: dict = field(default_factory=lambda: {"liked": [], "disliked": [], "curious": []})
     created_at: datetime = field(default_factory=datetime.now)
     rounds: int = 0
+    preference_vector: Optional[list[float]] = None
+    direction: Optional[dict] = None
+    matches: list[dict] = field(default_factory=list)
+    explanations: dict[int, str] = field(default_factory=dict)
+    version: int = 0
+
+    @property
+    def expires_at(self) -> datetime:
+        return self.created_at + SESSION_TTL
+
+    def add_message(self, role: str, content: str) -> None:
+        """Append to the conversation, keeping the opening message and the most recent turns."""
+        self.conversation.append({"role": role, "content": content})
+        if len(self.conversation) > MAX_CONVERSATION_MESSAGES:
+            del self.conversation[1:len(self.conversation) - MAX_CONVERSATION_MESSAGES + 1]
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "initial_interest": self.initial_interest,
+            "shown_paper_ids": self.shown_paper_ids.tolist(),
+            "conversation": self.conversation,
+            "preferences": self.preferences,
+            "created_at": self.created_at.isoformat(),
+            "rounds": self.rounds,
+            "preference_vector": _encode_vector(self.preference_vector) if self.preference_vector is not None else None,
+            "direction": self.direction,
+            "matches": self.matches,
+            "explanations": {str(faculty_id): explanation for faculty_id, explanation in self.explanations.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, version: int = 0) -> "ExploreSession":
+        return cls(
+            session_id=data["session_id"],
+            initial_interest=data["initial_interest"],
+            shown_paper_ids=array("q", data["shown_paper_ids"]),
+            conversation=data["conversation"],
+            preferences=data["preferences"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            rounds=data["rounds"],
+            preference_vector=_decode_vector(data["preference_vector"]) if data.get("preference_vector") else None,
+            direction=data.get("direction"),
+            matches=data.get("matches", []),
+            explanations={int(faculty_id): explanation for faculty_id, explanation in data.get("explanations", {}).items()},
+            version=version,
+        )
+
+
+def _sweep_expired_sessions() -> None:
+    while True:
+        time.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        try:
+            _store.purge_expired()
+        except Exception:
+            logger.exception("Failed to purge expired explore sessions")
+
+
+def _ensure_sweeper() -> None:
+    global _sweeper
+    with _sweeper_lock:
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper = threading.Thread(target=_sweep_expired_sessions, name="explore-session-sweeper", daemon=True)
+            _sweeper.start()
 
 
 def create_session(initial_interest: str) -> ExploreSession:
+    _ensure_sweeper()
     session_id = str(uuid.uuid4())
     session = ExploreSession(
         session_id=session_id,
         initial_interest=initial_interest
     )
-    with _sessions_lock:
-        _sessions[session_id] = session
+    session.version = _store.create(session_id, session.to_dict(), session.expires_at)
     return session
 
 
 def get_session(session_id: str) -> Optional[ExploreSession]:
-    with _sessions_lock:
-        session = _sessions.get(session_id)
-        if session:
-            if datetime.now() - session.created_at > SESSION_TTL:
-                _sessions.pop(session_id, None)
-                return None
-        return session
+    record = _store.get(session_id)
+    if record is None:
+        return None
+    state, version = record
+    return ExploreSession.from_dict(state, version=version)
 
 
-def delete_session(session_id: str) -> None:
-    with _sessions_lock:
-        _sessions.pop(session_id, None)
+def save_session(session: ExploreSession) -> None:
+    """
+    Persist changes made to a session since it was loaded. Raises
+    SessionConflictError if another request saved it in the meantime.
+    """
+    session.version = _store.save(session.session_id, session.to_dict(), session.version, session.expires_at)
 
 
-def get_diverse_papers(db: Session, interest: str, exclude_ids: list[int], limit: int = DEFAULT_PAPERS_PER_ROUND) -> list[Paper]:
-    query_embedding = get_embedding(interest)
-
+def delete_session(session_id: str) -> None:
+    _store.delete(session_id)
+    drop_candidate_pool(session_id)
+    drop_query_vectors(session_id)
+    discard_speculative_finish(session_id)
+
+
+def get_session_stats() -> dict:
+    return _store.stats()
+
+
+def embed_for_session(text: str, session: Optional[ExploreSession] = None) -> list[float]:
+    """
+    Embed `text`, reusing the vector cached for the session when the same text was
+    embedded in an earlier round. The few most recent query vectors are kept per
+    session, in this process only; a session served elsewhere simply re-embeds.
+    """
+    if session is None:
+        return get_embedding(text)
+
+    key = text.strip()
+    with _query_vectors_lock:
+        vectors = _query_vectors.get(session.session_id)
+        if vectors is not None and key in vectors:
+            _query_vectors.move_to_end(session.session_id)
+            vectors.move_to_end(key)
+            return vectors[key]
+
+    vector = get_embedding(text)
+    with _query_vectors_lock:
+        vectors = _query_vectors.setdefault(session.session_id, OrderedDict())
+        _query_vectors.move_to_end(session.session_id)
+        vectors[key] = vector
+        while len(vectors) > MAX_CACHED_QUERY_VECTORS:
+            vectors.popitem(last=False)
+        while len(_query_vectors) > QUERY_VECTOR_CACHE_SESSIONS:
+            _query_vectors.popitem(last=False)
+    return vector
+
+
+def drop_query_vectors(session_id: str) -> None:
+    with _query_vectors_lock:
+        _query_vectors.pop(session_id, None)
+
+
+def _papers_have_cluster_ids(db: Session) -> bool:
+    global _cluster_column_exists, _cluster_column_checked_at
+    if _cluster_column_exists:
+        return True
+
+    now = time.monotonic()
+    if _cluster_column_checked_at is not None and now - _cluster_column_checked_at < CLUSTER_COLUMN_RECHECK_SECONDS:
+        return False
+
+    _cluster_column_checked_at = now
+    _cluster_column_exists = db.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'papers' AND column_name = 'cluster_id'
+    """)).first() is not None
+    return _cluster_column_exists
+
+
+def _fetch_candidate_pool(db: Session, embedding: list[float], exclude_ids: Sequence[int], size: int) -> CandidatePool:
+    cluster_column = "cluster_id" if _papers_have_cluster_ids(db) else "CAST(NULL AS integer) AS cluster_id"
     exclude_clause = ""
     params = {
-        "embedding": str(query_embedding),
-        "limit": limit * PAPER_DIVERSITY_MULTIPLIER
+        "embedding": str(embedding),
+        "limit": size
     }
 
     if exclude_ids:
         exclude_clause = "AND id != ALL(:exclude_ids)"
-        params["exclude_ids"] = exclude_ids
+        params["exclude_ids"] = list(exclude_ids)
 
     results = db.execute(
         text(f"""
-            SELECT id, title, abstract, year, venue, faculty_id,
-                   1 - (embedding <=> :embedding) as similarity
+            SELECT id, title, abstract, year, venue, faculty_id, {cluster_column}, embedding
             FROM papers
             WHERE embedding IS NOT NULL
                 AND abstract IS NOT NULL
@@ -87,58 +285,191 @@ def get_diverse_papers(db: Session, interest: str, exclude_ids: list[int], limit
                 {exclude_clause}
             ORDER BY embedding <=> :embedding
             LIMIT :limit
-        """),
+        """).columns(embedding=Vector(EMBEDDING_DIMENSIONS)),
         params
     ).fetchall()
 
-    if not results:
-        return []
+    return CandidatePool(
+        ids=np.array([row.id for row in results], dtype=np.int64),
+        embeddings=np.array([row.embedding for row in results], dtype=np.float32).reshape(len(results), EMBEDDING_DIMENSIONS),
+        rows=[(row.id, row.title, row.abstract, row.year, row.venue, row.faculty_id) for row in results],
+        anchor=embedding,
+        clusters=np.array([-1 if row.cluster_id is None else row.cluster_id for row in results], dtype=np.int64),
+    )
 
-    diverse_papers = []
-    step = max(1, len(results) // limit)
-    for i in range(0, len(results), step):
-        if len(diverse_papers) >= limit:
-            break
-        row = results[i]
-        paper = db.query(Paper).filter(Paper.id == row.id).first()
-        if paper:
-            diverse_papers.append(paper)
 
-    return diverse_papers
+def _pool_papers(pool: CandidatePool, indices: list[int]) -> list[Paper]:
+    papers = []
+    for i in indices:
+        paper_id, title, abstract, year, venue, faculty_id = pool.rows[i]
+        papers.append(Paper(id=paper_id, title=title, abstract=abstract, year=year, venue=venue, faculty_id=faculty_id))
+    return papers
+
+
+def get_diverse_papers(
+    db: Session,
+    interest: str,
+    exclude_ids: Sequence[int],
+    limit: int = DEFAULT_PAPERS_PER_ROUND,
+    session: Optional[ExploreSession] = None,
+) -> list[Paper]:
+    """
+    Pick `limit` papers that are relevant to the interest but spread across its
+    sub-areas: one query fetches the candidate pool with embeddings and topic
+    clusters, then the best paper of each of the nearest clusters is chosen in
+    memory, topped up with MMR when the pool is not clustered. With a session,
+    the pool is kept for later rounds.
+    """
+    query_embedding = embed_for_session(interest, session)
+
+    pool_size = CANDIDATE_POOL_SIZE if session else limit * PAPER_DIVERSITY_MULTIPLIER
+    pool = _fetch_candidate_pool(db, query_embedding, exclude_ids, pool_size)
+    if session:
+        store_candidate_pool(session.session_id, pool)
+
+    candidates, _ = pool.rank(query_embedding, exclude_ids, len(pool))
+    if not candidates:
+        return []
 
+    selected = select_across_clusters(candidates, pool.clusters[candidates], limit)
+    if len(selected) < limit:
+        shortlist = [c for c in candidates[:limit * PAPER_DIVERSITY_MULTIPLIER] if c not in selected]
+        if shortlist:
+            relevance = pool.embeddings[shortlist] @ _unit_vector(query_embedding)
+            picks = mmr_select(relevance, pool.embeddings[shortlist], k=limit - len(selected), lambda_=EXPLORE_DIVERSITY_LAMBDA)
+            selected += [shortlist[i] for i in picks]
+
+    return _pool_papers(pool, selected)
+
+
+def select_across_clusters(candidates: list[int], clusters: np.ndarray, limit: int) -> list[int]:
+    """
+    Walk candidates in relevance order and keep the best one from each topic
+    cluster, so the picks come from the `limit` clusters nearest the query.
+    Unclustered candidates (-1) are skipped.
+    """
+    selected = []
+    seen_clusters = set()
+    for candidate, cluster in zip(candidates, clusters.tolist()):
+        if cluster < 0 or cluster in seen_clusters:
+            continue
+        seen_clusters.add(cluster)
+        selected.append(candidate)
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+def get_similar_papers(
+    db: Session,
+    query: str,
+    exclude_ids: Sequence[int],
+    limit: int = DEFAULT_PAPERS_PER_ROUND,
+    session: Optional[ExploreSession] = None,
+) -> list[Paper]:
+    return get_papers_near_vector(db, embed_for_session(query, session), exclude_ids, limit, session)
+
+
+def get_papers_near_vector(
+    db: Session,
+    embedding: list[float],
+    exclude_ids: Sequence[int],
+    limit: int = DEFAULT_PAPERS_PER_ROUND,
+    session: Optional[ExploreSession] = None,
+) -> list[Paper]:
+    """
+    Nearest unseen papers to `embedding`. With a session, they are ranked from
+    its cached candidate pool, which is refetched around `embedding` only when
+    it runs low or the query has drifted away from where it was fetched.
+    """
+    pool = get_candidate_pool(session.session_id) if session else None
+    if pool is None or pool.needs_refill(embedding, exclude_ids):
+        pool = _fetch_candidate_pool(db, embedding, exclude_ids, CANDIDATE_POOL_SIZE if session else limit)
+        if session:
+            store_candidate_pool(session.session_id, pool)
 
-def get_similar_papers(db: Session, query: str, exclude_ids: list[int], limit: int = DEFAULT_PAPERS_PER_ROUND) -> list[Paper]:
-    query_embedding = get_embedding(query)
+    indices, _ = pool.rank(embedding, exclude_ids, limit)
+    return _pool_papers(pool, indices)
 
-    exclude_clause = ""
-    params = {
-        "embedding": str(query_embedding),
-        "limit": limit
-    }
 
-    if exclude_ids:
-        exclude_clause = "AND id != ALL(:exclude_ids)"
-        params["exclude_ids"] = exclude_ids
+def _fetch_marked_papers(db: Session, paper_ids: list[int]) -> dict[int, tuple[str, np.ndarray]]:
+    if not paper_ids:
+        return {}
 
     results = db.execute(
-        text(f"""
-            SELECT id
+        text("""
+            SELECT id, title, embedding
             FROM papers
-            WHERE embedding IS NOT NULL
-                AND abstract IS NOT NULL
-                {exclude_clause}
-            ORDER BY embedding <=> :embedding
-            LIMIT :limit
-        """),
-        params
+            WHERE id = ANY(:paper_ids) AND embedding IS NOT NULL
+        """).columns(embedding=Vector(EMBEDDING_DIMENSIONS)),
+        {"paper_ids": paper_ids}
     ).fetchall()
 
-    paper_ids = [r.id for r in results]
-    return db.query(Paper).filter(Paper.id.in_(paper_ids)).all()
+    return {row.id: (row.title, np.asarray(row.embedding, dtype=np.float32)) for row in results}
+
+
+def rocchio_update(
+    current: np.ndarray,
+    positives: list[np.ndarray],
+    negatives: list[np.ndarray],
+    alpha: float = ROCCHIO_ALPHA,
+    beta: float = ROCCHIO_BETA,
+    gamma: float = ROCCHIO_GAMMA,
+) -> np.ndarray:
+    """Move the unit-normalized preference vector toward positives and away from negatives."""
+    updated = alpha * np.asarray(current, dtype=np.float32)
+    if positives:
+        updated = updated + beta * np.mean(positives, axis=0)
+    if negatives:
+        updated = updated - gamma * np.mean(negatives, axis=0)
+
+    norm = np.linalg.norm(updated)
+    return updated / norm if norm > 0 else np.asarray(current, dtype=np.float32)
+
+
+def refine_preference_vector(
+    db: Session,
+    session: ExploreSession,
+    user_response: str,
+    liked_paper_ids: Sequence[int] = (),
+    disliked_paper_ids: Sequence[int] = (),
+) -> tuple[list[float], bool]:
+    """
+    Rocchio-style refinement without an LLM call. Papers the user marked are
+    taken from those already shown and their titles recorded as preferences;
+    when no paper was marked, the response text itself is the positive signal
+    (the only case that needs an embedding call). Returns the new vector and
+    whether it has stopped moving between rounds.
+    """
+    if session.preference_vector is not None:
+        current = _unit_vector(session.preference_vector)
+    else:
+        current = _unit_vector(embed_for_session(session.initial_interest, session))
+
+    shown = set(session.shown_paper_ids)
+    liked = [paper_id for paper_id in liked_paper_ids if paper_id in shown]
+    disliked = [paper_id for paper_id in disliked_paper_ids if paper_id in shown]
+    marked = _fetch_marked_papers(db, liked + disliked)
+    liked = [paper_id for paper_id in liked if paper_id in marked]
+    disliked = [paper_id for paper_id in disliked if paper_id in marked]
+
+    session.preferences["liked"].extend(marked[paper_id][0] for paper_id in liked)
+    session.preferences["disliked"].extend(marked[paper_id][0] for paper_id in disliked)
+
+    positives = [marked[paper_id][1] for paper_id in liked]
+    negatives = [marked[paper_id][1] for paper_id in disliked]
+    if not positives and not negatives:
+        positives = [np.asarray(embed_for_session(user_response, session), dtype=np.float32)]
+
+    updated = rocchio_update(current, positives, negatives)
+    is_converged = session.rounds >= 2 and float(updated @ current) >= ROCCHIO_CONVERGENCE_SIMILARITY
+
+    session.preference_vector = updated.tolist()
+    return session.preference_vector, is_converged
 
 
 def extract_preferences_and_refine(session: ExploreSession, user_response: str) -> dict:
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    client = get_llm_client()
 
     conv_context = f"Initial interest: {session.initial_interest}\n"
     conv_context += f"Rounds so far: {session.rounds}\n"
@@ -201,8 +532,41 @@ Respond in this exact JSON format:
     return result
 
 
+def start_preference_extraction(session: ExploreSession, user_response: str) -> Future:
+    """
+    Run extract_preferences_and_refine in the background so the speculative
+    retrieval for the raw response overlaps the Claude call.
+    """
+    context = contextvars.copy_context()
+    return _llm_executor.submit(context.run, extract_preferences_and_refine, session, user_response)
+
+
+def resolve_speculative_papers(
+    db: Session,
+    session: ExploreSession,
+    refined_query: str,
+    speculative_embedding: list[float],
+    speculative_papers: list[Paper],
+    exclude_ids: Sequence[int],
+    limit: int = DEFAULT_PAPERS_PER_ROUND,
+) -> list[Paper]:
+    """
+    Keep papers retrieved speculatively for the raw response when the refined
+    query points the same way, otherwise retrieve again for the refined query.
+
+    The refined query is only known once the Claude extraction returns, so its
+    embedding still runs after it: a round costs about LLM + one embedding call
+    (skipped when the refined query was embedded before), with the speculative
+    retrieval hidden behind the LLM call rather than added after it.
+    """
+    refined_embedding = embed_for_session(refined_query, session)
+    if speculative_papers and float(_unit_vector(refined_embedding) @ _unit_vector(speculative_embedding)) >= SPECULATION_SIMILARITY:
+        return speculative_papers
+    return get_papers_near_vector(db, refined_embedding, exclude_ids, limit, session)
+
+
 def synthesize_direction(session: ExploreSession) -> dict:
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    client = get_llm_client()
 
     context = f"Initial interest: {session.initial_interest}\n\n"
     context += "Conversation history:\n"
@@ -249,42 +613,129 @@ Respond in JSON format:
     return result
 
 
-def match_faculty_to_direction(db: Session, direction_description: str, limit: int = DEFAULT_FACULTY_MATCHES) -> list[dict]:
-    query_embedding = get_embedding(direction_description)
+# The key paper is looked up per matched faculty through
+# idx_papers_faculty_citations, so the cost scales with `limit`, not the corpus.
+FACULTY_MATCH_SQL = """
+    WITH matched_faculty AS (
+        SELECT id, name, affiliation, h_index, paper_count,
+               semantic_scholar_id, research_tags,
+               1 - (embedding <=> :embedding) as similarity
+        FROM faculty
+        WHERE embedding IS NOT NULL
+        ORDER BY embedding <=> :embedding
+        LIMIT :limit
+    )
+    SELECT
+        mf.id, mf.name, mf.affiliation, mf.h_index, mf.paper_count,
+        mf.semantic_scholar_id, mf.research_tags, mf.similarity,
+        tp.title as top_paper_title
+    FROM matched_faculty mf
+    LEFT JOIN LATERAL (
+        SELECT p.title
+        FROM papers p
+        WHERE p.faculty_id = mf.id
+        ORDER BY p.citation_count DESC NULLS LAST
+        LIMIT 1
+    ) tp ON true
+    ORDER BY mf.similarity DESC
+"""
+
+
+def _fallback_explanation(data: dict) -> str:
+    return f"Research focus aligns with {', '.join(data['research_tags'][:3] if data['research_tags'] else ['your interests'])}."
+
+
+def _explanation_prompt(direction_description: str, data: dict) -> str:
+    return f"""In 1-2 sentences, explain why this faculty member matches a student interested in: "{direction_description}"
+
+Faculty: {data['name']} at {data['affiliation']}
+Research areas: {', '.join(data['research_tags'] or [])}
+Top paper: {data['top_paper_title'] if data['top_paper_title'] else 'N/A'}"""
+
+
+def _explain_faculty_match(client, direction_description: str, data: dict) -> Optional[str]:
+    """Claude's explanation for one match, or None when the call fails or times out."""
+    try:
+        explanation_response = client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=FACULTY_EXPLANATION_MAX_TOKENS,
+            messages=[{"role": "user", "content": _explanation_prompt(direction_description, data)}],
+            timeout=FACULTY_EXPLANATION_TIMEOUT_SECONDS
+        )
+        return explanation_response.content[0].text.strip()
+    except (APIError, APIConnectionError, RateLimitError, APITimeoutError):
+        return None
+
+
+def _stream_faculty_explanation(client, direction_description: str, faculty_id: int, data: dict, events: queue.Queue) -> None:
+    parts = []
+    try:
+        with client.messages.stream(
+            model="claude-sonnet-4-20250514",
+            max_tokens=FACULTY_EXPLANATION_MAX_TOKENS,
+            messages=[{"role": "user", "content": _explanation_prompt(direction_description, data)}],
+            timeout=FACULTY_EXPLANATION_TIMEOUT_SECONDS
+        ) as stream:
+            for chunk in stream.text_stream:
+                parts.append(chunk)
+                events.put((faculty_id, "delta", chunk))
+        events.put((faculty_id, "done", "".join(parts).strip()))
+    except Exception:
+        events.put((faculty_id, "fallback", _fallback_explanation(data)))
+
+
+def stream_faculty_explanations(
+    client,
+    direction_description: str,
+    faculty_data: dict[int, dict],
+    timeout: float = FACULTY_EXPLANATION_TIMEOUT_SECONDS,
+) -> Iterator[tuple[int, str, str]]:
+    """
+    Stream explanations for all matches concurrently. Yields (faculty_id, "delta", text)
+    as tokens arrive and exactly one final event per faculty: (faculty_id, "done",
+    explanation), or (faculty_id, "fallback", text) when Claude failed or did not
+    finish within `timeout`. Fallback text is generic and should not be cached.
+    """
+    events: queue.Queue = queue.Queue()
+    for faculty_id, data in faculty_data.items():
+        _explanation_executor.submit(
+            contextvars.copy_context().run,
+            _stream_faculty_explanation, client, direction_description, faculty_id, data, events
+        )
+
+    pending = set(faculty_data)
+    deadline = time.monotonic() + timeout
+    while pending:
+        try:
+            faculty_id, kind, content = events.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            break
+        if faculty_id not in pending:
+            continue
+        if kind != "delta":
+            pending.discard(faculty_id)
+        yield faculty_id, kind, content
+
+    for faculty_id in faculty_data:
+        if faculty_id in pending:
+            yield faculty_id, "fallback", _fallback_explanation(faculty_data[faculty_id])
+
+
+def find_faculty_matches(
+    db: Session,
+    direction_description: str,
+    limit: int = DEFAULT_FACULTY_MATCHES,
+    session: Optional[ExploreSession] = None,
+) -> dict[int, dict]:
+    """Nearest faculty to the direction with their key paper, keyed by id in rank order."""
+    query_embedding = embed_for_session(direction_description, session)
 
     results = db.execute(
-        text("""
-            WITH top_papers AS (
-                SELECT
-                    p.faculty_id,
-                    p.title,
-                    p.citation_count,
-                    ROW_NUMBER() OVER (PARTITION BY p.faculty_id ORDER BY p.citation_count DESC NULLS LAST) as rn
-                FROM papers p
-            ),
-            matched_faculty AS (
-                SELECT id, name, affiliation, h_index, paper_count,
-                       semantic_scholar_id, research_tags,
-                       1 - (embedding <=> :embedding) as similarity
-                FROM faculty
-                WHERE embedding IS NOT NULL
-                ORDER BY embedding <=> :embedding
-                LIMIT :limit
-            )
-            SELECT
-                mf.id, mf.name, mf.affiliation, mf.h_index, mf.paper_count,
-                mf.semantic_scholar_id, mf.research_tags, mf.similarity,
-                tp.title as top_paper_title
-            FROM matched_faculty mf
-            LEFT JOIN top_papers tp ON mf.id = tp.faculty_id AND tp.rn = 1
-        """),
+        text(FACULTY_MATCH_SQL),
         {"embedding": str(query_embedding), "limit": limit}
     ).fetchall()
 
-    matches = []
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
-    faculty_data = {
+    return {
         row.id: {
             "name": row.name,
             "affiliation": row.affiliation,
@@ -298,39 +749,163 @@ def match_faculty_to_direction(db: Session, direction_description: str, limit: i
         for row in results
     }
 
-    for faculty_id, data in faculty_data.items():
-        explanation_prompt = f"""In 1-2 sentences, explain why this faculty member matches a student interested in: "{direction_description}"
 
-Faculty: {data['name']} at {data['affiliation']}
-Research areas: {', '.join(data['research_tags'] or [])}
-Top paper: {data['top_paper_title'] if data['top_paper_title'] else 'N/A'}"""
+def format_faculty_match(faculty_id: int, data: dict, explanation: Optional[str]) -> dict:
+    return {
+        "faculty": {
+            "id": faculty_id,
+            "name": data['name'],
+            "affiliation": data['affiliation'],
+            "h_index": data['h_index'],
+            "paper_count": data['paper_count'],
+            "semantic_scholar_id": data['semantic_scholar_id'],
+            "research_tags": data['research_tags'] or []
+        },
+        "similarity": float(data['similarity']),
+        "explanation": explanation,
+        "key_paper": data['top_paper_title']
+    }
+
+
+def finish_exploration_results(
+    db: Session,
+    session: ExploreSession,
+    limit: int = DEFAULT_FACULTY_MATCHES,
+) -> tuple[dict, list[dict]]:
+    """
+    Synthesize the session's research direction and rank faculty against it.
+    Matches carry no explanation; those are generated on demand.
+    """
+    direction = synthesize_direction(session)
+
+    with stage("faculty_match"):
+        faculty_data = find_faculty_matches(
+            db,
+            direction_description=direction_text(direction),
+            limit=limit,
+            session=session
+        )
+
+    matches = [format_faculty_match(faculty_id, data, None) for faculty_id, data in faculty_data.items()]
+    return direction, matches
 
+
+def direction_text(direction: dict) -> str:
+    return f"{direction['title']}: {direction['description']}"
+
+
+def mark_session_finished(session: ExploreSession, direction: dict, matches: list[dict]) -> None:
+    """Keep the finish results on the session so explanations can be requested later."""
+    session.direction = direction
+    session.matches = matches
+    save_session(session)
+    drop_candidate_pool(session.session_id)
+    discard_speculative_finish(session.session_id)
+
+
+def reopen_session(session: ExploreSession) -> None:
+    """Forget finish results when exploring continues, so the next /finish recomputes them."""
+    session.direction = None
+    session.matches = []
+    session.explanations = {}
+
+
+def match_explanation_data(match: dict) -> dict:
+    faculty = match["faculty"]
+    return {
+        "name": faculty["name"],
+        "affiliation": faculty["affiliation"],
+        "research_tags": faculty["research_tags"],
+        "top_paper_title": match["key_paper"],
+    }
+
+
+def explain_session_match(session: ExploreSession, faculty_id: int) -> Optional[str]:
+    """
+    Explanation for one of a finished session's matches, generated on first
+    request and cached on the session. None if the faculty is not a match.
+    When Claude fails, the generic fallback is returned but not cached, so a
+    later request tries again.
+    """
+    if faculty_id in session.explanations:
+        return session.explanations[faculty_id]
+
+    match = next((m for m in session.matches if m["faculty"]["id"] == faculty_id), None)
+    if match is None or session.direction is None:
+        return None
+
+    data = match_explanation_data(match)
+    explanation = _explain_faculty_match(get_llm_client(), direction_text(session.direction), data)
+    if explanation is None:
+        return _fallback_explanation(data)
+    cache_explanations(session.session_id, {faculty_id: explanation})
+    return explanation
+
+
+def cache_explanations(session_id: str, explanations: dict[int, str], attempts: int = 3) -> None:
+    """Store explanations on the session, re-reading it if another request saved first."""
+    for _ in range(attempts):
+        session = get_session(session_id)
+        if session is None:
+            return
+        session.explanations.update(explanations)
         try:
-            explanation_response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=FACULTY_EXPLANATION_MAX_TOKENS,
-                messages=[{"role": "user", "content": explanation_prompt}]
-            )
-            explanation = explanation_response.content[0].text.strip()
-        except (APIError, APIConnectionError, RateLimitError, APITimeoutError):
-            explanation = f"Research focus aligns with {', '.join(data['research_tags'][:3] if data['research_tags'] else ['your interests'])}."
-
-        matches.append({
-            "faculty": {
-                "id": faculty_id,
-                "name": data['name'],
-                "affiliation": data['affiliation'],
-                "h_index": data['h_index'],
-                "paper_count": data['paper_count'],
-                "semantic_scholar_id": data['semantic_scholar_id'],
-                "research_tags": data['research_tags'] or []
-            },
-            "similarity": float(data['similarity']),
-            "explanation": explanation,
-            "key_paper": data['top_paper_title']
-        })
-
-    return matches
+            save_session(session)
+            return
+        except SessionConflictError:
+            continue
+
+
+def _run_speculative_finish(session: ExploreSession) -> tuple[dict, list[dict]]:
+    with SessionLocal() as db:
+        return finish_exploration_results(db, session)
+
+
+def start_speculative_finish(session: ExploreSession) -> None:
+    """
+    Start computing /finish results in the background for the session as saved
+    now. The result is only used if the session is unchanged when /finish comes.
+    """
+    snapshot = ExploreSession.from_dict(session.to_dict(), version=session.version)
+    future = _finish_executor.submit(_run_speculative_finish, snapshot)
+
+    with _speculative_finishes_lock:
+        previous = _speculative_finishes.pop(session.session_id, None)
+        _speculative_finishes[session.session_id] = (session.version, future)
+        stale = [previous] if previous else []
+        while len(_speculative_finishes) > MAX_SPECULATIVE_FINISHES:
+            stale.append(_speculative_finishes.popitem(last=False)[1])
+
+    for _, stale_future in stale:
+        stale_future.cancel()
+
+
+def discard_speculative_finish(session_id: str) -> None:
+    with _speculative_finishes_lock:
+        entry = _speculative_finishes.pop(session_id, None)
+    if entry is not None:
+        entry[1].cancel()
+
+
+def take_speculative_finish(session: ExploreSession) -> Optional[tuple[dict, list[dict]]]:
+    """
+    Return background /finish results for this exact session version, waiting
+    for them if still running, or None when there are none or they failed.
+    """
+    with _speculative_finishes_lock:
+        entry = _speculative_finishes.pop(session.session_id, None)
+    if entry is None:
+        return None
+
+    version, future = entry
+    if version != session.version:
+        future.cancel()
+        return None
+
+    try:
+        return future.result(timeout=SPECULATIVE_FINISH_WAIT_SECONDS)
+    except Exception:
+        return None
 
 
 def generate_exploration_prompt(papers: list[Paper], round_num: int) -> str:
@@ -0,0 +1,121 @@
+"""LLM client provider. LLM_PROVIDER=local swaps Claude for an offline stand-in."""
+
+import asyncio
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from anthropic import Anthropic, AsyncAnthropic
+
+from app.services.request_log import stage
+
+LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "anthropic")
+LOCAL_LLM_LATENCY_MS = float(os.environ.get("LOCAL_LLM_LATENCY_MS", "0"))
+
+
+class _TimedMessages:
+    def __init__(self, messages):
+        self._messages = messages
+
+    def create(self, **kwargs):
+        with stage("llm"):
+            return self._messages.create(**kwargs)
+
+    @contextmanager
+    def stream(self, **kwargs):
+        with stage("llm"):
+            with self._messages.stream(**kwargs) as stream:
+                yield stream
+
+
+class _TimedClient:
+    """Wraps a client so every messages.create and messages.stream call is recorded as an "llm" stage."""
+
+    def __init__(self, client):
+        self._client = client
+        self.messages = _TimedMessages(client.messages)
+
+
+class _TimedAsyncMessages:
+    def __init__(self, messages):
+        self._messages = messages
+
+    async def create(self, **kwargs):
+        with stage("llm"):
+            return await self._messages.create(**kwargs)
+
+
+class _TimedAsyncClient:
+    """Async counterpart of _TimedClient."""
+
+    def __init__(self, client):
+        self._client = client
+        self.messages = _TimedAsyncMessages(client.messages)
+
+
+def _local_response(messages: list[dict]) -> SimpleNamespace:
+    prompt = messages[-1]["content"]
+    text = json.dumps({
+        "liked": [],
+        "disliked": [],
+        "curious": [],
+        "refined_query": " ".join(prompt.split()[-10:]),
+        "is_converged": False,
+        "convergence_reason": "local stand-in",
+        "title": "Research Direction",
+        "description": " ".join(prompt.split()[:40]),
+    })
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class _LocalMessages:
+    def create(self, model: str, max_tokens: int, messages: list[dict], **kwargs):
+        if LOCAL_LLM_LATENCY_MS:
+            time.sleep(LOCAL_LLM_LATENCY_MS / 1000)
+        return _local_response(messages)
+
+    @contextmanager
+    def stream(self, model: str, max_tokens: int, messages: list[dict], **kwargs):
+        text = self.create(model=model, max_tokens=max_tokens, messages=messages).content[0].text
+        yield SimpleNamespace(text_stream=iter(re.split(r"(?<= )", text)))
+
+
+class _LocalAsyncMessages:
+    async def create(self, model: str, max_tokens: int, messages: list[dict], **kwargs):
+        if LOCAL_LLM_LATENCY_MS:
+            await asyncio.sleep(LOCAL_LLM_LATENCY_MS / 1000)
+        return _local_response(messages)
+
+
+class LocalLLMClient:
+    """
+    Offline stand-in for the Anthropic client used during load tests and replay.
+    Returns a JSON document containing every key our prompts ask for, after an
+    optional artificial delay of LOCAL_LLM_LATENCY_MS.
+    """
+
+    def __init__(self):
+        self.messages = _LocalMessages()
+
+
+class LocalAsyncLLMClient:
+    """Async variant of LocalLLMClient; the artificial delay does not block the event loop."""
+
+    def __init__(self):
+        self.messages = _LocalAsyncMessages()
+
+
+def get_llm_client():
+    if LLM_PROVIDER == "local":
+        return _TimedClient(LocalLLMClient())
+    return _TimedClient(Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY")))
+
+
+def get_async_llm_client():
+    """Client whose messages.create is awaitable, for use from async endpoints."""
+    if LLM_PROVIDER == "local":
+        return _TimedAsyncClient(LocalAsyncLLMClient())
+    return _TimedAsyncClient(AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY")))
@@ -0,0 +1,82 @@
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.schemas import SearchResult
+
+FACULTY_NEIGHBOR_COUNT = 20
+NEIGHBOR_BATCH_SIZE = 1024
+
+
+def compute_nearest_neighbors(
+    embeddings: np.ndarray,
+    k: int = FACULTY_NEIGHBOR_COUNT,
+    batch_size: int = NEIGHBOR_BATCH_SIZE,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the top-k cosine neighbors of every row using batched matrix multiplication.
+    Returns (indices, similarities), both shaped (n, k) and sorted best first.
+    A row is never its own neighbor.
+    """
+    n = embeddings.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.maximum(norms, 1e-12)
+
+    indices = np.empty((n, k), dtype=np.int64)
+    similarities = np.empty((n, k), dtype=np.float32)
+
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        sims = matrix[start:stop] @ matrix.T
+        rows = np.arange(stop - start)
+        sims[rows, rows + start] = -np.inf
+
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+
+        indices[start:stop] = np.take_along_axis(top, order, axis=1)
+        similarities[start:stop] = np.take_along_axis(top_sims, order, axis=1)
+
+    return indices, similarities
+
+
+def get_similar_faculty(db: Session, faculty_id: int, limit: int = FACULTY_NEIGHBOR_COUNT) -> list[SearchResult]:
+    """
+    Read precomputed nearest faculty from the faculty_neighbors table.
+    Served with a single primary-key range scan; no embedding call is needed.
+    """
+    results = db.execute(
+        text("""
+            SELECT
+                f.id, f.name, f.affiliation, f.h_index, f.paper_count,
+                f.semantic_scholar_id, f.research_tags, fn.similarity
+            FROM faculty_neighbors fn
+            JOIN faculty f ON f.id = fn.neighbor_id
+            WHERE fn.faculty_id = :faculty_id
+            ORDER BY fn.rank
+            LIMIT :limit
+        """),
+        {"faculty_id": faculty_id, "limit": limit}
+    ).fetchall()
+
+    return [
+        SearchResult(
+            faculty={
+                "id": row.id,
+                "name": row.name,
+                "affiliation": row.affiliation,
+                "h_index": row.h_index,
+                "paper_count": row.paper_count,
+                "semantic_scholar_id": row.semantic_scholar_id,
+                "research_tags": row.research_tags or [],
+            },
+            similarity=float(row.similarity),
+        )
+        for row in results
+    ]
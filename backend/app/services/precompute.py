@@ -0,0 +1,104 @@
+"""Lookup and storage of search results precomputed for head queries."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import PrecomputedSearch
+from app.schemas import SearchRequest, SearchResult
+
+PRECOMPUTED_RESULT_LIMIT = 20
+RECENT_RESULTS_CACHE_SIZE = 1000
+
+_PUNCTUATION = ".,!?()[]{}\"'"
+
+
+def normalize_query(query: str) -> str:
+    words = (word.strip(_PUNCTUATION) for word in query.casefold().split())
+    return " ".join(word for word in words if word)
+
+
+def precompute_key(request: SearchRequest) -> str:
+    """
+    Key a request by its normalized query and every filter/option except limit,
+    so any result list of at least `limit` entries can serve it.
+    """
+    options = request.model_dump(exclude={"query", "limit"})
+    options["universities"] = sorted(options["universities"] or [])
+    payload = json.dumps(
+        {"query": normalize_query(request.query), **options},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_precomputed_results(db: Session, request: SearchRequest) -> Optional[list[SearchResult]]:
+    """Return precomputed results for an exact match with a single primary-key read."""
+    if request.limit > PRECOMPUTED_RESULT_LIMIT:
+        return None
+
+    row = db.get(PrecomputedSearch, precompute_key(request))
+    if row is None:
+        return None
+
+    return [SearchResult(**result) for result in row.results[:request.limit]]
+
+
+def store_precomputed_results(
+    db: Session,
+    request: SearchRequest,
+    results: list[SearchResult],
+    computed_at: Optional[datetime] = None,
+) -> None:
+    values = {
+        "cache_key": precompute_key(request),
+        "query": normalize_query(request.query),
+        "results": [result.model_dump() for result in results[:PRECOMPUTED_RESULT_LIMIT]],
+        "computed_at": computed_at or datetime.now(),
+    }
+    statement = insert(PrecomputedSearch).values(**values)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[PrecomputedSearch.cache_key],
+        set_={
+            "query": statement.excluded.query,
+            "results": statement.excluded.results,
+            "computed_at": statement.excluded.computed_at,
+        },
+    ))
+
+
+_recent_results: OrderedDict[str, list[SearchResult]] = OrderedDict()
+_recent_results_lock = threading.Lock()
+
+
+def remember_results(request: SearchRequest, results: list[SearchResult]) -> None:
+    """
+    Keep the latest live results per query so degraded mode can still serve them.
+    At most PRECOMPUTED_RESULT_LIMIT results are kept per query, the same cap as
+    precomputed rows, so the cache size stays bounded.
+    """
+    key = precompute_key(request)
+    results = results[:PRECOMPUTED_RESULT_LIMIT]
+    with _recent_results_lock:
+        current = _recent_results.get(key)
+        if current is None or len(results) >= len(current):
+            _recent_results[key] = results
+        _recent_results.move_to_end(key)
+        while len(_recent_results) > RECENT_RESULTS_CACHE_SIZE:
+            _recent_results.popitem(last=False)
+
+
+def get_recent_results(request: SearchRequest) -> Optional[list[SearchResult]]:
+    key = precompute_key(request)
+    with _recent_results_lock:
+        results = _recent_results.get(key)
+        if results is None or len(results) < request.limit:
+            return None
+        _recent_results.move_to_end(key)
+        return results[:request.limit]
@@ -1,50 +1,119 @@
 """Query expansion service for improving search recall."""
 
-ABBREVIATION_MAP = {
-    "ML": "machine learning",
-    "DL": "deep learning",
-    "AI": "artificial intelligence",
-    "RL": "reinforcement learning",
-    "NLP": "natural language processing",
-    "CV": "computer vision",
-    "GAN": "generative adversarial network",
-    "CNN": "convolutional neural network",
-    "RNN": "recurrent neural network",
-    "LLM": "large language model",
-    "AGI": "artificial general intelligence",
-
-    "PCA": "principal component analysis",
-    "SVM": "support vector machine",
-    "GMM": "gaussian mixture model",
-    "HMM": "hidden markov model",
-    "MCMC": "markov chain monte carlo",
-    "MLE": "maximum likelihood estimation",
-    "MAP": "maximum a posteriori",
-    "ODE": "ordinary differential equation",
-    "PDE": "partial differential equation",
-
-    "HPC": "high performance computing",
-    "IOT": "internet of things",
-    "OS": "operating systems",
-    "DB": "database",
-    "API": "application programming interface",
-    "P2P": "peer to peer",
-
-    "NMR": "nuclear magnetic resonance",
-    "fMRI": "functional magnetic resonance imaging",
-    "EEG": "electroencephalography",
-    "DNA": "deoxyribonucleic acid",
-    "RNA": "ribonucleic acid",
-    "CRISPR": "clustered regularly interspaced short palindromic repeats",
-
-    "PKI": "public key infrastructure",
-    "MPC": "multi-party computation",
-    "ZKP": "zero knowledge proof",
-}
+import os
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+DEFAULT_DICTIONARY_PATH = Path(__file__).resolve().parent.parent / "data" / "query_expansions.tsv"
+EXPANSION_CACHE_SIZE = 10_000
+
+_PUNCTUATION = ".,!?()[]{}"
+
+
+def _tokenize(value: str) -> list[str]:
+    tokens = (word.strip(_PUNCTUATION).casefold() for word in value.split())
+    return [token for token in tokens if token]
+
+
+def load_dictionary(path: str | Path) -> list[tuple[str, list[str]]]:
+    """
+    Load `<term or phrase><TAB><expansion>[|<expansion>...]` lines.
+    Blank lines and lines starting with '#' are ignored.
+    """
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                term, expansions = line.split("\t", 1)
+            except ValueError:
+                raise ValueError(f"{path}:{line_number}: expected '<term>\\t<expansion>'")
+            entries.append((term, [e.strip() for e in expansions.split("|") if e.strip()]))
+    return entries
+
+
+class QueryExpansionEngine:
+    """
+    Expands abbreviations, synonyms and multi-word phrases in a single pass.
+
+    Dictionary terms are compiled into an Aho-Corasick automaton over word tokens,
+    so every entry, including overlapping phrases, is found in one left-to-right
+    scan regardless of dictionary size. Expansions of repeated queries are memoized.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, list[str]]], cache_size: int = EXPANSION_CACHE_SIZE):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[frozenset[str]] = [frozenset()]
+        self.size = 0
+
+        outputs: list[set[str]] = [set()]
+        for term, expansions in entries:
+            tokens = _tokenize(term)
+            if not tokens or not expansions:
+                continue
+            node = 0
+            for token in tokens:
+                next_node = self._goto[node].get(token)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][token] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                node = next_node
+            outputs[node].update(expansions)
+            self.size += 1
+
+        self._build_failure_links(outputs)
+        self.expand = lru_cache(maxsize=cache_size)(self._expand)
+
+    def _build_failure_links(self, outputs: list[set[str]]) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                outputs[child] |= outputs[self._fail[child]]
+        self._output = [frozenset(o) for o in outputs]
+
+    @classmethod
+    def from_file(cls, path: str | Path, cache_size: int = EXPANSION_CACHE_SIZE) -> "QueryExpansionEngine":
+        return cls(load_dictionary(path), cache_size=cache_size)
+
+    def find_expansions(self, query: str) -> set[str]:
+        additions = set()
+        node = 0
+        for token in _tokenize(query):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            additions |= self._output[node]
+        return additions
+
+    def _expand(self, query: str) -> str:
+        additions = self.find_expansions(query)
+        if additions:
+            return f"{query} {' '.join(sorted(additions))}"
+        return query
+
+
+_engine = QueryExpansionEngine.from_file(
+    os.environ.get("QUERY_EXPANSION_DICTIONARY", DEFAULT_DICTIONARY_PATH)
+)
+
 
 def expand_query(query: str) -> str:
     """
-    Expand abbreviations in a query to improve search recall.
+    Expand abbreviations, synonyms and phrases in a query to improve search recall.
 
     Args:
         query: The original search query
@@ -52,16 +121,4 @@ def expand_query(query: str) -> str:
     Returns:
         Expanded query with abbreviations replaced/augmented
     """
-    expanded = query
-    words = query.upper().split()
-
-    additions = set()
-    for word in words:
-        clean_word = word.strip('.,!?()[]{}')
-        if clean_word in ABBREVIATION_MAP:
-            additions.add(ABBREVIATION_MAP[clean_word])
-
-    if additions:
-        expanded = f"{query} {' '.join(sorted(additions))}"
-
-    return expanded
+    return _engine.expand(query)
@@ -0,0 +1,158 @@
+"""
+Opt-in, anonymized request logging with per-stage timings.
+
+Set QUERY_LOG_PATH to append one JSON line per API request. Records keep the
+search inputs needed for replay (query, filters, limit) and stage timings, but
+never client addresses, raw session ids or uploaded file contents. Emails, URLs
+and long digit runs in free text are redacted. Stage timings are also returned
+in a Server-Timing header, whether or not logging is enabled.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Request
+
+QUERY_LOG_PATH = os.environ.get("QUERY_LOG_PATH")
+LOGGED_PATH_PREFIX = "/api/"
+
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_URL_PATTERN = re.compile(r"https?://\S+")
+_DIGITS_PATTERN = re.compile(r"\d[\d\s().-]{6,}\d")
+
+logger = logging.getLogger(__name__)
+
+_current_record: ContextVar[Optional[dict]] = ContextVar("current_request_record", default=None)
+_pending_lines: queue.SimpleQueue = queue.SimpleQueue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_STOP = object()
+
+
+def anonymize(value: str) -> str:
+    value = _EMAIL_PATTERN.sub("<email>", value)
+    value = _URL_PATTERN.sub("<url>", value)
+    return _DIGITS_PATTERN.sub("<number>", value)
+
+
+def session_token(session_id: str) -> str:
+    """Stable pseudonym linking the requests of one explore session."""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block and add it to the current request's stage totals."""
+    record = _current_record.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if record is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            record["stages"][name] = record["stages"].get(name, 0.0) + elapsed_ms
+
+
+def log_fields(**fields) -> None:
+    """Attach replayable request inputs to the current record. Strings are anonymized."""
+    record = _current_record.get()
+    if record is None:
+        return
+    for key, value in fields.items():
+        if isinstance(value, str):
+            value = anonymize(value)
+        elif isinstance(value, list):
+            value = [anonymize(v) if isinstance(v, str) else v for v in value]
+        record["fields"][key] = value
+
+
+def _write_pending_lines() -> None:
+    """Append queued lines to QUERY_LOG_PATH, opening the file once per burst."""
+    while True:
+        lines = [_pending_lines.get()]
+        while not _pending_lines.empty():
+            lines.append(_pending_lines.get())
+
+        stop = _STOP in lines
+        lines = [line for line in lines if line is not _STOP]
+        if lines:
+            try:
+                with open(QUERY_LOG_PATH, "a", encoding="utf-8") as f:
+                    f.write("".join(line + "\n" for line in lines))
+            except OSError:
+                logger.exception("Failed to write %d request log records", len(lines))
+        if stop:
+            return
+
+
+def flush_request_log(timeout: float = 5.0) -> None:
+    """Write everything queued so far and stop the writer; the next record starts a new one."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            return
+        _pending_lines.put(_STOP)
+        _writer.join(timeout=timeout)
+        _writer = None
+
+
+atexit.register(flush_request_log)
+
+
+def _write_record(record: dict) -> None:
+    """Queue a record for the background writer so the event loop never touches the file."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_pending_lines, name="request-log-writer", daemon=True)
+                _writer.start()
+    _pending_lines.put(json.dumps(record, separators=(",", ":")))
+
+
+def _server_timing(stages: dict, total_ms: float) -> str:
+    entries = [f"{name};dur={duration:.1f}" for name, duration in stages.items()]
+    entries.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(entries)
+
+
+async def request_log_middleware(request: Request, call_next):
+    if not request.url.path.startswith(LOGGED_PATH_PREFIX):
+        return await call_next(request)
+
+    record = {"stages": {}, "fields": {}}
+    token = _current_record.set(record)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current_record.reset(token)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    response.headers["Server-Timing"] = _server_timing(record["stages"], total_ms)
+
+    if QUERY_LOG_PATH:
+        route = request.scope.get("route")
+        _write_record({
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "method": request.method,
+            "endpoint": getattr(route, "path", request.url.path),
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "stages": {name: round(ms, 2) for name, ms in record["stages"].items()},
+            **record["fields"],
+        })
+
+    return response
@@ -1,14 +1,29 @@
+import math
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.models import Paper
 from app.schemas import SearchResult
+from app.services.bm25 import get_faculty_bm25_index
+from app.services.diversity import DEFAULT_MMR_LAMBDA, mmr_select
+from app.services.embeddings import EMBEDDING_DIMENSIONS
 
 RRF_K_CONSTANT = 60
 FULLTEXT_SEARCH_LIMIT = 50
 VECTOR_SEARCH_LIMIT = 50
 MAX_PAPERS_PER_FACULTY = 5
 
+PAPER_SEARCH_LIMIT = 200
+PAPER_AGGREGATION_TOP_N = 3
+PAPER_AGGREGATIONS = ("max", "top3_mean", "citation_weighted")
+
+LEXICAL_RETRIEVERS = ("fulltext", "bm25")
+
+MMR_POOL_MULTIPLIER = 3
+
 
 def _build_university_filter(universities: list[str]) -> str:
     """
@@ -33,7 +48,9 @@ def search_faculty_fulltext(
 ) -> list[tuple[int, float]]:
     """
     Search faculty using PostgreSQL full-text search.
-    Returns list of (faculty_id, ts_rank_score) tuples.
+    The query accepts web-search syntax (quoted phrases, OR, -exclusions) and is
+    ranked with cover density over the weighted search_vector.
+    Returns list of (faculty_id, ts_rank_cd_score) tuples.
     """
     where_clauses = ["h_index >= :min_h"]
     params = {
@@ -49,9 +66,9 @@ def search_faculty_fulltext(
 
     results = db.execute(
         text(f"""
-            SELECT id, ts_rank(search_vector, plainto_tsquery('english', :query)) as rank
+            SELECT id, ts_rank_cd(search_vector, websearch_to_tsquery('english', :query)) as rank
             FROM faculty
-            WHERE search_vector @@ plainto_tsquery('english', :query)
+            WHERE search_vector @@ websearch_to_tsquery('english', :query)
               AND {where_sql}
             ORDER BY rank DESC
             LIMIT :limit
@@ -62,6 +79,55 @@ def search_faculty_fulltext(
     return [(row.id, float(row.rank)) for row in results]
 
 
+def search_faculty_bm25(
+    db: Session,
+    query: str,
+    limit: int = 50,
+    min_h_index: int = 0,
+    universities: list[str] | None = None,
+) -> list[tuple[int, float]]:
+    """
+    Search faculty with the in-process BM25 index over tags and paper text.
+    Returns list of (faculty_id, bm25_score) tuples.
+    """
+    return get_faculty_bm25_index(db).search(
+        query,
+        limit=limit,
+        min_h_index=min_h_index,
+        universities=universities,
+    )
+
+
+def search_faculty_fulltext_only(
+    db: Session,
+    query: str,
+    limit: int = 10,
+    min_h_index: int = 0,
+    universities: list[str] | None = None,
+) -> list[SearchResult]:
+    """
+    Full-text-only search used when the embedding provider is unavailable.
+    Scores are ts_rank_cd values rather than similarities.
+    """
+    fulltext_results = search_faculty_fulltext(
+        db=db,
+        query=query,
+        limit=limit,
+        min_h_index=min_h_index,
+        universities=universities
+    )
+    if not fulltext_results:
+        return []
+
+    faculty_ids = [faculty_id for faculty_id, _ in fulltext_results]
+    scores = dict(fulltext_results)
+
+    faculty_map = _fetch_faculty_details(db, faculty_ids)
+    papers_by_faculty = _fetch_top_papers(db, faculty_ids)
+
+    return _build_search_results(faculty_ids, faculty_map, papers_by_faculty, scores)
+
+
 def search_faculty_by_embedding(
     db: Session,
     embedding: list[float],
@@ -145,26 +211,57 @@ def search_faculty_by_embedding(
     return search_results
 
 
-def search_faculty_hybrid(
+def _aggregate_paper_hits(hits: list, aggregation: str) -> float:
+    """
+    Collapse one faculty member's paper hits (sorted by similarity, best first)
+    into a single score.
+
+    - max: similarity of the best matching paper
+    - top3_mean: sum of the top 3 similarities divided by 3, so faculty with
+      several relevant papers beat faculty with a single lucky hit
+    - citation_weighted: similarity averaged with weights 1 + log(1 + citations)
+    """
+    if aggregation == "max":
+        return float(hits[0].similarity)
+
+    if aggregation == "top3_mean":
+        top = hits[:PAPER_AGGREGATION_TOP_N]
+        return sum(float(h.similarity) for h in top) / PAPER_AGGREGATION_TOP_N
+
+    if aggregation == "citation_weighted":
+        weights = [1.0 + math.log1p(h.citation_count or 0) for h in hits]
+        weighted = sum(w * float(h.similarity) for w, h in zip(weights, hits))
+        return weighted / sum(weights)
+
+    raise ValueError(f"Unknown paper aggregation: {aggregation}")
+
+
+def search_faculty_by_papers(
     db: Session,
-    query: str,
     embedding: list[float],
     limit: int = 10,
     min_h_index: int = 0,
     universities: list[str] | None = None,
-    k: int = RRF_K_CONSTANT
+    aggregation: str = "max",
+    paper_limit: int = PAPER_SEARCH_LIMIT,
 ) -> list[SearchResult]:
     """
-    Hybrid search combining BM25 full-text search with vector semantic search using RRF.
+    Search paper embeddings and rank faculty by their aggregated paper hits.
 
-    RRF (Reciprocal Rank Fusion) formula: score = sum(1 / (k + rank))
-    where k=60 is the standard constant for search result fusion.
+    A single query takes the top `paper_limit` papers from the papers HNSW index
+    and joins their authors; hits are then grouped by faculty in one pass.
+    The matching papers are returned as evidence for each faculty member.
+    Faculty filters are applied after the kNN step, so restrictive filters
+    leave fewer candidates.
     """
-    where_clauses = ["embedding IS NOT NULL", "h_index >= :min_h"]
+    if aggregation not in PAPER_AGGREGATIONS:
+        raise ValueError(f"Unknown paper aggregation: {aggregation}")
+
+    where_clauses = ["f.h_index >= :min_h"]
     params = {
         "embedding": str(embedding),
         "min_h": min_h_index,
-        "vector_limit": VECTOR_SEARCH_LIMIT
+        "paper_limit": paper_limit
     }
 
     if universities:
@@ -172,30 +269,103 @@ def search_faculty_hybrid(
 
     where_sql = " AND ".join(where_clauses)
 
-    vector_results = db.execute(
+    results = db.execute(
         text(f"""
+            WITH paper_hits AS (
+                SELECT id, faculty_id, title, year, venue, citation_count,
+                       1 - (embedding <=> :embedding) as similarity
+                FROM papers
+                WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> :embedding
+                LIMIT :paper_limit
+            )
             SELECT
-                id, name, affiliation, h_index, paper_count,
-                semantic_scholar_id, research_tags,
-                1 - (embedding <=> :embedding) as similarity
-            FROM faculty
+                ph.id as paper_id, ph.title, ph.year, ph.venue,
+                ph.citation_count, ph.similarity,
+                f.id, f.name, f.affiliation, f.h_index, f.paper_count,
+                f.semantic_scholar_id, f.research_tags
+            FROM paper_hits ph
+            JOIN faculty f ON f.id = ph.faculty_id
             WHERE {where_sql}
-            ORDER BY embedding <=> :embedding
-            LIMIT :vector_limit
+            ORDER BY ph.similarity DESC
         """),
         params
     ).fetchall()
 
-    fulltext_results = search_faculty_fulltext(
-        db=db,
-        query=query,
-        limit=FULLTEXT_SEARCH_LIMIT,
-        min_h_index=min_h_index,
-        universities=universities
-    )
+    if not results:
+        return []
+
+    hits_by_faculty = {}
+    for row in results:
+        if row.id not in hits_by_faculty:
+            hits_by_faculty[row.id] = []
+        hits_by_faculty[row.id].append(row)
+
+    scores = {
+        faculty_id: _aggregate_paper_hits(hits, aggregation)
+        for faculty_id, hits in hits_by_faculty.items()
+    }
 
-    vector_ranks = {row.id: rank + 1 for rank, row in enumerate(vector_results)}
-    fulltext_ranks = {faculty_id: rank + 1 for rank, (faculty_id, _) in enumerate(fulltext_results)}
+    top_faculty_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)[:limit]
+
+    search_results = []
+    for faculty_id in top_faculty_ids:
+        hits = hits_by_faculty[faculty_id]
+        row = hits[0]
+
+        search_results.append(SearchResult(
+            faculty={
+                "id": row.id,
+                "name": row.name,
+                "affiliation": row.affiliation,
+                "h_index": row.h_index,
+                "paper_count": row.paper_count,
+                "semantic_scholar_id": row.semantic_scholar_id,
+                "research_tags": row.research_tags or [],
+            },
+            similarity=scores[faculty_id],
+            papers=[{
+                "id": h.paper_id,
+                "title": h.title,
+                "year": h.year,
+                "venue": h.venue,
+                "citation_count": h.citation_count
+            } for h in hits[:MAX_PAPERS_PER_FACULTY]]
+        ))
+
+    return search_results
+
+
+def _mmr_rerank(
+    faculty_ids: list[int],
+    faculty_map: dict,
+    scores: dict[int, float],
+    limit: int,
+    mmr_lambda: float,
+) -> list[int]:
+    """
+    Re-rank a fused candidate pool with MMR. Relevance is the fused score scaled
+    to [0, 1]; candidates without an embedding are never penalized as redundant.
+    """
+    if not faculty_ids:
+        return []
+
+    relevance = np.array([scores[fid] for fid in faculty_ids], dtype=np.float32)
+    relevance /= relevance.max()
+
+    embeddings = np.zeros((len(faculty_ids), EMBEDDING_DIMENSIONS), dtype=np.float32)
+    for i, fid in enumerate(faculty_ids):
+        if faculty_map[fid].embedding is not None:
+            embeddings[i] = faculty_map[fid].embedding
+
+    selected = mmr_select(relevance, embeddings, k=limit, lambda_=mmr_lambda)
+    return [faculty_ids[i] for i in selected]
+
+
+def _fuse_rrf(vector_ids: list[int], fulltext_ids: list[int], k: int = RRF_K_CONSTANT) -> dict[int, float]:
+    """Fuse two ranked id lists with Reciprocal Rank Fusion."""
+    vector_ranks = {faculty_id: rank + 1 for rank, faculty_id in enumerate(vector_ids)}
+    fulltext_ranks = {faculty_id: rank + 1 for rank, faculty_id in enumerate(fulltext_ids)}
 
     all_faculty_ids = set(vector_ranks.keys()) | set(fulltext_ranks.keys())
 
@@ -208,27 +378,34 @@ def search_faculty_hybrid(
             score += 1.0 / (k + fulltext_ranks[faculty_id])
         rrf_scores[faculty_id] = score
 
-    top_faculty_ids = sorted(rrf_scores.keys(), key=lambda x: rrf_scores[x], reverse=True)[:limit]
+    return rrf_scores
 
-    if not top_faculty_ids:
-        return []
+
+def _fetch_faculty_details(db: Session, faculty_ids: list[int], with_embedding: bool = False) -> dict:
+    """Batch-fetch display fields (and optionally embeddings) keyed by faculty id."""
+    details_query = text(f"""
+        SELECT
+            id, name, affiliation, h_index, paper_count,
+            semantic_scholar_id, research_tags{", embedding" if with_embedding else ""}
+        FROM faculty
+        WHERE id = ANY(:faculty_ids)
+    """)
+    if with_embedding:
+        details_query = details_query.columns(embedding=Vector(EMBEDDING_DIMENSIONS))
 
     faculty_details = db.execute(
-        text("""
-            SELECT
-                id, name, affiliation, h_index, paper_count,
-                semantic_scholar_id, research_tags
-            FROM faculty
-            WHERE id = ANY(:faculty_ids)
-        """),
-        {"faculty_ids": top_faculty_ids}
+        details_query,
+        {"faculty_ids": faculty_ids}
     ).fetchall()
 
-    faculty_map = {row.id: row for row in faculty_details}
+    return {row.id: row for row in faculty_details}
 
+
+def _fetch_top_papers(db: Session, faculty_ids: list[int]) -> dict[int, list[Paper]]:
+    """Batch-fetch the most cited papers for each faculty id to avoid N+1 queries."""
     papers_query = (
         db.query(Paper)
-        .filter(Paper.faculty_id.in_(top_faculty_ids))
+        .filter(Paper.faculty_id.in_(faculty_ids))
         .order_by(Paper.citation_count.desc())
         .all()
     )
@@ -240,8 +417,17 @@ def search_faculty_hybrid(
         if len(papers_by_faculty[paper.faculty_id]) < MAX_PAPERS_PER_FACULTY:
             papers_by_faculty[paper.faculty_id].append(paper)
 
+    return papers_by_faculty
+
+
+def _build_search_results(
+    faculty_ids: list[int],
+    faculty_map: dict,
+    papers_by_faculty: dict[int, list[Paper]],
+    scores: dict[int, float],
+) -> list[SearchResult]:
     search_results = []
-    for faculty_id in top_faculty_ids:
+    for faculty_id in faculty_ids:
         if faculty_id not in faculty_map:
             continue
 
@@ -258,7 +444,7 @@ def search_faculty_hybrid(
                 "semantic_scholar_id": row.semantic_scholar_id,
                 "research_tags": row.research_tags or [],
             },
-            similarity=float(rrf_scores[faculty_id]),
+            similarity=float(scores[faculty_id]),
             papers=[{
                 "id": p.id,
                 "title": p.title,
@@ -269,3 +455,182 @@ def search_faculty_hybrid(
         ))
 
     return search_results
+
+
+def search_faculty_hybrid(
+    db: Session,
+    query: str,
+    embedding: list[float],
+    limit: int = 10,
+    min_h_index: int = 0,
+    universities: list[str] | None = None,
+    k: int = RRF_K_CONSTANT,
+    diversify: bool = False,
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+    lexical: str = "fulltext",
+) -> list[SearchResult]:
+    """
+    Hybrid search combining lexical search with vector semantic search using RRF.
+
+    The lexical retriever is either Postgres full-text search ("fulltext", ts_rank_cd over
+    the weighted faculty.search_vector) or the in-process BM25 index ("bm25") over tags and paper text.
+
+    RRF (Reciprocal Rank Fusion) formula: score = sum(1 / (k + rank))
+    where k=60 is the standard constant for search result fusion.
+
+    With diversify=True, the top `limit * MMR_POOL_MULTIPLIER` fused candidates are
+    re-ranked with Maximal Marginal Relevance. Their embeddings are read by the same
+    query that loads faculty details, so diversification adds no round trip.
+    """
+    where_clauses = ["embedding IS NOT NULL", "h_index >= :min_h"]
+    params = {
+        "embedding": str(embedding),
+        "min_h": min_h_index,
+        "vector_limit": VECTOR_SEARCH_LIMIT
+    }
+
+    if universities:
+        where_clauses.append(_build_university_filter(universities))
+
+    where_sql = " AND ".join(where_clauses)
+
+    vector_results = db.execute(
+        text(f"""
+            SELECT id
+            FROM faculty
+            WHERE {where_sql}
+            ORDER BY embedding <=> :embedding
+            LIMIT :vector_limit
+        """),
+        params
+    ).fetchall()
+
+    if lexical not in LEXICAL_RETRIEVERS:
+        raise ValueError(f"Unknown lexical retriever: {lexical}")
+
+    lexical_search = search_faculty_bm25 if lexical == "bm25" else search_faculty_fulltext
+    fulltext_results = lexical_search(
+        db=db,
+        query=query,
+        limit=FULLTEXT_SEARCH_LIMIT,
+        min_h_index=min_h_index,
+        universities=universities
+    )
+
+    rrf_scores = _fuse_rrf(
+        [row.id for row in vector_results],
+        [faculty_id for faculty_id, _ in fulltext_results],
+        k=k,
+    )
+
+    pool_size = limit * MMR_POOL_MULTIPLIER if diversify else limit
+    top_faculty_ids = sorted(rrf_scores.keys(), key=lambda x: rrf_scores[x], reverse=True)[:pool_size]
+
+    if not top_faculty_ids:
+        return []
+
+    faculty_map = _fetch_faculty_details(db, top_faculty_ids, with_embedding=diversify)
+
+    if diversify:
+        top_faculty_ids = [fid for fid in top_faculty_ids if fid in faculty_map]
+        top_faculty_ids = _mmr_rerank(top_faculty_ids, faculty_map, rrf_scores, limit, mmr_lambda)
+
+    papers_by_faculty = _fetch_top_papers(db, top_faculty_ids)
+
+    return _build_search_results(top_faculty_ids, faculty_map, papers_by_faculty, rrf_scores)
+
+
+def search_faculty_hybrid_batch(
+    db: Session,
+    queries: list[str],
+    embeddings: list[list[float]],
+    limit: int = 10,
+    min_h_index: int = 0,
+    universities: list[str] | None = None,
+    k: int = RRF_K_CONSTANT,
+) -> list[list[SearchResult]]:
+    """
+    Run hybrid search for many queries at once.
+
+    Vector and full-text retrieval for all queries each run as a single statement
+    (unnest of the inputs + LATERAL top-k), then faculty details and papers are
+    fetched once for the union of results. Returns one result list per query.
+    """
+    where_clauses = ["embedding IS NOT NULL", "h_index >= :min_h"]
+    params = {
+        "embeddings": [str(e) for e in embeddings],
+        "queries": queries,
+        "min_h": min_h_index,
+        "vector_limit": VECTOR_SEARCH_LIMIT,
+        "fulltext_limit": FULLTEXT_SEARCH_LIMIT
+    }
+
+    if universities:
+        where_clauses.append(_build_university_filter(universities))
+
+    where_sql = " AND ".join(where_clauses)
+
+    vector_results = db.execute(
+        text(f"""
+            SELECT q.query_index, f.id
+            FROM (
+                SELECT CAST(e AS vector({EMBEDDING_DIMENSIONS})) as query_embedding, i as query_index
+                FROM unnest(CAST(:embeddings AS text[])) WITH ORDINALITY AS t(e, i)
+            ) q
+            CROSS JOIN LATERAL (
+                SELECT id, embedding <=> q.query_embedding as distance
+                FROM faculty
+                WHERE {where_sql}
+                ORDER BY embedding <=> q.query_embedding
+                LIMIT :vector_limit
+            ) f
+            ORDER BY q.query_index, f.distance
+        """),
+        params
+    ).fetchall()
+
+    fulltext_where_sql = " AND ".join(where_clauses[1:])
+
+    fulltext_results = db.execute(
+        text(f"""
+            SELECT q.query_index, f.id
+            FROM unnest(CAST(:queries AS text[])) WITH ORDINALITY AS q(query_text, query_index)
+            CROSS JOIN LATERAL (
+                SELECT id, ts_rank_cd(search_vector, websearch_to_tsquery('english', q.query_text)) as rank
+                FROM faculty
+                WHERE search_vector @@ websearch_to_tsquery('english', q.query_text)
+                  AND {fulltext_where_sql}
+                ORDER BY rank DESC
+                LIMIT :fulltext_limit
+            ) f
+            ORDER BY q.query_index, f.rank DESC
+        """),
+        params
+    ).fetchall()
+
+    vector_ids = [[] for _ in queries]
+    for row in vector_results:
+        vector_ids[row.query_index - 1].append(row.id)
+
+    fulltext_ids = [[] for _ in queries]
+    for row in fulltext_results:
+        fulltext_ids[row.query_index - 1].append(row.id)
+
+    scores_per_query = []
+    ids_per_query = []
+    for query_vector_ids, query_fulltext_ids in zip(vector_ids, fulltext_ids):
+        rrf_scores = _fuse_rrf(query_vector_ids, query_fulltext_ids, k=k)
+        scores_per_query.append(rrf_scores)
+        ids_per_query.append(sorted(rrf_scores.keys(), key=lambda x: rrf_scores[x], reverse=True)[:limit])
+
+    all_faculty_ids = list({fid for ids in ids_per_query for fid in ids})
+    if not all_faculty_ids:
+        return [[] for _ in queries]
+
+    faculty_map = _fetch_faculty_details(db, all_faculty_ids)
+    papers_by_faculty = _fetch_top_papers(db, all_faculty_ids)
+
+    return [
+        _build_search_results(ids, faculty_map, papers_by_faculty, scores)
+        for ids, scores in zip(ids_per_query, scores_per_query)
+    ]
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import closing
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+
+# memory (single process), sqlite (workers sharing one host) or postgres (any number of hosts).
+EXPLORE_SESSION_BACKEND = os.environ.get("EXPLORE_SESSION_BACKEND", "memory")
+EXPLORE_SESSION_SQLITE_PATH = os.environ.get("EXPLORE_SESSION_SQLITE_PATH", "explore_sessions.db")
+EXPLORE_SESSION_CAPACITY = int(os.environ.get("EXPLORE_SESSION_CAPACITY", "10000"))
+
+
+class SessionConflictError(Exception):
+    """Raised when a session was modified by another request since it was read."""
+
+
+class SessionStore(ABC):
+    """
+    Stores explore session state as JSON-serializable dicts.
+
+    Every record carries a version number. `save` only succeeds when the caller's
+    version matches the stored one (optimistic concurrency) and returns the new
+    version; otherwise it raises SessionConflictError. Expired records are never
+    returned and are removed lazily or by `purge_expired`.
+    """
+
+    @abstractmethod
+    def create(self, session_id: str, state: dict, expires_at: datetime) -> int:
+        ...
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[tuple[dict, int]]:
+        ...
+
+    @abstractmethod
+    def save(self, session_id: str, state: dict, version: int, expires_at: datetime) -> int:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Session count and approximate bytes of serialized state."""
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Keeps serialized sessions in an LRU-ordered dict. Once `capacity` is reached
+    the least recently used session is evicted, so abandoned sessions cannot
+    grow the worker without bound even between sweeps.
+    """
+
+    def __init__(self, capacity: int = EXPLORE_SESSION_CAPACITY):
+        self.capacity = capacity
+        self._records: OrderedDict[str, tuple[str, int, datetime]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _put(self, session_id: str, state: dict, version: int, expires_at: datetime) -> None:
+        self._pop(session_id)
+        serialized = json.dumps(state, separators=(",", ":"))
+        self._records[session_id] = (serialized, version, expires_at)
+        self._bytes += len(serialized)
+        while len(self._records) > self.capacity:
+            self._pop(next(iter(self._records)))
+
+    def _pop(self, session_id: str) -> None:
+        record = self._records.pop(session_id, None)
+        if record is not None:
+            self._bytes -= len(record[0])
+
+    def create(self, session_id: str, state: dict, expires_at: datetime) -> int:
+        with self._lock:
+            self._put(session_id, state, 0, expires_at)
+        return 0
+
+    def get(self, session_id: str) -> Optional[tuple[dict, int]]:
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None:
+                return None
+            state, version, expires_at = record
+            if expires_at <= datetime.now():
+                self._pop(session_id)
+                return None
+            self._records.move_to_end(session_id)
+        return json.loads(state), version
+
+    def save(self, session_id: str, state: dict, version: int, expires_at: datetime) -> int:
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None or record[1] != version:
+                raise SessionConflictError(f"Session {session_id} was modified concurrently")
+            self._put(session_id, state, version + 1, expires_at)
+        return version + 1
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._pop(session_id)
+
+    def purge_expired(self) -> int:
+        now = datetime.now()
+        with self._lock:
+            expired = [sid for sid, (_, _, expires_at) in self._records.items() if expires_at <= now]
+            for session_id in expired:
+                self._pop(session_id)
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self._records), "approx_bytes": self._bytes}
+
+
+class SqliteSessionStore(SessionStore):
+    """Shares sessions between worker processes on one host through a SQLite file."""
+
+    def __init__(self, path: str = EXPLORE_SESSION_SQLITE_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS explore_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_explore_sessions_expires_at ON explore_sessions (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def create(self, session_id: str, state: dict, expires_at: datetime) -> int:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO explore_sessions (session_id, state, version, expires_at) VALUES (?, ?, 0, ?)",
+                (session_id, json.dumps(state), expires_at.timestamp())
+            )
+        return 0
+
+    def get(self, session_id: str) -> Optional[tuple[dict, int]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT state, version FROM explore_sessions WHERE session_id = ? AND expires_at > ?",
+                (session_id, datetime.now().timestamp())
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def save(self, session_id: str, state: dict, version: int, expires_at: datetime) -> int:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE explore_sessions
+                SET state = ?, version = version + 1, expires_at = ?
+                WHERE session_id = ? AND version = ?
+                """,
+                (json.dumps(state), expires_at.timestamp(), session_id, version)
+            )
+        if cursor.rowcount != 1:
+            raise SessionConflictError(f"Session {session_id} was modified concurrently")
+        return version + 1
+
+    def delete(self, session_id: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM explore_sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self) -> int:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "DELETE FROM explore_sessions WHERE expires_at <= ?",
+                (datetime.now().timestamp(),)
+            )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        with closing(self._connect()) as conn:
+            count, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(state)), 0) FROM explore_sessions"
+            ).fetchone()
+        return {"sessions": count, "approx_bytes": size}
+
+
+class PostgresSessionStore(SessionStore):
+    """Shares sessions across hosts through the explore_sessions table (JSONB state)."""
+
+    def create(self, session_id: str, state: dict, expires_at: datetime) -> int:
+        with SessionLocal() as db:
+            db.execute(
+                text("""
+                    INSERT INTO explore_sessions (session_id, state, version, expires_at)
+                    VALUES (:session_id, CAST(:state AS jsonb), 0, :expires_at)
+                """),
+                {"session_id": session_id, "state": json.dumps(state), "expires_at": expires_at}
+            )
+            db.commit()
+        return 0
+
+    def get(self, session_id: str) -> Optional[tuple[dict, int]]:
+        with SessionLocal() as db:
+            row = db.execute(
+                text("""
+                    SELECT state, version FROM explore_sessions
+                    WHERE session_id = :session_id AND expires_at > :now
+                """),
+                {"session_id": session_id, "now": datetime.now()}
+            ).fetchone()
+        if row is None:
+            return None
+        return row.state, row.version
+
+    def save(self, session_id: str, state: dict, version: int, expires_at: datetime) -> int:
+        with SessionLocal() as db:
+            result = db.execute(
+                text("""
+                    UPDATE explore_sessions
+                    SET state = CAST(:state AS jsonb), version = version + 1, expires_at = :expires_at
+                    WHERE session_id = :session_id AND version = :version
+                """),
+                {
+                    "session_id": session_id,
+                    "state": json.dumps(state),
+                    "version": version,
+                    "expires_at": expires_at,
+                }
+            )
+            db.commit()
+        if result.rowcount != 1:
+            raise SessionConflictError(f"Session {session_id} was modified concurrently")
+        return version + 1
+
+    def delete(self, session_id: str) -> None:
+        with SessionLocal() as db:
+            db.execute(text("DELETE FROM explore_sessions WHERE session_id = :session_id"), {"session_id": session_id})
+            db.commit()
+
+    def purge_expired(self) -> int:
+        with SessionLocal() as db:
+            result = db.execute(
+                text("DELETE FROM explore_sessions WHERE expires_at <= :now"),
+                {"now": datetime.now()}
+            )
+            db.commit()
+        return result.rowcount
+
+    def stats(self) -> dict:
+        with SessionLocal() as db:
+            row = db.execute(
+                text("SELECT COUNT(*) AS sessions, COALESCE(SUM(pg_column_size(state)), 0) AS size FROM explore_sessions")
+            ).fetchone()
+        return {"sessions": row.sessions, "approx_bytes": int(row.size)}
+
+
+def create_session_store(backend: str = EXPLORE_SESSION_BACKEND) -> SessionStore:
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SqliteSessionStore()
+    if backend == "postgres":
+        return PostgresSessionStore()
+    raise ValueError(f"Unknown explore session backend: {backend}")
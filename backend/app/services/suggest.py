@@ -0,0 +1,159 @@
+"""In-memory type-ahead index over research tags and faculty names."""
+
+import logging
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+SUGGESTION_INDEX_TTL = timedelta(minutes=15)
+SUGGESTION_CACHE_SIZE = 4096
+MAX_PREFIX_MATCHES = 500
+DEFAULT_SUGGESTION_LIMIT = 8
+
+_KIND_ORDER = {"tag": 0, "faculty": 1}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SuggestionEntry:
+    text: str
+    kind: str
+    weight: int
+    faculty_id: Optional[int] = None
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+class SuggestionIndex:
+    """
+    Sorted-key prefix index. Every entry is keyed by its full text and by each
+    word suffix, so "lear" finds both "Learning Theory" and "Machine Learning".
+    Lookups are a binary search plus a short scan, memoized per prefix.
+    """
+
+    def __init__(self, entries: list[SuggestionEntry]):
+        self.entries = entries
+        keys = []
+        for entry_idx, entry in enumerate(entries):
+            words = _normalize(entry.text).split(" ")
+            for word_idx in range(len(words)):
+                keys.append((" ".join(words[word_idx:]), word_idx, entry_idx))
+        keys.sort()
+        self._keys = [key for key, _, _ in keys]
+        self._matches = [(word_idx, entry_idx) for _, word_idx, entry_idx in keys]
+        self.lookup = lru_cache(maxsize=SUGGESTION_CACHE_SIZE)(self._lookup)
+
+    def _lookup(self, prefix: str, limit: int) -> tuple[SuggestionEntry, ...]:
+        prefix = _normalize(prefix)
+        if not prefix:
+            return ()
+
+        best_match = {}
+        position = bisect_left(self._keys, prefix)
+        scanned = 0
+        while (
+            position < len(self._keys)
+            and scanned < MAX_PREFIX_MATCHES
+            and self._keys[position].startswith(prefix)
+        ):
+            word_idx, entry_idx = self._matches[position]
+            match_rank = 0 if word_idx == 0 else 1
+            best_match[entry_idx] = min(best_match.get(entry_idx, match_rank), match_rank)
+            position += 1
+            scanned += 1
+
+        ranked = sorted(
+            best_match.items(),
+            key=lambda item: (
+                item[1],
+                _KIND_ORDER[self.entries[item[0]].kind],
+                -self.entries[item[0]].weight,
+                self.entries[item[0]].text,
+            ),
+        )
+        return tuple(self.entries[entry_idx] for entry_idx, _ in ranked[:limit])
+
+
+def build_suggestion_index(db: Session) -> SuggestionIndex:
+    tag_rows = db.execute(
+        text("""
+            SELECT tag, COUNT(*) as faculty_count
+            FROM faculty, unnest(research_tags) as tag
+            WHERE tag <> ''
+            GROUP BY tag
+        """)
+    ).fetchall()
+
+    tag_counts = {}
+    tag_display = {}
+    for row in tag_rows:
+        key = _normalize(row.tag)
+        tag_counts[key] = tag_counts.get(key, 0) + row.faculty_count
+        if row.faculty_count > tag_display.get(key, (0, ""))[0]:
+            tag_display[key] = (row.faculty_count, row.tag)
+
+    faculty_rows = db.execute(
+        text("SELECT id, name, h_index FROM faculty WHERE name IS NOT NULL")
+    ).fetchall()
+
+    entries = [
+        SuggestionEntry(text=tag_display[key][1], kind="tag", weight=count)
+        for key, count in tag_counts.items()
+    ] + [
+        SuggestionEntry(text=row.name, kind="faculty", weight=row.h_index or 0, faculty_id=row.id)
+        for row in faculty_rows
+    ]
+    return SuggestionIndex(entries)
+
+
+_index: Optional[SuggestionIndex] = None
+_index_built_at: Optional[datetime] = None
+_index_lock = threading.Lock()
+_rebuild_thread: Optional[threading.Thread] = None
+
+
+def _rebuild_index() -> None:
+    global _index, _index_built_at
+    try:
+        with SessionLocal() as db:
+            index = build_suggestion_index(db)
+    except Exception:
+        logger.exception("Failed to rebuild the suggestion index")
+        return
+    with _index_lock:
+        _index = index
+        _index_built_at = datetime.now()
+
+
+def get_suggestion_index(db: Session) -> SuggestionIndex:
+    """
+    Return the shared index. Only the very first call builds it on the request
+    path; once it is older than SUGGESTION_INDEX_TTL a background thread
+    rebuilds it and swaps it in, while lookups keep using the previous index.
+    """
+    global _index, _index_built_at, _rebuild_thread
+    with _index_lock:
+        if _index is None:
+            _index = build_suggestion_index(db)
+            _index_built_at = datetime.now()
+        elif datetime.now() - _index_built_at > SUGGESTION_INDEX_TTL and (
+            _rebuild_thread is None or not _rebuild_thread.is_alive()
+        ):
+            _rebuild_thread = threading.Thread(target=_rebuild_index, name="suggestion-index-rebuild", daemon=True)
+            _rebuild_thread.start()
+        return _index
+
+
+def suggest(db: Session, prefix: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> list[SuggestionEntry]:
+    return list(get_suggestion_index(db).lookup(prefix, limit))
@@ -1,5 +1,4 @@
-import os
-from anthropic import Anthropic
+from app.services.llm import get_llm_client
 
 
 def extract_research_tags(papers: list) -> list[str]:
@@ -7,7 +6,7 @@ def extract_research_tags(papers: list) -> list[str]:
         return []
 
     try:
-        client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        client = get_llm_client()
 
         paper_summaries = []
         for paper in papers[:10]:
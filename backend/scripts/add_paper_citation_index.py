@@ -0,0 +1,39 @@
+"""
+Add a (faculty_id, citation_count DESC) index on papers so per-faculty key paper
+lookups are index scans instead of a window over the whole papers table.
+Run this once on your production database.
+
+Usage:
+    python scripts/add_paper_citation_index.py
+"""
+import os
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+if not DATABASE_URL:
+    print("ERROR: DATABASE_URL not set")
+    exit(1)
+
+# Fix for Railway/Heroku: postgres:// -> postgresql://
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+engine = create_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+
+with engine.connect() as conn:
+    print("Creating index on papers (faculty_id, citation_count DESC NULLS LAST)...")
+    conn.execute(text("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_papers_faculty_citations
+        ON papers (faculty_id, citation_count DESC NULLS LAST);
+    """))
+    print("✓ Paper citation index created")
+
+    print("Analyzing papers...")
+    conn.execute(text("ANALYZE papers;"))
+    print("✓ Table analyzed")
+
+    print("\n✅ Done! Key paper lookups will now use idx_papers_faculty_citations.")
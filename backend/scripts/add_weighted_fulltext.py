@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Migration script to replace the trigger-maintained faculty.search_vector with a
+weighted, paper-aware generated column.
+
+    A: name and research tags
+    B: titles of the most cited papers
+    C: abstract excerpts of the most cited papers
+
+Paper text is denormalized into faculty.paper_titles_text / paper_abstracts_text by
+statement-level triggers on papers that only act when a title, abstract, citation
+count or owner actually changes. search_vector is a STORED generated column over
+those columns, so embedding-only and other unrelated updates never rebuild it.
+
+Run scripts/benchmark_fulltext.py before and after this migration to compare.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+PAPER_TITLES_LIMIT = 50
+PAPER_ABSTRACTS_LIMIT = 5
+ABSTRACT_EXCERPT_CHARS = 300
+
+
+def add_weighted_fulltext():
+    """
+    1. Add denormalized paper text columns
+    2. Create the refresh function and paper triggers that maintain them
+    3. Drop the old row trigger and recreate search_vector as a generated column
+    4. Backfill paper text and recreate the GIN index
+    """
+    with engine.connect() as conn:
+        print("Adding paper text columns...")
+        conn.execute(text("""
+            ALTER TABLE faculty
+            ADD COLUMN IF NOT EXISTS paper_titles_text TEXT,
+            ADD COLUMN IF NOT EXISTS paper_abstracts_text TEXT
+        """))
+        print("✓ Added paper_titles_text and paper_abstracts_text")
+
+        print("Creating refresh function...")
+        conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION refresh_faculty_paper_text(target_ids integer[])
+            RETURNS void AS $$
+                UPDATE faculty f
+                SET paper_titles_text = src.titles,
+                    paper_abstracts_text = src.abstracts
+                FROM (
+                    SELECT
+                        fid as faculty_id,
+                        (
+                            SELECT string_agg(t.title, ' ')
+                            FROM (
+                                SELECT title FROM papers
+                                WHERE faculty_id = fid
+                                ORDER BY citation_count DESC NULLS LAST
+                                LIMIT {PAPER_TITLES_LIMIT}
+                            ) t
+                        ) as titles,
+                        (
+                            SELECT string_agg(left(a.abstract, {ABSTRACT_EXCERPT_CHARS}), ' ')
+                            FROM (
+                                SELECT abstract FROM papers
+                                WHERE faculty_id = fid AND abstract IS NOT NULL AND abstract <> ''
+                                ORDER BY citation_count DESC NULLS LAST
+                                LIMIT {PAPER_ABSTRACTS_LIMIT}
+                            ) a
+                        ) as abstracts
+                    FROM unnest(target_ids) as fid
+                ) src
+                WHERE f.id = src.faculty_id
+                  AND (f.paper_titles_text, f.paper_abstracts_text)
+                      IS DISTINCT FROM (src.titles, src.abstracts)
+            $$ LANGUAGE sql
+        """))
+        print("✓ Created refresh_faculty_paper_text()")
+
+        print("Creating paper trigger function...")
+        conn.execute(text("""
+            CREATE OR REPLACE FUNCTION papers_refresh_faculty_text()
+            RETURNS trigger AS $$
+            DECLARE
+                changed integer[];
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    SELECT array_agg(DISTINCT faculty_id) INTO changed
+                    FROM new_rows WHERE faculty_id IS NOT NULL;
+                ELSIF TG_OP = 'DELETE' THEN
+                    SELECT array_agg(DISTINCT faculty_id) INTO changed
+                    FROM old_rows WHERE faculty_id IS NOT NULL;
+                ELSE
+                    SELECT array_agg(DISTINCT fid) INTO changed
+                    FROM (
+                        SELECT n.faculty_id as new_fid, o.faculty_id as old_fid
+                        FROM new_rows n
+                        JOIN old_rows o ON o.id = n.id
+                        WHERE (n.title, n.abstract, n.citation_count, n.faculty_id)
+                              IS DISTINCT FROM (o.title, o.abstract, o.citation_count, o.faculty_id)
+                    ) c,
+                    LATERAL unnest(ARRAY[c.new_fid, c.old_fid]) as fid
+                    WHERE fid IS NOT NULL;
+                END IF;
+
+                IF changed IS NOT NULL THEN
+                    PERFORM refresh_faculty_paper_text(changed);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """))
+        print("✓ Created papers_refresh_faculty_text()")
+
+        print("Creating paper triggers...")
+        for op, referencing in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        ):
+            trigger_name = f"papers_faculty_text_{op.lower()}_trigger"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger_name} ON papers"))
+            conn.execute(text(f"""
+                CREATE TRIGGER {trigger_name}
+                AFTER {op} ON papers
+                REFERENCING {referencing}
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION papers_refresh_faculty_text()
+            """))
+        print("✓ Created statement-level paper triggers")
+
+        print("Dropping old row trigger...")
+        conn.execute(text("DROP TRIGGER IF EXISTS faculty_search_vector_trigger ON faculty"))
+        conn.execute(text("DROP FUNCTION IF EXISTS faculty_search_vector_update()"))
+        print("✓ Dropped faculty_search_vector_trigger")
+
+        print("Creating immutable tag helper...")
+        conn.execute(text("""
+            CREATE OR REPLACE FUNCTION faculty_tags_text(tags text[])
+            RETURNS text AS $$
+                SELECT COALESCE(array_to_string(tags, ' '), '')
+            $$ LANGUAGE sql IMMUTABLE
+        """))
+        print("✓ Created faculty_tags_text()")
+
+        print("Recreating search_vector as a generated column...")
+        conn.execute(text("DROP INDEX IF EXISTS faculty_search_vector_idx"))
+        conn.execute(text("ALTER TABLE faculty DROP COLUMN IF EXISTS search_vector"))
+        conn.execute(text("""
+            ALTER TABLE faculty
+            ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english'::regconfig,
+                    COALESCE(name, '') || ' ' || faculty_tags_text(research_tags)), 'A') ||
+                setweight(to_tsvector('english'::regconfig,
+                    COALESCE(paper_titles_text, '')), 'B') ||
+                setweight(to_tsvector('english'::regconfig,
+                    COALESCE(paper_abstracts_text, '')), 'C')
+            ) STORED
+        """))
+        print("✓ Added generated search_vector column")
+
+        print("Backfilling paper text...")
+        conn.execute(text("""
+            SELECT refresh_faculty_paper_text(array_agg(id)) FROM faculty
+        """))
+        print("✓ Backfilled paper text")
+
+        print("Creating GIN index...")
+        conn.execute(text("""
+            CREATE INDEX faculty_search_vector_idx
+            ON faculty USING GIN(search_vector)
+        """))
+        print("✓ Created GIN index")
+
+        conn.commit()
+
+
+if __name__ == "__main__":
+    try:
+        add_weighted_fulltext()
+        print("\n✓ Migration completed successfully!")
+    except Exception as e:
+        print(f"\n✗ Migration failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk-update throughput on faculty and full-text search latency.
+
+Run once before and once after scripts/add_weighted_fulltext.py, e.g.
+    python scripts/benchmark_fulltext.py --label before --output before.json
+    python scripts/add_weighted_fulltext.py
+    python scripts/benchmark_fulltext.py --label after --output after.json
+
+All updates run inside a transaction that is rolled back, so no data changes.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+from sqlalchemy import text
+from app.database import SessionLocal
+from app.services.search import search_faculty_fulltext
+
+DEFAULT_QUERIES = [
+    "machine learning",
+    "reinforcement learning robotics",
+    "natural language processing",
+    "computer vision segmentation",
+    "protein structure prediction",
+    "distributed systems consensus",
+    "causal inference",
+    "graph neural networks",
+    "cryptography zero knowledge",
+    "climate modeling",
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def benchmark_updates(db, rows: int) -> dict:
+    """Time per-row UPDATEs shaped like embed_faculty.py and populate_tags.py."""
+    faculty_ids = [
+        row.id for row in db.execute(
+            text("SELECT id FROM faculty ORDER BY id LIMIT :rows"), {"rows": rows}
+        ).fetchall()
+    ]
+
+    results = {}
+    for label, statement in (
+        ("embedding_update", "UPDATE faculty SET embedding = embedding WHERE id = :id"),
+        ("tag_update", "UPDATE faculty SET research_tags = research_tags WHERE id = :id"),
+    ):
+        start = time.perf_counter()
+        for faculty_id in faculty_ids:
+            db.execute(text(statement), {"id": faculty_id})
+        elapsed = time.perf_counter() - start
+        db.rollback()
+        results[label] = {
+            "rows": len(faculty_ids),
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(len(faculty_ids) / elapsed, 1) if elapsed else None,
+        }
+    return results
+
+
+def benchmark_search(db, queries: list[str], repeats: int) -> dict:
+    timings_ms = []
+    for _ in range(repeats):
+        for query in queries:
+            start = time.perf_counter()
+            search_faculty_fulltext(db, query, limit=50)
+            timings_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "queries": len(timings_ms),
+        "p50_ms": round(statistics.median(timings_ms), 2),
+        "p95_ms": round(_percentile(timings_ms, 95), 2),
+        "p99_ms": round(_percentile(timings_ms, 99), 2),
+    }
+
+
+def run_benchmark(label: str, rows: int, repeats: int) -> dict:
+    db = SessionLocal()
+    try:
+        return {
+            "label": label,
+            "updates": benchmark_updates(db, rows),
+            "fulltext_search": benchmark_search(db, DEFAULT_QUERIES, repeats),
+        }
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark faculty updates and full-text search")
+    parser.add_argument("--label", default="run", help="Label stored with the results")
+    parser.add_argument("--rows", type=int, default=1000, help="Faculty rows to update")
+    parser.add_argument("--repeats", type=int, default=20, help="Passes over the query set")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.label, args.rows, args.repeats)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
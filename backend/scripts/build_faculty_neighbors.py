@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Precompute the nearest faculty for every faculty member from faculty.embedding.
+Results are written to faculty_neighbors and served by GET /api/faculty/{id}/similar.
+
+Usage:
+    python scripts/build_faculty_neighbors.py [--k 20] [--batch-size 1024]
+"""
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models import Faculty, FacultyNeighbor
+from app.services.neighbors import FACULTY_NEIGHBOR_COUNT, NEIGHBOR_BATCH_SIZE, compute_nearest_neighbors
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def build_faculty_neighbors(k: int = FACULTY_NEIGHBOR_COUNT, batch_size: int = NEIGHBOR_BATCH_SIZE):
+    FacultyNeighbor.__table__.create(bind=engine, checkfirst=True)
+
+    db: Session = SessionLocal()
+
+    try:
+        rows = db.query(Faculty.id, Faculty.embedding).filter(
+            Faculty.embedding.isnot(None)
+        ).order_by(Faculty.id).all()
+
+        print(f"Found {len(rows)} faculty with embeddings")
+
+        if len(rows) < 2:
+            print("Not enough faculty to build neighbors. Nothing to do.")
+            return
+
+        start_time = time.time()
+        faculty_ids = np.array([row.id for row in rows])
+        embeddings = np.vstack([np.asarray(row.embedding, dtype=np.float32) for row in rows])
+
+        indices, similarities = compute_nearest_neighbors(embeddings, k=k, batch_size=batch_size)
+        print(f"Computed neighbors in {time.time() - start_time:.1f}s")
+
+        neighbor_rows = [
+            {
+                "faculty_id": int(faculty_ids[i]),
+                "rank": rank,
+                "neighbor_id": int(faculty_ids[indices[i, rank]]),
+                "similarity": float(similarities[i, rank]),
+            }
+            for i in range(len(faculty_ids))
+            for rank in range(indices.shape[1])
+        ]
+
+        db.execute(delete(FacultyNeighbor))
+        for chunk_start in range(0, len(neighbor_rows), INSERT_CHUNK_SIZE):
+            db.execute(insert(FacultyNeighbor), neighbor_rows[chunk_start:chunk_start + INSERT_CHUNK_SIZE])
+        db.commit()
+
+        print(f"\nDone! Stored {len(neighbor_rows)} neighbor rows in {time.time() - start_time:.1f}s")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Precompute similar faculty")
+    parser.add_argument("--k", type=int, default=FACULTY_NEIGHBOR_COUNT, help="Neighbors per faculty")
+    parser.add_argument("--batch-size", type=int, default=NEIGHBOR_BATCH_SIZE, help="Rows per matrix multiplication")
+    args = parser.parse_args()
+
+    build_faculty_neighbors(k=args.k, batch_size=args.batch_size)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Cluster paper embeddings into topic clusters with mini-batch k-means.
+Stores each paper's papers.cluster_id and the centroids in paper_clusters.
+Explore uses the clusters to show papers from distinct sub-areas.
+
+The first run (or --rebuild) trains centroids on a random sample and assigns
+every paper. Later runs are incremental: only papers without a cluster_id are
+assigned, and the centroids absorb them as running means.
+
+Centroids are committed together with every chunk of labels, so an interrupted
+run leaves paper_clusters consistent with the labels written so far and the
+next run simply continues with the remaining papers.
+
+Usage:
+    python scripts/cluster_papers.py [--rebuild] [--clusters 256] [--sample-size 200000]
+"""
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import delete, insert, text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models import PaperCluster
+from app.services.clustering import (
+    KMEANS_BATCH_SIZE, KMEANS_ITERATIONS, PAPER_CLUSTER_COUNT,
+    assign_clusters, minibatch_kmeans, update_centroids
+)
+from app.services.embeddings import EMBEDDING_DIMENSIONS
+
+TRAINING_SAMPLE_SIZE = 200000
+ASSIGN_CHUNK_SIZE = 5000
+
+
+def ensure_schema():
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE papers ADD COLUMN IF NOT EXISTS cluster_id INTEGER"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_papers_cluster_id ON papers (cluster_id)"))
+    PaperCluster.__table__.create(bind=engine, checkfirst=True)
+
+
+def load_centroids(db: Session) -> tuple[np.ndarray, np.ndarray]:
+    rows = db.query(PaperCluster.id, PaperCluster.centroid, PaperCluster.size).order_by(PaperCluster.id).all()
+    if not rows:
+        return np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32), np.empty(0, dtype=np.int64)
+    centroids = np.vstack([np.asarray(row.centroid, dtype=np.float32) for row in rows])
+    counts = np.array([row.size for row in rows], dtype=np.int64)
+    return centroids, counts
+
+
+def store_centroids(db: Session, centroids: np.ndarray, counts: np.ndarray):
+    db.execute(delete(PaperCluster))
+    db.execute(insert(PaperCluster), [
+        {"id": cluster, "centroid": centroids[cluster].tolist(), "size": int(counts[cluster])}
+        for cluster in range(len(centroids))
+    ])
+
+
+def train_centroids(db: Session, k: int, sample_size: int) -> tuple[np.ndarray, np.ndarray]:
+    rows = db.execute(
+        text("""
+            SELECT embedding FROM papers
+            WHERE embedding IS NOT NULL
+            ORDER BY random()
+            LIMIT :sample_size
+        """).columns(embedding=Vector(EMBEDDING_DIMENSIONS)),
+        {"sample_size": sample_size}
+    ).fetchall()
+
+    if not rows:
+        return np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    print(f"Training {k} centroids on {len(rows)} sampled papers...")
+    sample = np.vstack([np.asarray(row.embedding, dtype=np.float32) for row in rows])
+    return minibatch_kmeans(sample, k=k, batch_size=KMEANS_BATCH_SIZE, iterations=KMEANS_ITERATIONS)
+
+
+def assign_unclustered(db: Session, centroids: np.ndarray, counts: np.ndarray, incremental: bool) -> int:
+    """
+    Assign every paper without a cluster, chunk by chunk, committing each chunk's
+    labels with the centroids and counts they were assigned against.
+    Returns the number assigned.
+    """
+    assigned = 0
+    last_id = 0
+
+    while True:
+        rows = db.execute(
+            text("""
+                SELECT id, embedding FROM papers
+                WHERE embedding IS NOT NULL AND cluster_id IS NULL AND id > :last_id
+                ORDER BY id
+                LIMIT :chunk_size
+            """).columns(embedding=Vector(EMBEDDING_DIMENSIONS)),
+            {"last_id": last_id, "chunk_size": ASSIGN_CHUNK_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        paper_ids = [row.id for row in rows]
+        embeddings = np.vstack([np.asarray(row.embedding, dtype=np.float32) for row in rows])
+        if incremental:
+            labels = update_centroids(centroids, counts, embeddings)
+        else:
+            labels = assign_clusters(embeddings, centroids)
+            counts += np.bincount(labels, minlength=len(centroids))
+
+        db.execute(
+            text("""
+                UPDATE papers SET cluster_id = data.cluster_id
+                FROM unnest(CAST(:paper_ids AS integer[]), CAST(:labels AS integer[])) AS data(id, cluster_id)
+                WHERE papers.id = data.id
+            """),
+            {"paper_ids": paper_ids, "labels": labels.tolist()}
+        )
+        store_centroids(db, centroids, counts)
+        db.commit()
+
+        assigned += len(rows)
+        last_id = paper_ids[-1]
+        print(f"  Assigned {assigned} papers")
+
+    return assigned
+
+
+def cluster_papers(rebuild: bool = False, k: int = PAPER_CLUSTER_COUNT, sample_size: int = TRAINING_SAMPLE_SIZE):
+    ensure_schema()
+    db: Session = SessionLocal()
+
+    try:
+        start_time = time.time()
+        centroids, counts = load_centroids(db)
+        incremental = not rebuild and len(centroids) > 0
+
+        if not incremental:
+            centroids, _ = train_centroids(db, k, sample_size)
+            if len(centroids) == 0:
+                print("No papers with embeddings. Nothing to do.")
+                return
+            counts = np.zeros(len(centroids), dtype=np.int64)
+            db.execute(text("UPDATE papers SET cluster_id = NULL WHERE cluster_id IS NOT NULL"))
+            store_centroids(db, centroids, counts)
+            db.commit()
+            print(f"✓ Trained {len(centroids)} centroids in {time.time() - start_time:.1f}s")
+        else:
+            print(f"Loaded {len(centroids)} centroids, assigning new papers incrementally")
+
+        assigned = assign_unclustered(db, centroids, counts, incremental)
+
+        print(f"\nDone! Assigned {assigned} papers to {len(centroids)} clusters in {time.time() - start_time:.1f}s")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Cluster paper embeddings into topic clusters")
+    parser.add_argument("--rebuild", action="store_true", help="Retrain centroids and reassign every paper")
+    parser.add_argument("--clusters", type=int, default=PAPER_CLUSTER_COUNT, help="Number of clusters when training")
+    parser.add_argument("--sample-size", type=int, default=TRAINING_SAMPLE_SIZE, help="Papers sampled for training")
+    args = parser.parse_args()
+
+    cluster_papers(rebuild=args.rebuild, k=args.clusters, sample_size=args.sample_size)
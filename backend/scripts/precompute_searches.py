@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Nightly job: run the full hybrid search pipeline for head queries and every
+research tag, and store the results in precomputed_search so /api/search can
+serve exact matches without an embedding call.
+
+Usage:
+    python scripts/precompute_searches.py --query-log queries.jsonl [--top-n 500]
+
+The query log is either JSONL with a "query" field per line (as written by the
+request logger) or plain text with one query per line.
+"""
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models import PrecomputedSearch
+from app.schemas import SearchRequest
+from app.services.embeddings import get_embeddings
+from app.services.precompute import PRECOMPUTED_RESULT_LIMIT, normalize_query, store_precomputed_results
+from app.services.query_expansion import expand_query
+from app.services.search import search_faculty_hybrid_batch
+
+DEFAULT_TOP_N = 500
+EMBEDDING_BATCH_SIZE = 100
+
+
+def load_head_queries(path: str, top_n: int) -> list[str]:
+    counts = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    query = json.loads(line).get("query")
+                except json.JSONDecodeError:
+                    continue
+            else:
+                query = line
+            if query and normalize_query(query):
+                counts[normalize_query(query)] += 1
+    return [query for query, _ in counts.most_common(top_n)]
+
+
+def load_research_tags(db: Session) -> list[str]:
+    rows = db.execute(
+        text("SELECT DISTINCT unnest(research_tags) as tag FROM faculty")
+    ).fetchall()
+    return [row.tag for row in rows if row.tag]
+
+
+def precompute_searches(query_log: str | None, top_n: int = DEFAULT_TOP_N, keep_stale: bool = False):
+    PrecomputedSearch.__table__.create(bind=engine, checkfirst=True)
+
+    db: Session = SessionLocal()
+    run_started = datetime.now()
+
+    try:
+        queries = load_head_queries(query_log, top_n) if query_log else []
+        print(f"Loaded {len(queries)} head queries")
+
+        tags = load_research_tags(db)
+        print(f"Loaded {len(tags)} research tags")
+
+        seen = set()
+        all_queries = []
+        for query in queries + tags:
+            if normalize_query(query) not in seen:
+                seen.add(normalize_query(query))
+                all_queries.append(query)
+
+        total = len(all_queries)
+        print(f"Precomputing {total} queries")
+        start_time = time.time()
+
+        for batch_start in range(0, total, EMBEDDING_BATCH_SIZE):
+            batch = all_queries[batch_start:batch_start + EMBEDDING_BATCH_SIZE]
+            expanded = [expand_query(q) for q in batch]
+            embeddings = get_embeddings(expanded)
+            results = search_faculty_hybrid_batch(
+                db=db,
+                queries=expanded,
+                embeddings=embeddings,
+                limit=PRECOMPUTED_RESULT_LIMIT,
+            )
+
+            for query, query_results in zip(batch, results):
+                request = SearchRequest(query=query, limit=PRECOMPUTED_RESULT_LIMIT)
+                store_precomputed_results(db, request, query_results, computed_at=run_started)
+            db.commit()
+
+            print(f"Progress: {min(batch_start + EMBEDDING_BATCH_SIZE, total)}/{total}")
+
+        if not keep_stale:
+            removed = db.execute(
+                delete(PrecomputedSearch).where(PrecomputedSearch.computed_at < run_started)
+            ).rowcount
+            db.commit()
+            print(f"Removed {removed} stale entries")
+
+        print(f"\nDone! Precomputed {total} queries in {time.time() - start_time:.1f}s")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Precompute search results for head queries and tags")
+    parser.add_argument("--query-log", help="JSONL or plain-text query log")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="Number of head queries to precompute")
+    parser.add_argument("--keep-stale", action="store_true", help="Keep entries not refreshed by this run")
+    args = parser.parse_args()
+
+    precompute_searches(args.query_log, top_n=args.top_n, keep_stale=args.keep_stale)
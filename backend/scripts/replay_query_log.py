@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded request log against a running instance and report latency
+percentiles per endpoint and per server-side stage.
+
+Start the target with local stand-ins for the providers and without rate limits:
+    QUERY_LOG_PATH= EMBEDDING_PROVIDER=local LLM_PROVIDER=local RATE_LIMIT_ENABLED=false \\
+        uvicorn app.main:app --workers 4
+
+Then:
+    python scripts/replay_query_log.py queries.jsonl --base-url http://localhost:8000 --concurrency 16
+
+Explore requests are grouped by their session pseudonym and replayed in order, with
+the session id from the replayed /start substituted into /respond and /finish.
+CV uploads are replayed only when --cv-file is given.
+"""
+import json
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SEARCH_BODY_FIELDS = (
+    "query", "limit", "min_h_index", "universities", "mode",
+    "paper_aggregation", "lexical_retriever", "diversify", "diversity_lambda",
+)
+EXPLORE_BODY_FIELDS = ("response", "faculty_id", "liked_paper_ids", "disliked_paper_ids")
+_SERVER_TIMING_PATTERN = re.compile(r"([\w-]+);dur=([\d.]+)")
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_log(path: str, limit: int | None) -> list[dict]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+            if limit and len(records) >= limit:
+                break
+    return records
+
+
+def build_work_units(records: list[dict], cv_file: str | None) -> list[list[dict]]:
+    """Each unit is a list of records replayed sequentially; units run concurrently."""
+    sessions = defaultdict(list)
+    units = []
+    for record in records:
+        if record.get("endpoint", "").startswith("/api/explore/") and record.get("session"):
+            sessions[record["session"]].append(record)
+        elif record.get("endpoint") == "/api/upload/cv" and not cv_file:
+            continue
+        else:
+            units.append([record])
+    units.extend(sessions.values())
+    return units
+
+
+class Replayer:
+    def __init__(self, base_url: str, cv_file: str | None, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.cv_bytes = open(cv_file, "rb").read() if cv_file else None
+        self.cv_name = cv_file
+        self.timeout = timeout
+
+    def _send(self, http: requests.Session, record: dict, session_ids: dict) -> requests.Response | None:
+        endpoint = record["endpoint"]
+        url = self.base_url + record["path"]
+
+        if endpoint in ("/api/search/", "/api/search/batch", "/api/search/explain"):
+            body = {k: v for k, v in record.items() if k in SEARCH_BODY_FIELDS + ("queries", "interests", "faculty_id")}
+            return http.post(url, json=body, timeout=self.timeout)
+
+        if endpoint == "/api/search/suggest":
+            return http.get(url, params={"q": record["q"], "limit": record.get("limit")}, timeout=self.timeout)
+
+        if endpoint == "/api/faculty/{faculty_id}/similar":
+            return http.get(url, params={"limit": record.get("limit")}, timeout=self.timeout)
+
+        if endpoint == "/api/upload/cv":
+            params = {k: record[k] for k in ("limit", "min_h_index", "universities") if record.get(k) is not None}
+            files = {"file": (self.cv_name, self.cv_bytes)}
+            return http.post(url, params=params, files=files, timeout=self.timeout)
+
+        if endpoint == "/api/explore/start":
+            return http.post(url, json={"initial_interest": record["initial_interest"]}, timeout=self.timeout)
+
+        if endpoint.startswith("/api/explore/"):
+            session_id = session_ids.get(record["session"])
+            if not session_id:
+                return None
+            body = {"session_id": session_id}
+            body.update({k: v for k, v in record.items() if k in EXPLORE_BODY_FIELDS})
+            return http.post(url, json=body, timeout=self.timeout)
+
+        return None
+
+    def run_unit(self, unit: list[dict]) -> list[dict]:
+        samples = []
+        session_ids = {}
+        with requests.Session() as http:
+            for record in unit:
+                start = time.perf_counter()
+                try:
+                    response = self._send(http, record, session_ids)
+                except requests.RequestException:
+                    response = None
+                    ok = False
+                else:
+                    if response is None:
+                        continue
+                    ok = response.status_code < 400
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                stages = {}
+                if response is not None:
+                    header = response.headers.get("Server-Timing", "")
+                    stages = {name: float(dur) for name, dur in _SERVER_TIMING_PATTERN.findall(header)}
+                    if ok and record["endpoint"] == "/api/explore/start":
+                        session_ids[record["session"]] = response.json()["session_id"]
+
+                samples.append({
+                    "endpoint": record["endpoint"],
+                    "ok": ok,
+                    "latency_ms": elapsed_ms,
+                    "stages": stages,
+                })
+        return samples
+
+
+def report(samples: list[dict], wall_seconds: float) -> None:
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample["endpoint"]].append(sample)
+
+    print(f"\nReplayed {len(samples)} requests in {wall_seconds:.1f}s "
+          f"({len(samples) / wall_seconds:.1f} req/s)\n")
+    print(f"{'endpoint / stage':<48}{'count':>7}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+
+    for endpoint, endpoint_samples in sorted(by_endpoint.items()):
+        latencies = [s["latency_ms"] for s in endpoint_samples]
+        errors = sum(1 for s in endpoint_samples if not s["ok"])
+        print(f"{endpoint:<48}{len(latencies):>7}{errors:>8}"
+              f"{statistics.median(latencies):>10.1f}{_percentile(latencies, 95):>10.1f}"
+              f"{_percentile(latencies, 99):>10.1f}")
+
+        stage_values = defaultdict(list)
+        for sample in endpoint_samples:
+            for name, duration in sample["stages"].items():
+                stage_values[name].append(duration)
+        for name, values in sorted(stage_values.items()):
+            print(f"  {name:<46}{len(values):>7}{'':>8}"
+                  f"{statistics.median(values):>10.1f}{_percentile(values, 95):>10.1f}"
+                  f"{_percentile(values, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a request log and report latency percentiles")
+    parser.add_argument("log", help="JSONL request log written with QUERY_LOG_PATH")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Instance to replay against")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent work units")
+    parser.add_argument("--limit", type=int, help="Replay only the first N records")
+    parser.add_argument("--cv-file", help="PDF/DOCX used for recorded CV uploads")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    records = load_log(args.log, args.limit)
+    units = build_work_units(records, args.cv_file)
+    if not units:
+        print("Nothing to replay.")
+        sys.exit(0)
+
+    replayer = Replayer(args.base_url, args.cv_file, args.timeout)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        samples = [sample for unit_samples in executor.map(replayer.run_unit, units) for sample in unit_samples]
+    report(samples, time.perf_counter() - start)
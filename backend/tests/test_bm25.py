@@ -0,0 +1,126 @@
+"""Tests for the in-process BM25 index."""
+
+import math
+import random
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+import pytest
+
+from app.services import bm25
+from app.services.bm25 import BM25Index, tokenize
+
+
+def _index():
+    index = BM25Index()
+    index.add_document(1, "reinforcement learning for robotics", h_index=40, affiliation="MIT CS")
+    index.add_document(2, "natural language processing and language models", h_index=70, affiliation="Stanford CS")
+    index.add_document(3, "robotics manipulation and grasping robotics", h_index=20, affiliation="CMU CS")
+    return index
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    """Test that tokenization lowercases and removes stopwords."""
+    assert tokenize("The Theory of Deep-Learning!") == ["theory", "deep", "learning"]
+
+
+def test_ranks_by_term_frequency():
+    """Test that the document repeating the query term ranks first."""
+    results = _index().search("robotics")
+    assert [doc_id for doc_id, _ in results] == [3, 1]
+
+
+def test_matches_reference_bm25_score():
+    """Test the score against a hand-computed BM25 value."""
+    index = _index()
+    (doc_id, score), = index.search("language")
+    k1, b = index.k1, index.b
+    n_docs, df, tf = 3, 1, 2
+    avg_len = (3 + 5 + 4) / 3
+    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+    expected = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * 5 / avg_len))
+    assert doc_id == 2
+    assert math.isclose(score, expected, rel_tol=1e-5)
+
+
+def test_filters():
+    """Test h-index and university prefix filters."""
+    index = _index()
+    assert [d for d, _ in index.search("robotics", min_h_index=30)] == [1]
+    assert [d for d, _ in index.search("robotics", universities=["CMU"])] == [3]
+
+
+def test_incremental_update_and_remove():
+    """Test that updates replace old text and removals take effect before and after compaction."""
+    index = _index()
+    index.add_document(3, "computer vision")
+    assert [d for d, _ in index.search("robotics")] == [1]
+    assert [d for d, _ in index.search("vision")] == [3]
+
+    index.remove_document(1)
+    assert index.search("robotics") == []
+
+    index.compact()
+    assert len(index) == 2
+    assert [d for d, _ in index.search("vision")] == [3]
+    assert [d for d, _ in index.search("language")] == [2]
+
+
+@pytest.mark.benchmark
+def test_query_latency():
+    """Test that queries over a few thousand documents take well under a millisecond."""
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(3000)]
+    index = BM25Index()
+    for doc_id in range(2000):
+        index.add_document(doc_id, " ".join(rng.choices(vocabulary, k=200)))
+    index.compact()
+
+    queries = [" ".join(rng.choices(vocabulary, k=4)) for _ in range(200)]
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, limit=50)
+    elapsed = (time.perf_counter() - start) / len(queries)
+
+    assert elapsed < 0.001
+
+
+def test_filter_mask_cache_is_bounded(monkeypatch):
+    """Test that per-filter masks are evicted least recently used first."""
+    monkeypatch.setattr(bm25, "FILTER_MASK_CACHE_SIZE", 2)
+    index = _index()
+
+    index.search("robotics", universities=["MIT"])
+    index.search("robotics", universities=["CMU"])
+    index.search("robotics", universities=["MIT"])
+    index.search("robotics", universities=["Stanford"])
+
+    assert list(index._mask_cache) == [(0, ("MIT",)), (0, ("Stanford",))]
+    assert [d for d, _ in index.search("robotics", universities=["CMU"])] == [3]
+
+
+def test_stale_index_is_rebuilt_in_the_background(monkeypatch):
+    """Test that a stale index keeps serving while its replacement is built off the request path."""
+    stale, fresh = BM25Index(), BM25Index()
+    release = threading.Event()
+
+    def build(db):
+        release.wait(5)
+        return fresh
+
+    monkeypatch.setattr(bm25, "SessionLocal", nullcontext)
+    monkeypatch.setattr(bm25, "build_faculty_bm25_index", build)
+    monkeypatch.setattr(bm25, "_index", stale)
+    monkeypatch.setattr(bm25, "_index_built_at", datetime.now() - bm25.BM25_INDEX_TTL * 2)
+    monkeypatch.setattr(bm25, "_rebuild_thread", None)
+
+    assert bm25.get_faculty_bm25_index(db=None) is stale
+    rebuild = bm25._rebuild_thread
+    assert bm25.get_faculty_bm25_index(db=None) is stale
+    assert bm25._rebuild_thread is rebuild
+
+    release.set()
+    rebuild.join(5)
+    assert bm25.get_faculty_bm25_index(db=None) is fresh
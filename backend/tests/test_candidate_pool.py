@@ -0,0 +1,68 @@
+import numpy as np
+
+from app.services import candidate_pool
+from app.services.candidate_pool import (
+    POOL_MIN_REMAINING, CandidatePool,
+    get_candidate_pool, store_candidate_pool
+)
+
+
+def _pool(n: int = 50, dim: int = 16, seed: int = 0) -> CandidatePool:
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, dim)).astype(np.float32)
+    ids = np.arange(1000, 1000 + n)
+    rows = [(int(paper_id), f"paper {paper_id}", "abstract", 2024, None, 1) for paper_id in ids]
+    return CandidatePool(ids, embeddings, rows, anchor=embeddings.mean(axis=0))
+
+
+def test_rank_matches_brute_force_and_skips_excluded():
+    """Test that local ranking returns the nearest unseen papers in order."""
+    pool = _pool()
+    query = pool.embeddings[7] + 0.1 * pool.embeddings[3]
+
+    indices, similarities = pool.rank(query, exclude_ids=[1007], limit=5)
+
+    expected = np.argsort(-(pool.embeddings @ (query / np.linalg.norm(query))))
+    expected = [int(i) for i in expected if i != 7][:5]
+    assert indices == expected
+    assert np.all(np.diff(similarities) <= 0)
+
+
+def test_needs_refill_when_running_low_or_drifting():
+    """Test that the pool asks for a refill once exhausted or when the query drifts."""
+    pool = _pool()
+    assert not pool.needs_refill(pool.anchor, exclude_ids=[])
+
+    nearly_all = pool.ids[: len(pool) - POOL_MIN_REMAINING + 1].tolist()
+    assert pool.needs_refill(pool.anchor, exclude_ids=nearly_all)
+    assert pool.needs_refill(-pool.anchor, exclude_ids=[])
+
+
+def _query_at_similarity(anchor: np.ndarray, similarity: float, seed: int = 1) -> np.ndarray:
+    orthogonal = np.random.default_rng(seed).standard_normal(len(anchor))
+    orthogonal -= (orthogonal @ anchor) * anchor
+    orthogonal /= np.linalg.norm(orthogonal)
+    return similarity * anchor + np.sqrt(1 - similarity ** 2) * orthogonal
+
+
+def test_typical_follow_up_reuses_pool():
+    """Test that a same-topic follow-up (cosine ~0.55-0.75 to the anchor) does not refetch the pool."""
+    pool = _pool()
+    for similarity in (0.55, 0.65, 0.75):
+        assert not pool.needs_refill(_query_at_similarity(pool.anchor, similarity), exclude_ids=[])
+
+    assert pool.needs_refill(_query_at_similarity(pool.anchor, 0.25), exclude_ids=[])
+
+
+def test_pool_cache_is_bounded(monkeypatch):
+    """Test that the per-session pool cache evicts the least recently used pool."""
+    monkeypatch.setattr(candidate_pool, "CANDIDATE_POOL_CACHE_SIZE", 2)
+    monkeypatch.setattr(candidate_pool, "_pools", candidate_pool.OrderedDict())
+
+    store_candidate_pool("a", _pool())
+    store_candidate_pool("b", _pool())
+    get_candidate_pool("a")
+    store_candidate_pool("c", _pool())
+
+    assert get_candidate_pool("b") is None
+    assert get_candidate_pool("a") is not None
@@ -0,0 +1,49 @@
+import numpy as np
+
+from app.services.clustering import assign_clusters, minibatch_kmeans, update_centroids
+from app.services.explorer import select_across_clusters
+
+
+def _blobs(n_per_blob: int = 200, dim: int = 32, blobs: int = 4, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((blobs, dim)).astype(np.float32) * 5
+    points = np.vstack([center + rng.standard_normal((n_per_blob, dim)).astype(np.float32) for center in centers])
+    labels = np.repeat(np.arange(blobs), n_per_blob)
+    return points, labels
+
+
+def test_minibatch_kmeans_recovers_blobs():
+    """Test that every well-separated blob ends up in a single cluster."""
+    points, truth = _blobs()
+
+    centroids, counts = minibatch_kmeans(points, k=4, batch_size=128, iterations=50)
+    labels = assign_clusters(points, centroids)
+
+    assert centroids.shape == (4, points.shape[1])
+    assert counts.sum() == 128 * 50
+    for blob in range(4):
+        assert len(np.unique(labels[truth == blob])) == 1
+    assert len(np.unique(labels)) == 4
+
+
+def test_incremental_update_absorbs_new_points():
+    """Test that folding in a batch moves its centroid toward the batch and bumps counts."""
+    centroids = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    counts = np.array([10, 10], dtype=np.int64)
+    batch = np.array([[1.0, 0.2]] * 10, dtype=np.float32)
+
+    labels = update_centroids(centroids, counts, batch)
+
+    assert labels.tolist() == [0] * 10
+    assert counts.tolist() == [20, 10]
+    assert 0 < centroids[0, 1] < 0.2
+    assert centroids[1].tolist() == [0.0, 1.0]
+
+
+def test_select_across_clusters_takes_best_of_each_cluster():
+    """Test that explore picks the top candidate from distinct clusters in relevance order."""
+    candidates = [10, 11, 12, 13, 14, 15]
+    clusters = np.array([3, 3, -1, 7, 7, 1])
+
+    assert select_across_clusters(candidates, clusters, limit=3) == [10, 13, 15]
+    assert select_across_clusters(candidates, clusters, limit=2) == [10, 13]
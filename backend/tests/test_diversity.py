@@ -0,0 +1,34 @@
+"""Tests for MMR diversification."""
+
+import numpy as np
+from app.services.diversity import mmr_select
+
+
+def test_lambda_one_keeps_relevance_order():
+    """Test that lambda=1 selects purely by relevance."""
+    relevance = np.array([0.2, 0.9, 0.5, 0.7])
+    embeddings = np.eye(4)
+    assert mmr_select(relevance, embeddings, k=3, lambda_=1.0) == [1, 3, 2]
+
+
+def test_near_duplicates_are_demoted():
+    """Test that a near-duplicate of the top result loses to a distinct candidate."""
+    relevance = np.array([1.0, 0.99, 0.8])
+    embeddings = np.array([
+        [1.0, 0.0],
+        [0.99, 0.01],
+        [0.0, 1.0],
+    ])
+    assert mmr_select(relevance, embeddings, k=2, lambda_=0.5) == [0, 2]
+
+
+def test_k_larger_than_pool():
+    """Test that asking for more results than candidates returns every candidate once."""
+    relevance = np.array([0.3, 0.6])
+    embeddings = np.array([[1.0, 0.0], [0.0, 1.0]])
+    assert sorted(mmr_select(relevance, embeddings, k=5)) == [0, 1]
+
+
+def test_empty_pool():
+    """Test that an empty pool selects nothing."""
+    assert mmr_select(np.array([]), np.empty((0, 3)), k=3) == []
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import embeddings
+from app.services.embeddings import CircuitBreaker, EmbeddingUnavailableError
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(monkeypatch):
+    monkeypatch.setattr(embeddings, "_breaker", CircuitBreaker(failure_threshold=2, reset_seconds=0.2))
+
+
+def test_deadline_raises_unavailable(monkeypatch):
+    """Test that a slow provider is abandoned at the deadline."""
+    monkeypatch.setattr(embeddings, "_create_embedding", lambda text: time.sleep(0.5) or [0.0])
+
+    start = time.monotonic()
+    with pytest.raises(EmbeddingUnavailableError):
+        embeddings.get_embedding_with_deadline("query", deadline=0.05)
+    assert time.monotonic() - start < 0.3
+
+
+def test_breaker_opens_and_recovers(monkeypatch):
+    """Test that repeated failures open the breaker and a later success closes it."""
+    def failing(text):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(embeddings, "_create_embedding", failing)
+    for _ in range(2):
+        with pytest.raises(EmbeddingUnavailableError):
+            embeddings.get_embedding_with_deadline("query", deadline=0.5)
+    assert embeddings._breaker.is_open
+
+    calls = []
+    monkeypatch.setattr(embeddings, "_create_embedding", lambda text: calls.append(text) or [1.0])
+    with pytest.raises(EmbeddingUnavailableError):
+        embeddings.get_embedding_with_deadline("query", deadline=0.5)
+    assert calls == []
+
+    time.sleep(0.25)
+    assert embeddings.get_embedding_with_deadline("query", deadline=0.5) == [1.0]
+    assert not embeddings._breaker.is_open
+
+
+def test_async_embedding_shares_breaker_and_deadline(monkeypatch):
+    """Test that the async path abandons slow calls at the deadline and trips the shared breaker."""
+    calls = []
+
+    async def slow(text):
+        calls.append(text)
+        await asyncio.sleep(0.5)
+        return [0.0]
+
+    monkeypatch.setattr(embeddings, "_create_embedding_async", slow)
+    for _ in range(2):
+        with pytest.raises(EmbeddingUnavailableError):
+            asyncio.run(embeddings.get_embedding_async("query", deadline=0.05))
+    assert embeddings._breaker.is_open
+
+    with pytest.raises(EmbeddingUnavailableError):
+        embeddings.get_embedding_with_deadline("query", deadline=0.5)
+    with pytest.raises(EmbeddingUnavailableError):
+        asyncio.run(embeddings.get_embedding_async("query"))
+    assert calls == ["query", "query"]
@@ -0,0 +1,81 @@
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models import Paper
+from app.routers import explore
+from app.schemas import ExploreRespondRequest
+from app.services import explorer
+
+
+def test_respond_yields_speculative_papers_before_refinement_finishes(monkeypatch):
+    """Test that papers for the raw response are yielded while the Claude extraction is still running."""
+    extraction = Future()
+    speculative = [Paper(id=1, title="Legged robots", abstract="a", year=2024, venue=None, faculty_id=None)]
+    refined = [Paper(id=2, title="Robot control", abstract="b", year=2024, venue=None, faculty_id=None)]
+
+    monkeypatch.setattr(explore, "EXPLORE_REFINEMENT", "llm")
+    monkeypatch.setattr(explore, "start_preference_extraction", lambda session, response: extraction)
+    monkeypatch.setattr(explore, "embed_for_session", lambda text, session: [1.0, 0.0])
+    monkeypatch.setattr(explore, "get_papers_near_vector", lambda *args, **kwargs: speculative)
+    monkeypatch.setattr(explore, "resolve_speculative_papers", lambda *args, **kwargs: refined)
+    name_lookups = []
+    monkeypatch.setattr(explore, "_get_faculty_names", lambda papers, db: name_lookups.append(papers) or {})
+
+    session = explorer.create_session("robotics")
+    steps = explore._respond_steps(ExploreRespondRequest(session_id=session.session_id, response="legs"), db=None)
+
+    kind, papers = next(steps)
+    assert kind == "speculative_papers"
+    assert [paper.id for paper in papers] == [1]
+    assert not extraction.done()
+    assert name_lookups == []
+
+    extraction.set_result({"refined_query": "robot control", "liked": ["legs"]})
+    kind, result = next(steps)
+    assert kind == "result"
+    assert [paper.id for paper in result.papers] == [2]
+    assert name_lookups == [refined]
+    assert explorer.get_session(session.session_id).shown_paper_ids.tolist() == [2]
+    explorer.delete_session(session.session_id)
+
+
+def test_respond_stream_looks_up_faculty_names_once_per_batch(monkeypatch):
+    """Test that the stream converts speculative papers with a single faculty name lookup."""
+    extraction = Future()
+    extraction.set_result({"refined_query": "robot control"})
+    speculative = [
+        Paper(id=i, title=f"Paper {i}", abstract="a", year=2024, venue=None, faculty_id=10 + i)
+        for i in range(1, 5)
+    ]
+
+    monkeypatch.setattr(explore, "EXPLORE_REFINEMENT", "llm")
+    monkeypatch.setattr(explore, "SessionLocal", nullcontext)
+    monkeypatch.setattr(explore, "start_preference_extraction", lambda session, response: extraction)
+    monkeypatch.setattr(explore, "embed_for_session", lambda text, session: [1.0, 0.0])
+    monkeypatch.setattr(explore, "get_papers_near_vector", lambda *args, **kwargs: speculative)
+    monkeypatch.setattr(explore, "resolve_speculative_papers", lambda *args, **kwargs: speculative)
+    name_lookups = []
+
+    def faculty_names(papers, db):
+        name_lookups.append([paper.id for paper in papers])
+        return {paper.faculty_id: f"Prof {paper.id}" for paper in papers}
+
+    monkeypatch.setattr(explore, "_get_faculty_names", faculty_names)
+
+    app = FastAPI()
+    app.state.limiter = explore.limiter
+    app.include_router(explore.router, prefix="/api/explore")
+    session = explorer.create_session("robotics")
+
+    response = TestClient(app).post(
+        "/api/explore/respond/stream", json={"session_id": session.session_id, "response": "legs"}
+    )
+
+    assert response.status_code == 200
+    assert "event: speculative_papers" in response.text
+    assert '"faculty_name": "Prof 1"' in response.text
+    assert name_lookups == [[1, 2, 3, 4], [1, 2, 3, 4]]
+    explorer.delete_session(session.session_id)
@@ -0,0 +1,321 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import explorer
+from app.services.explorer import (
+    ExploreSession, MAX_CACHED_QUERY_VECTORS, QUERY_VECTOR_CACHE_SESSIONS, embed_for_session, rocchio_update
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_query_vectors(monkeypatch):
+    monkeypatch.setattr(explorer, "_query_vectors", OrderedDict())
+
+
+def _fake_embedding(calls):
+    def embed(text):
+        calls.append(text)
+        return [float(len(calls)), 0.5, -0.25]
+    return embed
+
+
+def test_embed_for_session_reuses_cached_vector(monkeypatch):
+    """Test that the same text is embedded only once per session."""
+    calls = []
+    monkeypatch.setattr(explorer, "get_embedding", _fake_embedding(calls))
+    session = ExploreSession(session_id="s", initial_interest="robotics")
+
+    first = embed_for_session("robotics", session)
+    second = embed_for_session(" robotics ", session)
+
+    assert first == second
+    assert calls == ["robotics"]
+
+
+def test_query_vector_cache_is_bounded(monkeypatch):
+    """Test that only the most recent query vectors are kept for a session."""
+    calls = []
+    monkeypatch.setattr(explorer, "get_embedding", _fake_embedding(calls))
+    session = ExploreSession(session_id="s", initial_interest="robotics")
+
+    for i in range(MAX_CACHED_QUERY_VECTORS + 2):
+        embed_for_session(f"query {i}", session)
+    embed_for_session(f"query {MAX_CACHED_QUERY_VECTORS + 1}", session)
+    embed_for_session("query 0", session)
+
+    assert calls.count(f"query {MAX_CACHED_QUERY_VECTORS + 1}") == 1
+    assert calls.count("query 0") == 2
+
+
+def test_query_vector_cache_evicts_least_recent_sessions(monkeypatch):
+    """Test that the process-local cache holds vectors for a bounded number of sessions."""
+    calls = []
+    monkeypatch.setattr(explorer, "get_embedding", _fake_embedding(calls))
+    sessions = [
+        ExploreSession(session_id=f"s{i}", initial_interest="robotics")
+        for i in range(QUERY_VECTOR_CACHE_SESSIONS + 1)
+    ]
+
+    for session in sessions:
+        embed_for_session("robotics", session)
+
+    assert len(explorer._query_vectors) == QUERY_VECTOR_CACHE_SESSIONS
+    embed_for_session("robotics", sessions[-1])
+    embed_for_session("robotics", sessions[0])
+    assert len(calls) == QUERY_VECTOR_CACHE_SESSIONS + 2
+
+
+def test_query_vectors_are_not_serialized(monkeypatch):
+    """Test that cached query vectors stay out of the stored session state."""
+    monkeypatch.setattr(explorer, "get_embedding", _fake_embedding([]))
+    session = ExploreSession(session_id="s", initial_interest="robotics")
+    embed_for_session("robotics", session)
+
+    state = session.to_dict()
+
+    assert "query_vectors" not in state
+    ExploreSession.from_dict({**state, "query_vectors": {"robotics": "AAAA"}})
+
+
+def test_rocchio_update_moves_toward_positives_and_away_from_negatives():
+    """Test that the preference vector shifts toward liked and away from disliked papers."""
+    current = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    liked = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+    disliked = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+
+    updated = rocchio_update(current, [liked], [disliked])
+
+    assert np.isclose(np.linalg.norm(updated), 1.0)
+    assert updated @ liked > 0
+    assert updated @ disliked < 0
+    assert updated @ current > updated @ liked
+
+
+def test_speculative_papers_kept_when_refined_query_is_close(monkeypatch):
+    """Test that speculative results are reused unless the refined query points elsewhere."""
+    vectors = {"graph learning": [1.0, 0.0, 0.0], "graph neural networks": [0.95, 0.05, 0.0], "protein folding": [0.0, 1.0, 0.0]}
+    requeried = []
+    monkeypatch.setattr(explorer, "get_embedding", lambda text: vectors[text])
+    monkeypatch.setattr(
+        explorer, "get_papers_near_vector",
+        lambda db, embedding, exclude_ids, limit, session: requeried.append(embedding) or ["fresh"]
+    )
+    session = ExploreSession(session_id="s", initial_interest="graphs")
+    speculative = ["speculative"]
+
+    close = explorer.resolve_speculative_papers(None, session, "graph neural networks", vectors["graph learning"], speculative, [])
+    far = explorer.resolve_speculative_papers(None, session, "protein folding", vectors["graph learning"], speculative, [])
+
+    assert close == speculative
+    assert far == ["fresh"]
+    assert requeried == [vectors["protein folding"]]
+
+
+def test_speculative_finish_used_only_for_unchanged_session(monkeypatch):
+    """Test that a background finish is returned for the same version and dropped otherwise."""
+    monkeypatch.setattr(explorer, "_run_speculative_finish", lambda session: ({"title": session.session_id}, []))
+    session = ExploreSession(session_id="s", initial_interest="robotics", version=3)
+
+    explorer.start_speculative_finish(session)
+    assert explorer.take_speculative_finish(session) == ({"title": "s"}, [])
+    assert explorer.take_speculative_finish(session) is None
+
+    explorer.start_speculative_finish(session)
+    session.version = 4
+    assert explorer.take_speculative_finish(session) is None
+
+    explorer.start_speculative_finish(session)
+    explorer.discard_speculative_finish(session.session_id)
+    assert explorer.take_speculative_finish(session) is None
+
+
+class _StreamingClient:
+    """Stand-in LLM client whose stream() yields word chunks, failing for one faculty."""
+
+    def __init__(self, failing_name):
+        self.failing_name = failing_name
+        self.messages = self
+
+    @contextmanager
+    def stream(self, model, max_tokens, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        if self.failing_name in prompt:
+            raise RuntimeError("stream broke")
+        yield SimpleNamespace(text_stream=iter(["Works ", "on ", "robots."]))
+
+
+def test_streamed_explanations_emit_deltas_and_one_final_per_faculty():
+    """Test that token deltas are streamed and every faculty gets exactly one final explanation."""
+    faculty_data = {
+        i: {"name": f"Prof {i}", "affiliation": "MIT", "research_tags": [f"tag{i}"], "top_paper_title": None}
+        for i in range(3)
+    }
+
+    events = list(explorer.stream_faculty_explanations(_StreamingClient("Prof 2"), "robotics", faculty_data, timeout=2.0))
+
+    finals = {faculty_id: (kind, content) for faculty_id, kind, content in events if kind != "delta"}
+    deltas = [content for faculty_id, kind, content in events if kind == "delta" and faculty_id == 0]
+    assert finals == {
+        0: ("done", "Works on robots."),
+        1: ("done", "Works on robots."),
+        2: ("fallback", "Research focus aligns with tag2."),
+    }
+    assert deltas == ["Works ", "on ", "robots."]
+
+
+def test_match_explanations_generated_once_and_cached_on_session(monkeypatch):
+    """Test that an on-demand explanation is generated once, saved on the session and survives reloads."""
+    calls = []
+
+    def explain(client, direction_description, data):
+        calls.append(data["name"])
+        return f"{data['name']} fits {direction_description}."
+
+    monkeypatch.setattr(explorer, "_explain_faculty_match", explain)
+    monkeypatch.setattr(explorer, "get_llm_client", lambda: None)
+
+    session = explorer.create_session("robotics")
+    match = explorer.format_faculty_match(7, {
+        "name": "Prof 7", "email": None, "affiliation": "MIT", "h_index": 10, "paper_count": 5,
+        "semantic_scholar_id": None, "research_tags": ["robots"], "similarity": 0.8, "top_paper_title": "Legs",
+    }, None)
+    explorer.mark_session_finished(session, {"title": "Robots", "description": "Legged robots"}, [match])
+
+    first = explorer.explain_session_match(explorer.get_session(session.session_id), 7)
+    second = explorer.explain_session_match(explorer.get_session(session.session_id), 7)
+
+    assert first == second == "Prof 7 fits Robots: Legged robots."
+    assert calls == ["Prof 7"]
+    assert explorer.explain_session_match(explorer.get_session(session.session_id), 8) is None
+    explorer.delete_session(session.session_id)
+
+
+class _PaperDb:
+    """Stand-in session answering the column check and returning fixed candidate rows."""
+
+    def __init__(self, has_cluster_column, rows):
+        self.has_cluster_column = has_cluster_column
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "information_schema" in sql:
+            return SimpleNamespace(first=lambda: (1,) if self.has_cluster_column else None)
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+def test_candidate_pool_skips_cluster_column_until_clustering_has_run(monkeypatch):
+    """Test that explore does not select papers.cluster_id before the clustering script has added it."""
+    monkeypatch.setattr(explorer, "_cluster_column_exists", False)
+    monkeypatch.setattr(explorer, "_cluster_column_checked_at", None)
+    rows = [
+        SimpleNamespace(id=i, title=f"t{i}", abstract="a", year=2020, venue=None, faculty_id=1,
+                        cluster_id=None, embedding=np.eye(explorer.EMBEDDING_DIMENSIONS, dtype=np.float32)[i])
+        for i in range(3)
+    ]
+
+    db = _PaperDb(has_cluster_column=False, rows=rows)
+    pool = explorer._fetch_candidate_pool(db, [1.0] * explorer.EMBEDDING_DIMENSIONS, [], 10)
+    assert "CAST(NULL AS integer) AS cluster_id" in db.statements[-1]
+    assert pool.clusters.tolist() == [-1, -1, -1]
+
+    db.has_cluster_column = True
+    explorer._fetch_candidate_pool(db, [1.0] * explorer.EMBEDDING_DIMENSIONS, [], 10)
+    assert not any("information_schema" in sql for sql in db.statements[2:])
+
+    monkeypatch.setattr(explorer, "_cluster_column_checked_at", time.monotonic() - explorer.CLUSTER_COLUMN_RECHECK_SECONDS)
+    explorer._fetch_candidate_pool(db, [1.0] * explorer.EMBEDDING_DIMENSIONS, [], 10)
+    assert "CAST(NULL" not in db.statements[-1]
+    assert explorer._cluster_column_exists
+
+
+def test_reopened_session_forgets_finish_results():
+    """Test that continuing to explore after /finish clears the direction, matches and explanations."""
+    session = explorer.create_session("robotics")
+    explorer.mark_session_finished(session, {"title": "Robots", "description": "Legged robots"}, [{"faculty": {"id": 7}}])
+    explorer.cache_explanations(session.session_id, {7: "Works on legged robots."})
+
+    session = explorer.get_session(session.session_id)
+    explorer.reopen_session(session)
+    explorer.save_session(session)
+
+    reloaded = explorer.get_session(session.session_id)
+    assert reloaded.direction is None
+    assert reloaded.matches == []
+    assert reloaded.explanations == {}
+    explorer.delete_session(session.session_id)
+
+
+def test_fallback_explanation_is_returned_but_not_cached(monkeypatch):
+    """Test that a failed Claude call yields the fallback text once and is retried on the next request."""
+    replies = [None, "Prof 7 builds legged robots."]
+    monkeypatch.setattr(explorer, "_explain_faculty_match", lambda client, direction, data: replies.pop(0))
+    monkeypatch.setattr(explorer, "get_llm_client", lambda: None)
+
+    session = explorer.create_session("robotics")
+    match = {"faculty": {"id": 7, "name": "Prof 7", "affiliation": "MIT", "research_tags": ["robots"]}, "key_paper": None}
+    explorer.mark_session_finished(session, {"title": "Robots", "description": "Legged robots"}, [match])
+
+    assert explorer.explain_session_match(explorer.get_session(session.session_id), 7) == "Research focus aligns with robots."
+    assert explorer.get_session(session.session_id).explanations == {}
+    assert explorer.explain_session_match(explorer.get_session(session.session_id), 7) == "Prof 7 builds legged robots."
+    assert explorer.get_session(session.session_id).explanations == {7: "Prof 7 builds legged robots."}
+    explorer.delete_session(session.session_id)
+
+
+def test_rocchio_uses_marked_papers_without_embedding_the_response(monkeypatch):
+    """Test that liked/disliked papers drive Rocchio refinement, are recorded as preferences, and skip the embedding call."""
+    def fail(text):
+        raise AssertionError("response text should not be embedded when papers are marked")
+
+    monkeypatch.setattr(explorer, "get_embedding", fail)
+    rows = [
+        SimpleNamespace(id=1, title="Legged locomotion", embedding=np.array([0.0, 1.0, 0.0])),
+        SimpleNamespace(id=2, title="Protein folding", embedding=np.array([0.0, 0.0, 1.0])),
+    ]
+    db = SimpleNamespace(execute=lambda statement, params: SimpleNamespace(fetchall=lambda: rows))
+    session = ExploreSession(session_id="s", initial_interest="robotics", preference_vector=[1.0, 0.0, 0.0])
+    session.shown_paper_ids.extend([1, 2])
+
+    vector, _ = explorer.refine_preference_vector(db, session, "these", liked_paper_ids=[1], disliked_paper_ids=[2, 99])
+
+    assert vector[1] > 0 > vector[2]
+    assert session.preferences["liked"] == ["Legged locomotion"]
+    assert session.preferences["disliked"] == ["Protein folding"]
+
+
+def test_diverse_papers_match_brute_force_mmr(monkeypatch):
+    """Test that an unclustered pool yields the same picks as a direct MMR over the candidates."""
+    monkeypatch.setattr(explorer, "_cluster_column_exists", False)
+    monkeypatch.setattr(explorer, "_cluster_column_checked_at", None)
+    rng = np.random.default_rng(7)
+    query = rng.standard_normal(explorer.EMBEDDING_DIMENSIONS)
+    embeddings = query * 0.3 + rng.standard_normal((12, explorer.EMBEDDING_DIMENSIONS))
+    rows = [
+        SimpleNamespace(id=100 + i, title=f"t{i}", abstract="a", year=2020, venue=None, faculty_id=1,
+                        cluster_id=None, embedding=embedding)
+        for i, embedding in enumerate(embeddings)
+    ]
+    monkeypatch.setattr(explorer, "embed_for_session", lambda text, session=None: query.tolist())
+
+    papers = explorer.get_diverse_papers(_PaperDb(has_cluster_column=False, rows=rows), "robotics", [], limit=4)
+
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    relevance = unit @ (query / np.linalg.norm(query))
+    lambda_ = explorer.EXPLORE_DIVERSITY_LAMBDA
+    expected = []
+    while len(expected) < 4:
+        def score(i):
+            if not expected:
+                return relevance[i]
+            return lambda_ * relevance[i] - (1 - lambda_) * max(unit[i] @ unit[j] for j in expected)
+        expected.append(max((i for i in range(len(rows)) if i not in expected), key=score))
+
+    assert [paper.id for paper in papers] == [100 + i for i in expected]
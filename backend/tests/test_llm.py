@@ -0,0 +1,17 @@
+from app.services import request_log
+from app.services.llm import LocalLLMClient, _TimedClient
+
+
+def test_streamed_calls_are_timed_as_llm_stage():
+    """Test that messages.stream is recorded in the request's "llm" stage like messages.create."""
+    record = {"stages": {}, "fields": {}}
+    token = request_log._current_record.set(record)
+    try:
+        client = _TimedClient(LocalLLMClient())
+        with client.messages.stream(model="m", max_tokens=10, messages=[{"role": "user", "content": "hi"}]) as stream:
+            text = "".join(stream.text_stream)
+    finally:
+        request_log._current_record.reset(token)
+
+    assert text
+    assert "llm" in record["stages"]
@@ -0,0 +1,41 @@
+import numpy as np
+
+from app.services.neighbors import compute_nearest_neighbors
+
+
+def _brute_force_neighbors(embeddings: np.ndarray, k: int):
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    indices, similarities = [], []
+    for i, row in enumerate(unit):
+        sims = {j: float(row @ other) for j, other in enumerate(unit) if j != i}
+        best = sorted(sims, key=sims.get, reverse=True)[:k]
+        indices.append(best)
+        similarities.append([sims[j] for j in best])
+    return np.array(indices), np.array(similarities)
+
+
+def test_batched_neighbors_match_brute_force():
+    """Test that batched top-k neighbors across uneven batches equal an exhaustive search."""
+    embeddings = np.random.default_rng(0).standard_normal((50, 16))
+
+    indices, similarities = compute_nearest_neighbors(embeddings, k=5, batch_size=16)
+    expected_indices, expected_similarities = _brute_force_neighbors(embeddings, k=5)
+
+    assert indices.shape == (50, 5)
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(similarities, expected_similarities, atol=1e-5)
+
+
+def test_a_row_is_never_its_own_neighbor():
+    """Test that self matches are excluded even when a row has an identical duplicate."""
+    embeddings = np.random.default_rng(1).standard_normal((6, 8))
+    embeddings[3] = embeddings[0]
+
+    indices, similarities = compute_nearest_neighbors(embeddings, k=10, batch_size=4)
+
+    assert indices.shape == (6, 5)
+    for row, neighbors in enumerate(indices):
+        assert row not in neighbors
+        assert sorted(neighbors.tolist()) == [i for i in range(6) if i != row]
+    assert indices[0, 0] == 3 and indices[3, 0] == 0
+    np.testing.assert_allclose(similarities[0, 0], 1.0, atol=1e-6)
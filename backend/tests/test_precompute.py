@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+import pytest
+
+from app.schemas import SearchRequest, SearchResult
+from app.services import precompute
+from app.services.precompute import PRECOMPUTED_RESULT_LIMIT, get_recent_results, precompute_key, remember_results
+
+
+@pytest.fixture(autouse=True)
+def fresh_recent_results(monkeypatch):
+    monkeypatch.setattr(precompute, "_recent_results", OrderedDict())
+
+
+def _results(count):
+    return [
+        SearchResult(
+            faculty={"id": i, "name": f"Prof {i}", "affiliation": None, "h_index": None,
+                     "paper_count": None, "semantic_scholar_id": None},
+            similarity=1.0 - i / 100,
+        )
+        for i in range(count)
+    ]
+
+
+def test_key_ignores_case_punctuation_and_university_order():
+    """Test that equivalent queries and reordered filters share a key."""
+    first = SearchRequest(query="Robot  Learning!", universities=["MIT", "CMU"])
+    second = SearchRequest(query="robot learning", universities=["CMU", "MIT"])
+
+    assert precompute_key(first) == precompute_key(second)
+
+
+def test_key_excludes_limit_but_not_other_options():
+    """Test that limit never changes the key while search options do."""
+    base = SearchRequest(query="robot learning")
+
+    assert precompute_key(base) == precompute_key(SearchRequest(query="robot learning", limit=5))
+    assert precompute_key(base) != precompute_key(SearchRequest(query="robot learning", diversify=True))
+    assert precompute_key(base) != precompute_key(SearchRequest(query="robot learning", min_h_index=10))
+
+
+def test_remembered_results_are_truncated():
+    """Test that at most PRECOMPUTED_RESULT_LIMIT results are kept and served up to the request limit."""
+    remember_results(SearchRequest(query="robotics", limit=50), _results(PRECOMPUTED_RESULT_LIMIT + 10))
+
+    assert len(get_recent_results(SearchRequest(query="robotics", limit=PRECOMPUTED_RESULT_LIMIT))) == PRECOMPUTED_RESULT_LIMIT
+    assert [r.faculty.id for r in get_recent_results(SearchRequest(query="robotics", limit=3))] == [0, 1, 2]
+    assert get_recent_results(SearchRequest(query="robotics", limit=PRECOMPUTED_RESULT_LIMIT + 1)) is None
+
+
+def test_recent_results_evict_least_recently_used(monkeypatch):
+    """Test that the recent-results cache drops the entry that was used longest ago."""
+    monkeypatch.setattr(precompute, "RECENT_RESULTS_CACHE_SIZE", 2)
+
+    remember_results(SearchRequest(query="robotics"), _results(10))
+    remember_results(SearchRequest(query="vision"), _results(10))
+    assert get_recent_results(SearchRequest(query="robotics")) is not None
+    remember_results(SearchRequest(query="language"), _results(10))
+
+    assert get_recent_results(SearchRequest(query="vision")) is None
+    assert get_recent_results(SearchRequest(query="robotics")) is not None
+    assert get_recent_results(SearchRequest(query="language")) is not None
@@ -1,7 +1,10 @@
 """Tests for query expansion service."""
 
+import random
+import time
+
 import pytest
-from app.services.query_expansion import expand_query
+from app.services.query_expansion import QueryExpansionEngine, expand_query, load_dictionary
 
 
 def test_expand_single_abbreviation():
@@ -73,3 +76,117 @@ def test_multiple_same_abbreviation():
     # Should only add "machine learning" once at the end
     count = result.count("machine learning")
     assert count == 1
+
+
+def test_mixed_case_dictionary_terms():
+    """Test that dictionary terms with mixed case (fMRI, LiDAR) match any casing."""
+    assert "functional magnetic resonance imaging" in expand_query("FMRI studies")
+    assert "light detection and ranging" in expand_query("lidar perception")
+
+
+def test_multi_word_phrase_expansion():
+    """Test that multi-word phrases are matched on consecutive words."""
+    result = expand_query("Self-driving and self driving cars")
+    assert "autonomous driving" in result
+
+    result = expand_query("protein folding with deep nets")
+    assert "protein structure prediction" in result
+
+
+def test_phrase_requires_consecutive_words():
+    """Test that phrase words separated by other words do not match."""
+    assert expand_query("protein misfolding and folding") == "protein misfolding and folding"
+
+
+def test_overlapping_phrases_all_match():
+    """Test that overlapping dictionary phrases are all expanded in one pass."""
+    engine = QueryExpansionEngine([
+        ("graph neural networks", ["geometric deep learning"]),
+        ("neural networks", ["deep learning"]),
+        ("networks", ["graphs"]),
+    ])
+    assert engine.find_expansions("scalable graph neural networks") == {
+        "geometric deep learning", "deep learning", "graphs"
+    }
+
+
+def test_multiple_expansions_per_term():
+    """Test that a term can carry several pipe-separated expansions."""
+    result = expand_query("privacy preserving analytics")
+    assert "differential privacy" in result
+    assert "secure computation" in result
+
+
+def test_load_dictionary_file(tmp_path):
+    """Test loading a dictionary file with comments and blank lines."""
+    path = tmp_path / "dictionary.tsv"
+    path.write_text("# comment\n\nGNN\tgraph neural network\nlow rank\tmatrix factorization|sparse\n")
+
+    engine = QueryExpansionEngine.from_file(path)
+
+    assert engine.size == 2
+    assert engine.expand("gnn") == "gnn graph neural network"
+    assert engine.expand("low rank models") == "low rank models matrix factorization sparse"
+
+
+def test_malformed_dictionary_line(tmp_path):
+    """Test that a line without a tab separator is rejected with its location."""
+    path = tmp_path / "dictionary.tsv"
+    path.write_text("GNN graph neural network\n")
+
+    with pytest.raises(ValueError, match="dictionary.tsv:1"):
+        load_dictionary(path)
+
+
+def _large_engine(entry_count: int):
+    rng = random.Random(0)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    entries = [
+        (" ".join(rng.choices(vocabulary, k=rng.randint(1, 3))), [f"expansion {i}"])
+        for i in range(entry_count)
+    ]
+    return QueryExpansionEngine(entries), vocabulary, rng
+
+
+@pytest.mark.benchmark
+def test_throughput_large_dictionary():
+    """Test that uncached expansion stays sub-millisecond with 50k dictionary entries."""
+    engine, vocabulary, rng = _large_engine(50_000)
+    queries = [" ".join(rng.choices(vocabulary, k=12)) for _ in range(2000)]
+
+    start = time.perf_counter()
+    for query in queries:
+        engine.expand(query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+
+    assert elapsed < 0.001
+
+
+def test_repeated_queries_are_memoized():
+    """Test that repeated head queries are served from the memo cache with identical results."""
+    engine, vocabulary, rng = _large_engine(50_000)
+    head_queries = [" ".join(rng.choices(vocabulary, k=12)) for _ in range(50)]
+
+    first = [engine.expand(query) for query in head_queries]
+    for _ in range(3):
+        assert [engine.expand(query) for query in head_queries] == first
+
+    assert engine.expand.cache_info().hits >= 3 * len(head_queries)
+
+
+@pytest.mark.benchmark
+def test_throughput_memoized_queries():
+    """Benchmark that memoized head queries take a few microseconds."""
+    engine, vocabulary, rng = _large_engine(50_000)
+    head_queries = [" ".join(rng.choices(vocabulary, k=12)) for _ in range(50)]
+
+    for query in head_queries:
+        engine.expand(query)
+
+    start = time.perf_counter()
+    for _ in range(200):
+        for query in head_queries:
+            engine.expand(query)
+    elapsed = (time.perf_counter() - start) / (200 * len(head_queries))
+
+    assert elapsed < 0.00005
@@ -0,0 +1,42 @@
+"""
+Query plan regression tests. They need a reachable Postgres database with the
+schema and indexes applied (DATABASE_URL) and are skipped otherwise.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import engine
+from app.services.embeddings import EMBEDDING_DIMENSIONS
+from app.services.explorer import FACULTY_MATCH_SQL
+
+
+@pytest.fixture
+def connection():
+    try:
+        conn = engine.connect()
+    except OperationalError:
+        pytest.skip("Postgres is not available")
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _explain(conn, sql: str, params: dict) -> str:
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    rows = conn.execute(text(f"EXPLAIN {sql}"), params).fetchall()
+    return "\n".join(row[0] for row in rows)
+
+
+def test_faculty_match_key_paper_uses_index(connection):
+    """Test that the key paper lookup is a per-faculty index scan, not a window over all papers."""
+    plan = _explain(
+        connection,
+        FACULTY_MATCH_SQL,
+        {"embedding": str([0.0] * EMBEDDING_DIMENSIONS), "limit": 20},
+    )
+
+    assert "WindowAgg" not in plan
+    assert "idx_papers_faculty_citations" in plan
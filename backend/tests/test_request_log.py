@@ -0,0 +1,26 @@
+import json
+import threading
+
+from app.services import request_log
+
+
+def test_records_are_written_by_background_thread(monkeypatch, tmp_path):
+    """Test that queued records are appended to the log file off the calling thread, in order."""
+    path = tmp_path / "queries.jsonl"
+    monkeypatch.setattr(request_log, "QUERY_LOG_PATH", str(path))
+    writer_threads = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        writer_threads.append(threading.current_thread().name)
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+
+    for i in range(3):
+        request_log._write_record({"path": "/api/search", "n": i})
+    request_log.flush_request_log()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["n"] for record in lines] == [0, 1, 2]
+    assert writer_threads and set(writer_threads) == {"request-log-writer"}
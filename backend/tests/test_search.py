@@ -0,0 +1,202 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.routers import search as search_router
+from app.services import search
+
+
+class _PaperHitsDb:
+    """Stand-in session returning fixed paper-hit rows, already sorted by similarity."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, statement, params=None):
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+class _SearchDb:
+    """
+    Stand-in session for hybrid search. `vector` maps an embedding (as sent to
+    Postgres) and `fulltext` maps a query text to ranked faculty ids.
+    """
+
+    def __init__(self, vector, fulltext, embeddings=None):
+        self.vector = vector
+        self.fulltext = fulltext
+        self.embeddings = embeddings or {}
+
+    def _faculty(self, faculty_id):
+        return SimpleNamespace(
+            id=faculty_id, name=f"Prof {faculty_id}", affiliation="MIT", h_index=10, paper_count=5,
+            semantic_scholar_id=None, research_tags=[], embedding=self.embeddings.get(faculty_id),
+        )
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "unnest(CAST(:embeddings" in sql:
+            rows = [SimpleNamespace(query_index=i, id=fid)
+                    for i, e in enumerate(params["embeddings"], 1) for fid in self.vector[e]]
+        elif "unnest(CAST(:queries" in sql:
+            rows = [SimpleNamespace(query_index=i, id=fid)
+                    for i, q in enumerate(params["queries"], 1) for fid in self.fulltext[q]]
+        elif "id = ANY(:faculty_ids)" in sql:
+            rows = [self._faculty(fid) for fid in params["faculty_ids"]]
+        elif "websearch_to_tsquery('english', :query)" in sql:
+            rows = [SimpleNamespace(id=fid, rank=1.0 / rank)
+                    for rank, fid in enumerate(self.fulltext[params["query"]], 1)]
+        else:
+            rows = [SimpleNamespace(id=fid) for fid in self.vector[params["embedding"]]]
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+@pytest.fixture
+def no_papers(monkeypatch):
+    monkeypatch.setattr(search, "_fetch_top_papers", lambda db, faculty_ids: {})
+
+
+def _hit(faculty_id, paper_id, similarity, citation_count=0):
+    return SimpleNamespace(
+        paper_id=paper_id, title=f"Paper {paper_id}", year=2024, venue=None,
+        citation_count=citation_count, similarity=similarity,
+        id=faculty_id, name=f"Prof {faculty_id}", affiliation="MIT", h_index=10, paper_count=5,
+        semantic_scholar_id=None, research_tags=[],
+    )
+
+
+def _rank(rows, aggregation, limit=10):
+    results = search.search_faculty_by_papers(_PaperHitsDb(rows), [0.0], limit=limit, aggregation=aggregation)
+    return [(r.faculty.id, r.similarity) for r in results]
+
+
+def test_max_aggregation_breaks_ties_by_best_hit_order():
+    """Test that faculty with equal best hits keep the order in which their first hit was returned."""
+    rows = [_hit(1, 10, 0.9), _hit(2, 20, 0.9), _hit(2, 21, 0.85), _hit(3, 30, 0.7)]
+
+    assert _rank(rows, "max") == [(1, 0.9), (2, 0.9), (3, 0.7)]
+    assert [faculty_id for faculty_id, _ in _rank([rows[1], rows[0], rows[2], rows[3]], "max")] == [2, 1, 3]
+
+
+def test_top3_mean_penalizes_faculty_with_fewer_than_three_hits():
+    """Test that top3_mean always divides by three, so one lucky hit loses to several good ones."""
+    rows = [
+        _hit(1, 10, 0.95),
+        _hit(3, 30, 0.9), _hit(3, 31, 0.8),
+        _hit(2, 20, 0.6), _hit(2, 21, 0.6), _hit(2, 22, 0.6), _hit(2, 23, 0.1),
+    ]
+
+    ranked = _rank(rows, "top3_mean")
+
+    assert [faculty_id for faculty_id, _ in ranked] == [2, 3, 1]
+    assert [score for _, score in ranked] == pytest.approx([0.6, 1.7 / 3, 0.95 / 3])
+
+
+def test_citation_weighted_favours_highly_cited_hits():
+    """Test that a well-cited weaker hit pulls a faculty member's score toward it."""
+    rows = [_hit(1, 10, 0.9, citation_count=0), _hit(2, 20, 0.7), _hit(1, 11, 0.5, citation_count=1000)]
+
+    ranked = _rank(rows, "citation_weighted")
+
+    heavy = 1.0 + math.log1p(1000)
+    assert ranked == [(2, 0.7), (1, pytest.approx((0.9 + 0.5 * heavy) / (1.0 + heavy)))]
+    assert [faculty_id for faculty_id, _ in _rank(rows, "max")] == [1, 2]
+
+
+def test_paper_search_respects_limit_and_evidence_cap():
+    """Test that only `limit` faculty are returned, each with at most MAX_PAPERS_PER_FACULTY papers."""
+    rows = [_hit(1, 10 + i, 0.9 - i * 0.01) for i in range(search.MAX_PAPERS_PER_FACULTY + 2)]
+    rows += [_hit(2, 20, 0.5), _hit(3, 30, 0.4)]
+
+    results = search.search_faculty_by_papers(_PaperHitsDb(rows), [0.0], limit=2, aggregation="max")
+
+    assert [r.faculty.id for r in results] == [1, 2]
+    assert len(results[0].papers) == search.MAX_PAPERS_PER_FACULTY
+
+
+def test_unknown_paper_aggregation_is_rejected():
+    """Test that an unsupported aggregation raises before touching the database."""
+    with pytest.raises(ValueError):
+        search.search_faculty_by_papers(None, [0.0], aggregation="median")
+
+
+def test_fuse_rrf_rewards_ids_found_by_both_retrievers():
+    """Test that RRF sums 1 / (k + rank) over both lists, so agreement outranks a single top hit."""
+    scores = search._fuse_rrf([1, 2, 3], [3, 4], k=60)
+
+    assert scores == pytest.approx({1: 1 / 61, 2: 1 / 62, 3: 1 / 63 + 1 / 61, 4: 1 / 62})
+    assert sorted(scores, key=scores.get, reverse=True) == [3, 1, 2, 4]
+    assert search._fuse_rrf([], []) == {}
+
+
+def _batch_db():
+    return _SearchDb(
+        vector={"[0.0]": [1, 2, 3], "[1.0]": [4, 5], "[2.0]": []},
+        fulltext={"robots": [3, 2, 6], "vision": [1, 4], "nothing": []},
+    )
+
+
+def test_batch_search_matches_per_query_hybrid_search(no_papers):
+    """Test that each batch result list equals running search_faculty_hybrid for that query alone."""
+    db = _batch_db()
+    queries = ["robots", "vision", "nothing"]
+    embeddings = [[0.0], [1.0], [2.0]]
+
+    batch = search.search_faculty_hybrid_batch(db, queries, embeddings, limit=3)
+
+    assert len(batch) == len(queries)
+    for query, embedding, results in zip(queries, embeddings, batch):
+        single = search.search_faculty_hybrid(db, query, embedding, limit=3)
+        assert [(r.faculty.id, r.similarity) for r in results] == [(r.faculty.id, r.similarity) for r in single]
+    assert batch[2] == []
+
+
+def test_batch_endpoint_groups_results_per_query_in_input_order(monkeypatch, no_papers):
+    """Test that /batch returns one entry per input query, in order, each with that query's results."""
+    db = _batch_db()
+    embeddings = {"robots": [0.0], "vision": [1.0], "nothing": [2.0]}
+    monkeypatch.setattr(search_router, "expand_query", lambda query: query)
+    monkeypatch.setattr(search_router, "get_embeddings", lambda texts: [embeddings[t] for t in texts])
+
+    app = FastAPI()
+    app.state.limiter = search_router.limiter
+    app.include_router(search_router.router, prefix="/api/search")
+    app.dependency_overrides[get_db] = lambda: db
+
+    response = TestClient(app).post("/api/search/batch", json={"queries": ["vision", "nothing", "robots"], "limit": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [entry["query"] for entry in body] == ["vision", "nothing", "robots"]
+    assert [[r["faculty"]["id"] for r in entry["results"]] for entry in body] == [[4, 1], [], [3, 2]]
+
+
+def test_diversify_reranks_with_embeddings_and_keeps_limit(monkeypatch, no_papers):
+    """Test that diversify=True loads embeddings with the details and swaps a near-duplicate for a distinct pick."""
+    basis = np.eye(search.EMBEDDING_DIMENSIONS, dtype=np.float32)
+    db = _SearchDb(
+        vector={"[0.0]": [1, 2, 3, 4, 5, 6, 7]},
+        fulltext={"robots": [1, 2, 3]},
+        embeddings={1: basis[0], 2: basis[0], 3: basis[1], 4: basis[2], 5: basis[3], 6: basis[4], 7: basis[5]},
+    )
+    detail_calls = []
+    fetch_details = search._fetch_faculty_details
+
+    def spy(db, faculty_ids, with_embedding=False):
+        detail_calls.append((list(faculty_ids), with_embedding))
+        return fetch_details(db, faculty_ids, with_embedding=with_embedding)
+
+    monkeypatch.setattr(search, "_fetch_faculty_details", spy)
+
+    plain = search.search_faculty_hybrid(db, "robots", [0.0], limit=2)
+    diverse = search.search_faculty_hybrid(db, "robots", [0.0], limit=2, diversify=True, mmr_lambda=0.7)
+
+    assert [r.faculty.id for r in plain] == [1, 2]
+    assert [r.faculty.id for r in diverse] == [1, 3]
+    assert detail_calls[0] == ([1, 2], False)
+    assert detail_calls[1] == ([1, 2, 3, 4, 5, 6], True)
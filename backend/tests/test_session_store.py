@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.session_store import (
+    MemorySessionStore, SessionConflictError, SessionStore, SqliteSessionStore
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SqliteSessionStore(str(tmp_path / "sessions.db"))
+    return MemorySessionStore()
+
+
+def _expires(seconds: float = 3600) -> datetime:
+    return datetime.now() + timedelta(seconds=seconds)
+
+
+def test_round_trip_and_version_bump(store):
+    """Test that saved state is returned with an incremented version."""
+    version = store.create("s1", {"rounds": 0}, _expires())
+    assert store.get("s1") == ({"rounds": 0}, version)
+
+    new_version = store.save("s1", {"rounds": 1}, version, _expires())
+    assert new_version == version + 1
+    assert store.get("s1") == ({"rounds": 1}, new_version)
+
+
+def test_stale_save_conflicts(store):
+    """Test that saving from an outdated read raises SessionConflictError."""
+    version = store.create("s1", {"rounds": 0}, _expires())
+    store.save("s1", {"rounds": 1}, version, _expires())
+
+    with pytest.raises(SessionConflictError):
+        store.save("s1", {"rounds": 2}, version, _expires())
+    assert store.get("s1")[0] == {"rounds": 1}
+
+
+def test_expired_sessions_are_hidden_and_purged(store):
+    """Test that expired sessions are not returned and are removed by purge_expired."""
+    store.create("old", {}, _expires(-1))
+    store.create("new", {}, _expires())
+
+    assert store.get("old") is None
+    assert store.purge_expired() <= 1
+    assert store.get("new") is not None
+
+
+def test_delete(store):
+    """Test that deleted sessions are gone."""
+    store.create("s1", {}, _expires())
+    store.delete("s1")
+    assert store.get("s1") is None
+
+
+def test_memory_store_evicts_least_recently_used():
+    """Test that the memory store stays within capacity by evicting the LRU session."""
+    store = MemorySessionStore(capacity=2)
+    store.create("a", {"n": 1}, _expires())
+    store.create("b", {"n": 2}, _expires())
+    store.get("a")
+    store.create("c", {"n": 3}, _expires())
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.stats()["sessions"] == 2
+
+
+def test_memory_store_tracks_bytes():
+    """Test that approximate bytes follow creates, saves and deletes."""
+    store = MemorySessionStore()
+    version = store.create("a", {"text": "x" * 100}, _expires())
+    created = store.stats()["approx_bytes"]
+    assert created > 100
+
+    store.save("a", {"text": "x" * 200}, version, _expires())
+    assert store.stats()["approx_bytes"] == created + 100
+
+    store.delete("a")
+    assert store.stats() == {"sessions": 0, "approx_bytes": 0}
+
+
+def test_store_backends_must_implement_every_method():
+    """Test that a backend missing part of the SessionStore interface cannot be instantiated."""
+    class Incomplete(SessionStore):
+        def create(self, session_id, state, expires_at):
+            return 0
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,72 @@
+"""Tests for the type-ahead suggestion index."""
+
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+
+from app.services import suggest
+from app.services.suggest import SuggestionEntry, SuggestionIndex
+
+
+def _index():
+    return SuggestionIndex([
+        SuggestionEntry(text="Machine Learning", kind="tag", weight=40),
+        SuggestionEntry(text="Learning Theory", kind="tag", weight=5),
+        SuggestionEntry(text="Robotics", kind="tag", weight=12),
+        SuggestionEntry(text="Regina Barzilay", kind="faculty", weight=70, faculty_id=1),
+        SuggestionEntry(text="Michael I. Jordan", kind="faculty", weight=150, faculty_id=2),
+    ])
+
+
+def test_prefix_of_full_text():
+    """Test that a leading prefix matches the entry."""
+    results = _index().lookup("rob", 5)
+    assert [r.text for r in results] == ["Robotics"]
+
+
+def test_word_prefix_matches_later_words():
+    """Test that prefixes match the start of any word, full-text matches first."""
+    results = _index().lookup("lear", 5)
+    assert [r.text for r in results] == ["Learning Theory", "Machine Learning"]
+
+
+def test_case_and_whitespace_insensitive():
+    """Test that lookups ignore case and extra whitespace."""
+    results = _index().lookup("  MICHAEL  i", 5)
+    assert [r.faculty_id for r in results] == [2]
+
+
+def test_tags_rank_before_faculty():
+    """Test that tags are suggested before faculty names for the same match type."""
+    results = _index().lookup("r", 5)
+    assert [r.kind for r in results] == ["tag", "faculty"]
+
+
+def test_limit_and_no_match():
+    """Test that the limit is respected and unknown prefixes return nothing."""
+    assert len(_index().lookup("l", 1)) == 1
+    assert _index().lookup("zzz", 5) == ()
+
+
+def test_stale_index_is_rebuilt_in_the_background(monkeypatch):
+    """Test that lookups keep using the stale index until the background rebuild swaps in."""
+    stale, fresh = _index(), SuggestionIndex([])
+    release = threading.Event()
+
+    def build(db):
+        release.wait(5)
+        return fresh
+
+    monkeypatch.setattr(suggest, "SessionLocal", nullcontext)
+    monkeypatch.setattr(suggest, "build_suggestion_index", build)
+    monkeypatch.setattr(suggest, "_index", stale)
+    monkeypatch.setattr(suggest, "_index_built_at", datetime.now() - suggest.SUGGESTION_INDEX_TTL * 2)
+    monkeypatch.setattr(suggest, "_rebuild_thread", None)
+
+    assert [r.text for r in suggest.suggest(db=None, prefix="rob")] == ["Robotics"]
+    rebuild = suggest._rebuild_thread
+    assert suggest.get_suggestion_index(db=None) is stale
+
+    release.set()
+    rebuild.join(5)
+    assert suggest.suggest(db=None, prefix="rob") == []
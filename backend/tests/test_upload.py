@@ -0,0 +1,140 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
+import fitz
+import httpx
+from fastapi import FastAPI
+
+from app.database import get_db
+from app.routers import health, upload
+from app.services import embeddings
+from app.services import cv_parser
+
+STEP_SECONDS = 0.3
+CONCURRENT_UPLOADS = 4
+
+
+def _test_app() -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = upload.limiter
+    app.include_router(upload.router, prefix="/api/upload")
+    app.include_router(health.router)
+    app.dependency_overrides[get_db] = lambda: None
+    return app
+
+
+def _slow_pipeline(monkeypatch):
+    """Make every pipeline step take STEP_SECONDS, blocking where the real step blocks."""
+    def extract_text(file_bytes, filename):
+        time.sleep(STEP_SECONDS)
+        return "Graduate work on legged robot locomotion."
+
+    async def summarize(cv_text):
+        await asyncio.sleep(STEP_SECONDS)
+        return "Robotics and locomotion."
+
+    async def embed(text):
+        await asyncio.sleep(STEP_SECONDS)
+        return [0.0] * 3
+
+    def search(**kwargs):
+        time.sleep(STEP_SECONDS)
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=CONCURRENT_UPLOADS)
+    monkeypatch.setattr(cv_parser, "extract_text", extract_text)
+    monkeypatch.setattr(cv_parser, "_get_extraction_executor", lambda: executor)
+    monkeypatch.setattr(upload, "summarize_research_interests", summarize)
+    monkeypatch.setattr(upload, "get_embedding_async", embed)
+    monkeypatch.setattr(upload, "search_faculty_by_embedding", search)
+
+
+def test_health_stays_fast_during_cv_uploads(monkeypatch):
+    """Test that /health answers promptly while several slow CV uploads are in flight."""
+    _slow_pipeline(monkeypatch)
+    upload_statuses = []
+    health_times = []
+
+    async def run():
+        transport = httpx.ASGITransport(app=_test_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async def post_cv():
+                response = await client.post(
+                    "/api/upload/cv",
+                    files={"file": ("cv.pdf", b"%PDF-1.4", "application/pdf")},
+                )
+                upload_statuses.append(response.status_code)
+
+            async def poll_health():
+                while True:
+                    uploads_done = len(upload_statuses) == CONCURRENT_UPLOADS
+                    response = await client.get("/health")
+                    assert response.status_code == 200
+                    health_times.append(time.perf_counter())
+                    if uploads_done:
+                        break
+                    await anyio.sleep(0.02)
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(CONCURRENT_UPLOADS):
+                    tg.start_soon(post_cv)
+                tg.start_soon(poll_health)
+
+    anyio.run(run)
+
+    assert upload_statuses == [200] * CONCURRENT_UPLOADS
+    # Any step run on the event loop would leave a gap of at least STEP_SECONDS between health checks.
+    gaps = [later - earlier for earlier, later in zip(health_times, health_times[1:])]
+    assert len(gaps) > 10
+    assert max(gaps) < STEP_SECONDS / 2
+
+
+def test_upload_falls_back_to_fulltext_when_embeddings_fail(monkeypatch):
+    """Test that a failing embedding provider degrades the upload to full-text search."""
+    async def summarize(cv_text):
+        return "Robotics and locomotion."
+
+    async def failing_embedding(text):
+        raise RuntimeError("provider down")
+
+    def vector_search(**kwargs):
+        raise AssertionError("vector search should not run without an embedding")
+
+    fulltext_queries = []
+    monkeypatch.setattr(embeddings, "_breaker", embeddings.CircuitBreaker())
+    monkeypatch.setattr(embeddings, "_create_embedding_async", failing_embedding)
+    monkeypatch.setattr(cv_parser, "extract_text", lambda file_bytes, filename: "Legged robots.")
+    monkeypatch.setattr(cv_parser, "_get_extraction_executor", lambda: ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(upload, "summarize_research_interests", summarize)
+    monkeypatch.setattr(upload, "search_faculty_by_embedding", vector_search)
+    monkeypatch.setattr(
+        upload, "search_faculty_fulltext_only", lambda **kwargs: fulltext_queries.append(kwargs["query"]) or []
+    )
+
+    async def run():
+        transport = httpx.ASGITransport(app=_test_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/api/upload/cv",
+                files={"file": ("cv.pdf", b"%PDF-1.4", "application/pdf")},
+            )
+
+    response = anyio.run(run)
+
+    assert response.status_code == 200
+    assert response.headers["X-Search-Degraded"] == "true"
+    assert fulltext_queries == ["Robotics and locomotion."]
+
+
+def test_extract_text_async_parses_pdf_in_worker_process():
+    """Test that PDF text extraction works through the worker process pool."""
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Reinforcement learning for robot control")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    text = anyio.run(cv_parser.extract_text_async, pdf_bytes, "cv.pdf")
+
+    assert "Reinforcement learning" in text
@@ -6,7 +6,7 @@ import { Textarea } from '@/components/ui/textarea';
 import { Input } from '@/components/ui/input';
 import { Card, CardHeader, CardContent } from '@/components/ui/card';
 import { Skeleton } from '@/components/ui/skeleton';
-import { PaperCard } from '@/components/PaperCard';
+import { PaperCard, PaperFeedback } from '@/components/PaperCard';
 import { DirectionSummary } from '@/components/DirectionSummary';
 import {
   Dialog,
@@ -20,8 +20,8 @@ import {
   ExplorePaper,
   ExploreFinishResponse,
   startExploration,
-  respondToExploration,
-  finishExploration,
+  respondToExplorationStream,
+  finishExplorationStream,
 } from '@/lib/api';
 import { Loader2, Send, RotateCcw, Users, ArrowRight, FileQuestion } from 'lucide-react';
 
@@ -61,8 +61,10 @@ export function ChatExplorer() {
   const [sessionId, setSessionId] = useState<string | null>(null);
   const [initialInterest, setInitialInterest] = useState('');
   const [papers, setPapers] = useState<ExplorePaper[]>([]);
+  const [previewPapers, setPreviewPapers] = useState<ExplorePaper[] | null>(null);
   const [prompt, setPrompt] = useState('');
   const [userResponse, setUserResponse] = useState('');
+  const [feedback, setFeedback] = useState<Record<number, PaperFeedback>>({});
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [result, setResult] = useState<ExploreFinishResponse | null>(null);
@@ -93,17 +95,49 @@ export function ChatExplorer() {
     }
   };
 
+  const hasFeedback = Object.keys(feedback).length > 0;
+
+  const handleFeedback = (paperId: number, value: PaperFeedback | null) => {
+    setFeedback((prev) => {
+      const next = { ...prev };
+      if (value) {
+        next[paperId] = value;
+      } else {
+        delete next[paperId];
+      }
+      return next;
+    });
+  };
+
+  const describeFeedback = () => {
+    const titles = (value: PaperFeedback) =>
+      papers.filter((paper) => feedback[paper.id] === value).map((paper) => `"${paper.title}"`);
+    const parts: string[] = [];
+    if (titles('liked').length > 0) parts.push(`I liked ${titles('liked').join(', ')}.`);
+    if (titles('disliked').length > 0) parts.push(`I'm not interested in ${titles('disliked').join(', ')}.`);
+    return parts.join(' ').slice(0, 2000);
+  };
+
   const handleRespond = async () => {
-    if (!sessionId || !userResponse.trim()) return;
+    if (!sessionId || (!userResponse.trim() && !hasFeedback)) return;
 
     setLoading(true);
     setError(null);
 
+    const paperIds = (value: PaperFeedback) =>
+      papers.filter((paper) => feedback[paper.id] === value).map((paper) => paper.id);
+
     try {
-      const response = await respondToExploration(sessionId, userResponse);
+      const response = await respondToExplorationStream(
+        sessionId,
+        userResponse.trim() || describeFeedback(),
+        { liked_paper_ids: paperIds('liked'), disliked_paper_ids: paperIds('disliked') },
+        { onSpeculativePapers: (preview) => setPreviewPapers(preview.length > 0 ? preview : null) }
+      );
       setPapers(response.papers);
       setPrompt(response.prompt);
       setUserResponse('');
+      setFeedback({});
       setRound((r) => r + 1);
 
       if (response.is_ready) {
@@ -112,6 +146,7 @@ export function ChatExplorer() {
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to process response');
     } finally {
+      setPreviewPapers(null);
       setLoading(false);
     }
   };
@@ -123,7 +158,12 @@ export function ChatExplorer() {
     setError(null);
 
     try {
-      const response = await finishExploration(sessionId);
+      const response = await finishExplorationStream(sessionId, {
+        onUpdate: (partial) => {
+          setResult(partial);
+          setState('finished');
+        },
+      });
       setResult(response);
       setState('finished');
     } catch (err) {
@@ -140,6 +180,7 @@ export function ChatExplorer() {
     setPapers([]);
     setPrompt('');
     setUserResponse('');
+    setFeedback({});
     setResult(null);
     setRound(0);
     setError(null);
@@ -208,7 +249,7 @@ export function ChatExplorer() {
   if (state === 'finished' && result) {
     return (
       <div className="space-y-6">
-        {result.faculty_matches.length === 0 ? (
+        {result.faculty_matches.length === 0 && !loading ? (
           <div className="space-y-6">
             <Card className="border-primary/20 bg-primary/5">
               <CardHeader>
@@ -228,7 +269,7 @@ export function ChatExplorer() {
             </div>
           </div>
         ) : (
-          <DirectionSummary result={result} />
+          <DirectionSummary result={result} sessionId={sessionId} />
         )}
 
         <div className="flex justify-center">
@@ -254,14 +295,14 @@ export function ChatExplorer() {
       </div>
 
       <div className="grid gap-4 md:grid-cols-2">
-        {loading ? (
+        {loading && !previewPapers ? (
           <>
             <PaperCardSkeleton />
             <PaperCardSkeleton />
             <PaperCardSkeleton />
             <PaperCardSkeleton />
           </>
-        ) : papers.length === 0 ? (
+        ) : (previewPapers ?? papers).length === 0 ? (
           <div className="col-span-2 flex flex-col items-center justify-center py-12 text-center">
             <FileQuestion className="h-12 w-12 text-muted-foreground mb-4" />
             <p className="text-muted-foreground">
@@ -269,15 +310,21 @@ export function ChatExplorer() {
             </p>
           </div>
         ) : (
-          papers.map((paper, index) => (
-            <PaperCard key={paper.id} paper={paper} index={index} />
+          (previewPapers ?? papers).map((paper, index) => (
+            <PaperCard
+              key={paper.id}
+              paper={paper}
+              index={index}
+              feedback={feedback[paper.id] ?? null}
+              onFeedback={previewPapers ? undefined : (value) => handleFeedback(paper.id, value)}
+            />
           ))
         )}
       </div>
 
       <div className="space-y-3">
         <Textarea
-          placeholder="Share your thoughts... Which papers interest you? What aspects draw you in? What's missing?"
+          placeholder="Share your thoughts or rate the papers... Which papers interest you? What aspects draw you in? What's missing?"
           value={userResponse}
           onChange={(e) => setUserResponse(e.target.value)}
           onKeyDown={handleKeyDown}
@@ -291,7 +338,7 @@ export function ChatExplorer() {
         <div className="flex flex-wrap gap-2">
           <Button
             onClick={handleRespond}
-            disabled={loading || !userResponse.trim()}
+            disabled={loading || (!userResponse.trim() && !hasFeedback)}
           >
             {loading ? (
               <>
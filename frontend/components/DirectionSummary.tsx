@@ -1,16 +1,36 @@
 'use client';
 
+import { useState } from 'react';
+import { Button } from '@/components/ui/button';
 import { Card, CardHeader, CardContent } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Separator } from '@/components/ui/separator';
-import { ExploreFinishResponse } from '@/lib/api';
-import { Target, User, FileText, ExternalLink, Info } from 'lucide-react';
+import { ExploreFinishResponse, explainFacultyMatch } from '@/lib/api';
+import { Target, User, FileText, ExternalLink, Info, Loader2 } from 'lucide-react';
 
 interface DirectionSummaryProps {
   result: ExploreFinishResponse;
+  sessionId: string | null;
 }
 
-export function DirectionSummary({ result }: DirectionSummaryProps) {
+export function DirectionSummary({ result, sessionId }: DirectionSummaryProps) {
+  const [explanations, setExplanations] = useState<Record<number, string>>({});
+  const [explaining, setExplaining] = useState<number | null>(null);
+
+  const handleExplain = async (facultyId: number) => {
+    if (!sessionId) return;
+
+    setExplaining(facultyId);
+    try {
+      const explanation = await explainFacultyMatch(sessionId, facultyId);
+      setExplanations((prev) => ({ ...prev, [facultyId]: explanation }));
+    } catch (err) {
+      console.error('Failed to explain match:', err);
+    } finally {
+      setExplaining(null);
+    }
+  };
+
   return (
     <div className="space-y-6">
       <Card className="border-primary/20 bg-primary/5">
@@ -82,13 +102,31 @@ export function DirectionSummary({ result }: DirectionSummaryProps) {
 
                 <Separator />
 
-                <div className="bg-primary/5 rounded-lg p-3">
-                  <div className="flex items-center gap-1 text-sm font-medium mb-1">
-                    <Info className="h-4 w-4" />
-                    Why this matches
+                {(match.explanation ?? explanations[match.faculty.id]) ? (
+                  <div className="bg-primary/5 rounded-lg p-3">
+                    <div className="flex items-center gap-1 text-sm font-medium mb-1">
+                      <Info className="h-4 w-4" />
+                      Why this matches
+                    </div>
+                    <p className="text-sm text-muted-foreground">
+                      {match.explanation ?? explanations[match.faculty.id]}
+                    </p>
                   </div>
-                  <p className="text-sm text-muted-foreground">{match.explanation}</p>
-                </div>
+                ) : (
+                  <Button
+                    variant="outline"
+                    size="sm"
+                    onClick={() => handleExplain(match.faculty.id)}
+                    disabled={!sessionId || explaining === match.faculty.id}
+                  >
+                    {explaining === match.faculty.id ? (
+                      <Loader2 className="h-4 w-4 mr-1 animate-spin" />
+                    ) : (
+                      <Info className="h-4 w-4 mr-1" />
+                    )}
+                    Explain this match
+                  </Button>
+                )}
 
                 {match.key_paper && (
                   <div className="text-sm">
@@ -6,14 +6,18 @@ import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
 import { ExplorePaper } from '@/lib/api';
 import { truncate } from '@/lib/utils';
-import { ChevronDown, ChevronUp, User, Calendar, BookOpen } from 'lucide-react';
+import { ChevronDown, ChevronUp, User, Calendar, BookOpen, ThumbsUp, ThumbsDown } from 'lucide-react';
+
+export type PaperFeedback = 'liked' | 'disliked';
 
 interface PaperCardProps {
   paper: ExplorePaper;
   index: number;
+  feedback?: PaperFeedback | null;
+  onFeedback?: (feedback: PaperFeedback | null) => void;
 }
 
-export function PaperCard({ paper, index }: PaperCardProps) {
+export function PaperCard({ paper, index, feedback = null, onFeedback }: PaperCardProps) {
   const [expanded, setExpanded] = useState(false);
 
   const truncatedAbstract = paper.abstract ? truncate(paper.abstract, 200) : null;
@@ -52,6 +56,28 @@ export function PaperCard({ paper, index }: PaperCardProps) {
               )}
             </div>
           </div>
+          {onFeedback && (
+            <div className="flex gap-1">
+              <Button
+                variant={feedback === 'liked' ? 'default' : 'ghost'}
+                size="icon-sm"
+                onClick={() => onFeedback(feedback === 'liked' ? null : 'liked')}
+                aria-pressed={feedback === 'liked'}
+                aria-label="More like this"
+              >
+                <ThumbsUp className="h-4 w-4" />
+              </Button>
+              <Button
+                variant={feedback === 'disliked' ? 'default' : 'ghost'}
+                size="icon-sm"
+                onClick={() => onFeedback(feedback === 'disliked' ? null : 'disliked')}
+                aria-pressed={feedback === 'disliked'}
+                aria-label="Less like this"
+              >
+                <ThumbsDown className="h-4 w-4" />
+              </Button>
+            </div>
+          )}
         </div>
       </CardHeader>
 
@@ -148,7 +148,7 @@ export interface ExploreRespondResponse {
 export interface FacultyMatch {
   faculty: Faculty;
   similarity: number;
-  explanation: string;
+  explanation: string | null;
   key_paper: string | null;
 }
 
@@ -173,14 +173,20 @@ export async function startExploration(initialInterest: string): Promise<Explore
   return response.json();
 }
 
+export interface ExploreFeedback {
+  liked_paper_ids?: number[];
+  disliked_paper_ids?: number[];
+}
+
 export async function respondToExploration(
   sessionId: string,
-  response: string
+  response: string,
+  feedback: ExploreFeedback = {}
 ): Promise<ExploreRespondResponse> {
   const res = await fetch(`${API_URL}/api/explore/respond`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ session_id: sessionId, response }),
+    body: JSON.stringify({ session_id: sessionId, response, ...feedback }),
   });
 
   if (!res.ok) {
@@ -205,3 +211,143 @@ export async function finishExploration(sessionId: string): Promise<ExploreFinis
 
   return response.json();
 }
+
+export async function explainFacultyMatch(sessionId: string, facultyId: number): Promise<string> {
+  const response = await fetch(`${API_URL}/api/explore/explain`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ session_id: sessionId, faculty_id: facultyId }),
+  });
+
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.detail || "Failed to explain match");
+  }
+
+  const data = await response.json();
+  return data.explanation;
+}
+
+async function postEventStream(
+  path: string,
+  body: unknown,
+  onEvent: (event: string, data: unknown) => void,
+  fallbackError: string
+): Promise<void> {
+  const response = await fetch(`${API_URL}${path}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
+  });
+
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail || fallbackError);
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let event = "message";
+      const dataLines: string[] = [];
+      for (const line of message.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) dataLines.push(line.slice(6));
+      }
+
+      const data = JSON.parse(dataLines.join("\n"));
+      if (event === "error") {
+        throw new Error(data.detail || fallbackError);
+      }
+      onEvent(event, data);
+    }
+  }
+}
+
+export interface ExploreRespondStreamHandlers {
+  onSpeculativePapers?: (papers: ExplorePaper[]) => void;
+}
+
+export async function respondToExplorationStream(
+  sessionId: string,
+  response: string,
+  feedback: ExploreFeedback = {},
+  handlers: ExploreRespondStreamHandlers = {}
+): Promise<ExploreRespondResponse> {
+  const result: ExploreRespondResponse = { papers: [], prompt: "", is_ready: false };
+
+  await postEventStream(
+    "/api/explore/respond/stream",
+    { session_id: sessionId, response, ...feedback },
+    (event, data) => {
+      if (event === "speculative_papers") {
+        handlers.onSpeculativePapers?.(data as ExplorePaper[]);
+      } else if (event === "papers") {
+        result.papers = data as ExplorePaper[];
+      } else if (event === "prompt") {
+        const { prompt, is_ready } = data as { prompt: string; is_ready: boolean };
+        result.prompt = prompt;
+        result.is_ready = is_ready;
+      }
+    },
+    "Failed to process response"
+  );
+
+  return result;
+}
+
+export interface ExploreFinishStreamHandlers {
+  onUpdate?: (result: ExploreFinishResponse) => void;
+}
+
+export async function finishExplorationStream(
+  sessionId: string,
+  handlers: ExploreFinishStreamHandlers = {}
+): Promise<ExploreFinishResponse> {
+  let result: ExploreFinishResponse = { direction_summary: "", direction_description: "", faculty_matches: [] };
+
+  const updateMatch = (facultyId: number, update: (match: FacultyMatch) => FacultyMatch) => {
+    result = {
+      ...result,
+      faculty_matches: result.faculty_matches.map((match) =>
+        match.faculty.id === facultyId ? update(match) : match
+      ),
+    };
+  };
+
+  await postEventStream(
+    "/api/explore/finish/stream",
+    { session_id: sessionId },
+    (event, data) => {
+      if (event === "direction") {
+        const { title, description } = data as { title: string; description: string };
+        result = { ...result, direction_summary: title, direction_description: description };
+      } else if (event === "match") {
+        result = { ...result, faculty_matches: [...result.faculty_matches, data as FacultyMatch] };
+      } else if (event === "explanation_delta") {
+        const { faculty_id, text } = data as { faculty_id: number; text: string };
+        updateMatch(faculty_id, (match) => ({ ...match, explanation: (match.explanation ?? "") + text }));
+      } else if (event === "explanation") {
+        const { faculty_id, explanation } = data as { faculty_id: number; explanation: string };
+        updateMatch(faculty_id, (match) => ({ ...match, explanation }));
+      } else {
+        return;
+      }
+      handlers.onUpdate?.(result);
+    },
+    "Failed to finish exploration"
+  );
+
+  return result;
+}